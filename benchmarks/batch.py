@@ -0,0 +1,96 @@
+"""Compares loading a project page using separate requests with loading it using a single `POST /batch`.
+
+The requests fired by the frontend when opening a project of a generated dataset are sent one after another,
+concurrently and as one batch (see `lib.batch`), reporting the median latency and the statements issued.
+Within a batch the `User`, guards and permission headers are looked up once.
+The response cache is disabled, otherwise repeated requests would skip their handlers.
+
+Usage: python benchmarks/batch.py [--requests 20] [--users 200] [--projects 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+from app import app  # noqa: E402
+from domain.projects.models import Project  # noqa: E402
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+from lib.orm import _engine, session  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+statements = 0
+
+
+@event.listens_for(_engine.sync_engine, "before_cursor_execute")
+def count(*_: Any) -> None:
+    global statements
+    statements += 1
+
+
+async def measure(load: Callable[[], Awaitable[None]], requests: int) -> dict[str, float | int]:
+    global statements
+    await load()  # warm up
+    seconds, queries = [], 0
+    for _ in range(requests):
+        statements, start = 0, time.perf_counter()
+        await load()
+        seconds.append(time.perf_counter() - start)
+        queries = statements
+    return {"queries": queries, "latency_p50_ms": round(statistics.median(seconds) * 1000, 3)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    await load_dataset(Dataset(users=args.users, projects=args.projects))
+    async with session() as session_:
+        project_id = await session_.scalar(select(Project.id).where(Project.name == f"Project 0 of {Dataset.prefix}"))
+    paths = [
+        f"/projects/{project_id}",
+        f"/groups/{project_id}",
+        f"/consolidations/{project_id}",
+        f"/terms/project/{project_id}",
+        f"/groups/my_groups/{project_id}",
+    ]
+
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        data = {"email": "admin@uni-jena.de", "password": "HalloWelt123"}
+        headers = {"Authorization": (await client.post("/users/login", json=data)).headers["Authorization"]}
+
+        async def sequential() -> None:
+            for path in paths:
+                (await client.get(path, headers=headers)).raise_for_status()
+
+        async def concurrent() -> None:
+            for response in await asyncio.gather(*[client.get(path, headers=headers) for path in paths]):
+                response.raise_for_status()
+
+        async def batch() -> None:
+            response = await client.post("/batch", json=[{"path": path} for path in paths], headers=headers)
+            assert all(response["status"] == 200 for response in response.json())
+
+        return {
+            name: await measure(load, args.requests)
+            for name, load in {"sequential": sequential, "concurrent": concurrent, "batch": batch}.items()
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="page loads per variant")
+    parser.add_argument("--users", type=int, default=200, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=2, help="projects of the generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
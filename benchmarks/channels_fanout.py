@@ -0,0 +1,125 @@
+"""Measures fan-out throughput of project events to many concurrent subscribers within one process.
+
+`--transport backend` reads the subscriber queues of the channels plugin directly, measuring the fan-out only.
+`--transport websocket` serves the app using `uvicorn` and subscribes over `/projects/{id}/events/ws`
+(requires `uvicorn` and `websockets`), measuring the path clients take including guards and socket writes.
+
+Usage: python benchmarks/channels_fanout.py [--subscribers 1000] [--events 200] [--transport backend|websocket]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+
+from lib.channels import Channels  # noqa: E402
+from litestar.channels import Subscriber  # noqa: E402
+
+CHANNEL = "projects.benchmark"
+PROJECT_ID = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+HOST, PORT = "127.0.0.1", 8765
+
+
+def summarize(subscribers: int, events: int, latencies: list[float], elapsed: float) -> dict[str, float | int]:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "subscribers": subscribers,
+        "events": events,
+        "deliveries": len(latencies),
+        "seconds": round(elapsed, 4),
+        "deliveries_per_second": round(len(latencies) / elapsed),
+        "latency_p50_ms": round(quantiles[49] * 1000, 3),
+        "latency_p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+async def consume(subscriber: Subscriber, events: int, latencies: list[float]) -> None:
+    received = 0
+    async for event in subscriber.iter_events():
+        latencies.append(time.perf_counter() - json.loads(event)["sent"])
+        received += 1
+        if received == events:
+            return
+
+
+async def run_backend(subscribers: int, events: int) -> dict[str, float | int]:
+    plugin = Channels(max_backlog=events).plugin
+
+    async with plugin:
+        subscriptions = [await plugin.subscribe(CHANNEL) for _ in range(subscribers)]
+        latencies: list[float] = []
+        consumers = [asyncio.create_task(consume(subscriber, events, latencies)) for subscriber in subscriptions]
+
+        start = time.perf_counter()
+        for revision in range(events):
+            plugin.publish({"revision": revision, "changes": [], "sent": time.perf_counter()}, CHANNEL)
+            await asyncio.sleep(0)
+        await asyncio.gather(*consumers)
+        elapsed = time.perf_counter() - start
+
+        for subscriber in subscriptions:
+            await plugin.unsubscribe(subscriber)
+
+    return summarize(subscribers, events, latencies, elapsed)
+
+
+async def consume_socket(url: str, headers: dict[str, str], events: int, latencies: list[float]) -> None:
+    from websockets.asyncio.client import connect
+
+    async with connect(url, additional_headers=headers, max_queue=None, open_timeout=60) as socket:
+        for _ in range(events):
+            latencies.append(time.perf_counter() - json.loads(await socket.recv())["sent"])
+
+
+async def run_websocket(subscribers: int, events: int) -> dict[str, float | int]:
+    import httpx
+    import uvicorn
+
+    os.environ.setdefault("CONNECTION_STRING", "sqlite+aiosqlite:///benchmark.sqlite")
+    os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+    from app import app, channels
+
+    server = uvicorn.Server(uvicorn.Config(app, host=HOST, port=PORT, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        async with httpx.AsyncClient(base_url=f"http://{HOST}:{PORT}") as client:
+            login = {"email": "admin@uni-jena.de", "password": "HalloWelt123"}
+            headers = {"Authorization": (await client.post("/users/login", json=login)).headers["Authorization"]}
+
+        channel = f"projects.{PROJECT_ID}"
+        url = f"ws://{HOST}:{PORT}/projects/{PROJECT_ID}/events/ws"
+        latencies: list[float] = []
+        consumers = [asyncio.create_task(consume_socket(url, headers, events, latencies)) for _ in range(subscribers)]
+        while len(channels.plugin._channels.get(channel, ())) < subscribers:  # subscribed after the handshake
+            await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        for revision in range(events):
+            channels.plugin.publish({"revision": revision, "changes": [], "sent": time.perf_counter()}, channel)
+            await asyncio.sleep(0)
+        await asyncio.gather(*consumers)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.should_exit = True
+        await serving
+
+    return summarize(subscribers, events, latencies, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--transport", choices=["backend", "websocket"], default="backend")
+    args = parser.parse_args()
+    run = run_backend if args.transport == "backend" else run_websocket
+    print(json.dumps({"transport": args.transport, **asyncio.run(run(args.subscribers, args.events))}))
@@ -0,0 +1,98 @@
+"""Compares compression levels and backends on the payloads of the heaviest routes of a generated dataset.
+
+Each route is fetched uncompressed as JSON and as MessagePack (see `lib.negotiation`), the payloads are compressed
+using gzip at several levels and brotli (if installed), reporting the compressed size relative to the payload and
+the median time to compress it. Cached routes are also requested with `Accept-Encoding: gzip`, comparing the
+latency of the first response, which is compressed, with the cached ones, which are stored compressed.
+
+Usage: python benchmarks/compression.py [--repeat 20] [--users 200] [--projects 2]
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+
+from app import app  # noqa: E402
+from domain.projects.models import Project  # noqa: E402
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+from lib.orm import session  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+CODECS: dict[str, Callable[[bytes], bytes]] = {
+    f"gzip-{level}": lambda body, level=level: gzip.compress(body, level) for level in (1, 6, 9)
+}
+try:
+    import brotli  # type: ignore
+
+    CODECS.update({f"brotli-{q}": lambda body, q=q: brotli.compress(body, quality=q) for q in (5, 11)})
+except ImportError:
+    pass
+
+
+def timed(function: Callable[[bytes], bytes], body: bytes, repeat: int) -> dict[str, float]:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compressed = function(body)
+        seconds.append(time.perf_counter() - start)
+    return {"ratio": round(len(compressed) / len(body), 3), "ms": round(statistics.median(seconds) * 1000, 3)}
+
+
+async def compress(client: httpx.AsyncClient, url: str, headers: dict[str, str], repeat: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for media_type in ("application/json", "application/msgpack"):
+        response = await client.get(url, headers={**headers, "Accept": media_type, "Accept-Encoding": "identity"})
+        body = response.content
+        results[media_type] = {"bytes": len(body), **{name: timed(c, body, repeat) for name, c in CODECS.items()}}
+    return results
+
+
+async def cached(client: httpx.AsyncClient, url: str, headers: dict[str, str], repeat: int) -> dict[str, float]:
+    seconds = []
+    for _ in range(repeat + 1):
+        start = time.perf_counter()
+        response = await client.get(url, headers={**headers, "Accept-Encoding": "gzip"})
+        seconds.append(time.perf_counter() - start)
+    assert response.headers["Content-Encoding"] == "gzip"
+    return {"miss_ms": round(seconds[0] * 1000, 3), "hit_p50_ms": round(statistics.median(seconds[1:]) * 1000, 3)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    await load_dataset(Dataset(users=args.users, projects=args.projects))
+    async with session() as session_:
+        project_id = await session_.scalar(select(Project.id).where(Project.name == f"Project 0 of {Dataset.prefix}"))
+
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        data = {"email": "admin@uni-jena.de", "password": "HalloWelt123"}
+        headers = {"Authorization": (await client.post("/users/login", json=data)).headers["Authorization"]}
+        routes = {"project_detail": f"/projects/{project_id}", "consolidations": f"/consolidations/{project_id}"}
+        return {
+            "compression": {
+                name: await compress(client, url, headers, args.repeat)
+                for name, url in {**routes, "questions": "/questions"}.items()
+            },
+            "cached": {name: await cached(client, url, headers, args.repeat) for name, url in routes.items()},
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="repetitions per payload and codec")
+    parser.add_argument("--users", type=int, default=200, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=2, help="projects of the generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
@@ -0,0 +1,84 @@
+"""Measures `GET /users/me/dashboard` for users taking part in a growing number of projects.
+
+For each size a dataset is generated with few users and `--projects` projects, so every user manages, engineers or
+is a member of most of them. The user with the most participations requests the dashboard, reporting the projects
+listed, the statements issued and the median latency. The statements must not grow with the number of projects.
+
+Usage: python benchmarks/dashboard.py [--requests 20] [--users 10] [--projects 5 20 80]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+from app import app  # noqa: E402
+from domain.accounts.models import User  # noqa: E402
+from domain.projects.services import ProjectService  # noqa: E402
+from lib.datasets import Dataset  # noqa: E402
+from lib.orm import _engine, session  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+
+PASSWORD = "HalloWelt123"
+
+statements = 0
+
+
+@event.listens_for(_engine.sync_engine, "before_cursor_execute")
+def count(_: Any, __: Any, statement: str, *___: Any) -> None:
+    global statements
+    statements += "mail_outbox" not in statement  # polled by the outbox worker concurrently
+
+
+async def busiest_user(dataset: Dataset) -> str:
+    """Gets the email of the generated `User` taking part in the most projects of `dataset`."""
+    async with session() as session_:
+        users = await session_.execute(select(User.id, User.email).where(User.email.startswith(dataset.prefix)))
+        participations = [(len(await ProjectService.my_projects(session_, id)), email) for id, email in users.all()]
+        return max(participations)[1]
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    global statements
+    results: dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        for projects in args.projects:
+            dataset = Dataset(users=args.users, projects=projects, seed=projects, prefix=f"dashboard{projects}_")
+            await dataset.load(_engine)
+            data = {"email": await busiest_user(dataset), "password": PASSWORD}
+            headers = {"Authorization": (await client.post("/users/login", json=data)).headers["Authorization"]}
+
+            (await client.get("/users/me/dashboard", headers=headers)).raise_for_status()  # warm up
+            seconds = []
+            for _ in range(args.requests):
+                statements, start = 0, time.perf_counter()
+                response = await client.get("/users/me/dashboard", headers=headers)
+                seconds.append(time.perf_counter() - start)
+            results[f"{projects}_projects"] = {
+                "listed": len(response.json()),
+                "queries": statements,
+                "latency_p50_ms": round(statistics.median(seconds) * 1000, 3),
+            }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="dashboard requests per size")
+    parser.add_argument("--users", type=int, default=10, help="users of each generated dataset")
+    parser.add_argument("--projects", type=int, nargs="+", default=[5, 20, 80], help="projects per generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
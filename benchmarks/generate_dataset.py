@@ -0,0 +1,27 @@
+"""Bulk loads a deterministic synthetic dataset into the database given by `CONNECTION_STRING`.
+
+Every parameter of `lib.datasets.Dataset` is available as option, e.g. `--questions-per-group 200`.
+
+Usage: CONNECTION_STRING=sqlite+aiosqlite:///benchmark.sqlite python benchmarks/generate_dataset.py [--seed 0] [...]
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    for parameter in dataclasses.fields(Dataset):
+        option = f"--{parameter.name.replace('_', '-')}"
+        parser.add_argument(option, type=type(parameter.default), default=parameter.default)
+    args = parser.parse_args()
+    counts, seconds = asyncio.run(load_dataset(Dataset(**vars(args))))
+    rows = sum(counts.values())
+    print(json.dumps({"rows": rows, "seconds": round(seconds, 2), "rows_per_second": round(rows / seconds), **counts}))
@@ -0,0 +1,203 @@
+"""Replays a realistic request mix against the app at a given concurrency and reports latencies per route as json.
+
+Each virtual user logs in as a user of the generated dataset (see `generate_dataset.py`) and then repeatedly
+picks an action by weight: listing its projects, reading project details, paging group questions,
+reading question details or writing ratings and comments. Ids are discovered along the way.
+
+`--transport asgi` calls the app in-process without sockets, `--transport server` serves it using `uvicorn`
+in the same process and `--url` targets an already running server instead, e.g. one with several workers.
+Unless `--url` is given the dataset is loaded into a fresh database first.
+
+Usage: python benchmarks/load_driver.py [--transport asgi|server] [--url URL] [--concurrency 50] [--duration 30]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+
+HOST, PORT = "127.0.0.1", 8766
+PASSWORD = "HalloWelt123"
+
+# action: weight
+MIX = {
+    "login": 2,
+    "my_projects": 10,
+    "project_detail": 15,
+    "group_questions": 30,
+    "question_detail": 25,
+    "rate": 10,
+    "comment": 8,
+}
+
+
+class VirtualUser:
+    """Walks the app like a client would, remembering the ids it has seen."""
+
+    def __init__(self, client: httpx.AsyncClient, email: str, rng: random.Random) -> None:
+        self.client, self.email, self.rng = client, email, rng
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.headers: dict[str, str] = {}
+        self.projects: list[str] = []
+        self.groups: list[tuple[str, str]] = []
+        self.questions: list[tuple[str, str]] = []
+
+    async def request(self, route: str, method: str, url: str, **kwargs: Any) -> httpx.Response | None:
+        start = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        self.latencies[route].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+            return None
+        return response
+
+    async def login(self) -> None:
+        data = {"email": self.email, "password": PASSWORD}
+        if response := await self.request("POST /users/login", "POST", "/users/login", json=data):
+            self.headers = {"Authorization": response.headers["Authorization"]}
+
+    async def my_projects(self) -> None:
+        if response := await self.request("GET /projects/my_projects", "GET", "/projects/my_projects"):
+            self.projects = [project["id"] for project in response.json()]
+
+    async def project_detail(self) -> None:
+        if not self.projects:
+            return await self.my_projects()
+        project_id = self.rng.choice(self.projects)
+        if response := await self.request("GET /projects/{project_id}", "GET", f"/projects/{project_id}"):
+            self.groups = [(project_id, group["id"]) for group in response.json().get("groups", [])]
+
+    async def group_questions(self) -> None:
+        if not self.groups:
+            return await self.project_detail()
+        project_id, group_id = self.rng.choice(self.groups)
+        route, url = "GET /groups/{project_id}/{group_id}/questions", f"/groups/{project_id}/{group_id}/questions"
+        if response := await self.request(route, "GET", url, params={"size": 20}):
+            self.questions = [(group_id, question["id"]) for question in response.json()["items"]]
+
+    async def question_detail(self) -> None:
+        if not self.questions:
+            return await self.group_questions()
+        group_id, question_id = self.rng.choice(self.questions)
+        await self.request("GET /questions/{group_id}/{question_id}", "GET", f"/questions/{group_id}/{question_id}")
+
+    async def rate(self) -> None:
+        if not self.questions:
+            return await self.group_questions()
+        data = {"rating": self.rng.randint(1, 5), "questionId": self.rng.choice(self.questions)[1]}
+        await self.request("POST /ratings", "POST", "/ratings", json=data)
+
+    async def comment(self) -> None:
+        if not self.questions:
+            return await self.group_questions()
+        data = {"comment": "Benchmark comment", "questionId": self.rng.choice(self.questions)[1]}
+        await self.request("POST /comments", "POST", "/comments", json=data)
+
+    async def run(self, until: float) -> None:
+        await self.login()
+        actions, weights = zip(*MIX.items())
+        while time.perf_counter() < until:
+            await getattr(self, self.rng.choices(actions, weights)[0])()
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict[str, float | int]:
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / seconds, 1),
+        "latency_p50_ms": round(quantiles[49] * 1000, 3),
+        "latency_p95_ms": round(quantiles[94] * 1000, 3),
+        "latency_p99_ms": round(quantiles[98] * 1000, 3),
+    }
+
+
+async def drive(base_url: str, transport: httpx.AsyncBaseTransport | None, args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        emails = [f"user{rng.randrange(args.users)}@example.org" for _ in range(args.concurrency)]
+        users = [VirtualUser(client, email, random.Random(rng.random())) for email in emails]
+        start = time.perf_counter()
+        await asyncio.gather(*(user.run(start + args.duration) for user in users))
+        seconds = time.perf_counter() - start
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    for user in users:
+        for route, values in user.latencies.items():
+            latencies[route].extend(values)
+            errors[route] += user.errors[route]
+
+    routes = {route: summarize(values, errors[route], seconds) for route, values in sorted(latencies.items())}
+    total = summarize([value for values in latencies.values() for value in values], sum(errors.values()), seconds)
+    return {"routes": routes, "total": total}
+
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.url:
+        return await drive(args.url, None, args)
+
+    database = Path(tempfile.mkdtemp()) / "benchmark.sqlite"
+    os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{database}")
+    os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+    from app import app
+    from lib.datasets import Dataset, load_dataset
+
+    await load_dataset(Dataset(users=args.users, projects=args.projects, seed=args.seed))
+    if args.transport == "asgi":
+        async with app.lifespan():
+            return await drive("http://benchmark", httpx.ASGITransport(app=app), args)  # type: ignore
+
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host=HOST, port=PORT, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    try:
+        return await drive(f"http://{HOST}:{PORT}", None, args)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["asgi", "server"], default="asgi")
+    parser.add_argument("--url", help="base url of a running server, its database must hold the generated dataset")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--users", type=int, default=1_000, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=10, help="projects of the generated dataset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the results to, printed otherwise")
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    results = json.dumps({"commit": commit(), "config": config, **asyncio.run(run(args))}, indent=2)
+    if args.output:
+        Path(args.output).write_text(results)
+    else:
+        print(results)
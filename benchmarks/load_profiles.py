@@ -0,0 +1,78 @@
+"""Compares loader strategies of every registered load profile on a generated dataset.
+
+Each profile is loaded for `--rows` instances of its model using the strategy chosen by cardinality
+(`joinedload` for to-one, `selectinload` for to-many relationships) and using `selectinload` only,
+reporting the statements issued and the median latency. Joining to-many relationships is left out,
+nested collections multiply the joined rows. Profiles are shared by the routes rendering the same
+shape, see `domain/loading.py`.
+
+Usage: python benchmarks/load_profiles.py [--rows 50] [--repeat 20] [--users 200] [--projects 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+
+from domain.loading import profiles  # noqa: E402
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+from lib.loading import LoadProfile, Strategy, by_cardinality  # noqa: E402
+from lib.orm import _engine, session  # noqa: E402
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+STRATEGIES: dict[str, Strategy] = {"cardinality": by_cardinality, "selectin": selectinload}
+
+statements = 0
+
+
+@event.listens_for(_engine.sync_engine, "before_cursor_execute")
+def count(*_: Any) -> None:
+    global statements
+    statements += 1
+
+
+async def measure(profile: LoadProfile, strategy: Strategy, rows: int, repeat: int) -> dict[str, float | int]:
+    global statements
+    statement = select(profile.model).order_by(profile.model.created_at).limit(rows)
+    statement = statement.options(*profile.options(strategy))
+    seconds, queries = [], 0
+    for _ in range(repeat):
+        async with session() as session_:
+            statements, start = 0, time.perf_counter()
+            (await session_.scalars(statement)).all()
+            seconds.append(time.perf_counter() - start)
+            queries = statements
+    return {"queries": queries, "median_ms": round(statistics.median(seconds) * 1000, 3)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    await load_dataset(Dataset(users=args.users, projects=args.projects))
+    return {
+        name: {
+            "model": profile.model.__name__,
+            **{
+                strategy: await measure(profile, loader, args.rows, args.repeat)
+                for strategy, loader in STRATEGIES.items()
+            },
+        }
+        for name, profile in profiles.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="instances loaded per statement")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--users", type=int, default=200, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=2, help="projects of the generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
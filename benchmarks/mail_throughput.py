@@ -0,0 +1,61 @@
+"""Measures mail throughput of `MailService` against a local `aiosmtpd` server (requires `aiosmtpd`).
+
+Compares pooled connections with opening a connection per message.
+
+Usage: python benchmarks/mail_throughput.py [--mails 600] [--pool-size 4]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+
+import aiosmtplib  # noqa: E402
+from aiosmtpd.controller import Controller  # noqa: E402
+from aiosmtpd.handlers import Sink  # noqa: E402
+from lib.mails import MailParameters, MailService  # noqa: E402
+
+HOST, PORT = "127.0.0.1", 8025
+
+
+class Unpooled(MailService):
+    async def send_email(self, receivers: list[str] | str, subject: str, body: str, html: bool = False):
+        await aiosmtplib.send(self._create_message(receivers, subject, body, html), hostname=HOST, port=PORT)
+
+
+async def measure(service: MailService, mails: int) -> dict[str, float | int]:
+    parameters = [MailParameters(f"user{i}@example.org", "Benchmark", "Hello", False) for i in range(mails)]
+    start = time.perf_counter()
+    sends = [service.send_email([mail.receiver], mail.subject, mail.body, mail.html) for mail in parameters]
+    results = await asyncio.gather(*sends, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    await service.on_shutdown()
+
+    failed = sum(isinstance(result, Exception) for result in results)
+    sent = mails - failed
+    return {"sent": sent, "failed": failed, "seconds": round(elapsed, 4), "mails_per_second": round(sent / elapsed)}
+
+
+async def run(mails: int, pool_size: int) -> dict[str, dict[str, float | int]]:
+    return {
+        "pooled": await measure(MailService("bench@example.org", HOST, PORT, pool_size=pool_size), mails),
+        "unpooled": await measure(Unpooled("bench@example.org", HOST, PORT), mails),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mails", type=int, default=600)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    controller = Controller(Sink(), hostname=HOST, port=PORT)
+    controller.start()
+    try:
+        print(json.dumps(asyncio.run(run(args.mails, args.pool_size))))
+    finally:
+        controller.stop()
@@ -0,0 +1,55 @@
+"""Measures the per request overhead of the metrics middleware against a no-op ASGI app.
+
+Usage: python benchmarks/metrics_overhead.py [--requests 100000] [--budget-us 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", "sqlite+aiosqlite:///benchmark.sqlite")
+
+from lib.metrics import Metrics  # noqa: E402
+from litestar.types import Message, Receive, Scope, Send  # noqa: E402
+
+
+async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def receive() -> Message:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: Message) -> None:
+    pass
+
+
+async def measure(app, requests: int) -> float:  # type: ignore
+    scope = {"type": "http", "method": "GET", "path": "/benchmark"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, receive, send)  # type: ignore
+    return (time.perf_counter() - start) / requests
+
+
+async def run(requests: int) -> float:
+    wrapped = Metrics().middleware(endpoint)
+    await measure(wrapped, requests // 10)  # warm up
+    return await measure(wrapped, requests) - await measure(endpoint, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--budget-us", type=float, default=10)
+    args = parser.parse_args()
+    overhead = asyncio.run(run(args.requests)) * 1e6
+    print(json.dumps({"overhead_us": round(overhead, 3), "budget_us": args.budget_us}))
+    sys.exit(overhead > args.budget_us)
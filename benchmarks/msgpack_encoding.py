@@ -0,0 +1,104 @@
+"""Compares MessagePack with JSON responses of the heaviest routes on a generated dataset.
+
+Each route is requested as JSON and with `Accept: application/msgpack` (see `lib.negotiation`), reporting the
+median latency of the app called in-process, the payload size and the time a client spends decoding the payload.
+The encoders are also timed in isolation on the decoded payloads. The response cache is disabled, otherwise
+cached routes would skip encoding.
+
+Usage: python benchmarks/msgpack_encoding.py [--requests 50] [--users 200] [--projects 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+os.environ["RESPONSE_CACHE_SIZE"] = "0"
+
+from app import app  # noqa: E402
+from domain.groups.models import Group  # noqa: E402
+from domain.projects.models import Project  # noqa: E402
+from domain.questions.models import Question  # noqa: E402
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+from lib.orm import session  # noqa: E402
+from litestar.serialization import decode_json, decode_msgpack, encode_json, encode_msgpack  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+FORMATS: dict[str, tuple[str, Callable[[bytes], Any], Callable[[Any], bytes]]] = {
+    "json": ("application/json", decode_json, encode_json),
+    "msgpack": ("application/msgpack", decode_msgpack, encode_msgpack),
+}
+
+
+async def urls() -> dict[str, str]:
+    """Selects the first generated project and one of its questions."""
+    async with session() as session_:
+        statement = select(Project.id, Question.group_id, Question.id).join(Group, Project.groups)
+        statement = statement.join(Question, Group.questions).where(Project.name == f"Project 0 of {Dataset.prefix}")
+        project_id, group_id, question_id = (await session_.execute(statement.limit(1))).one()
+    return {
+        "project_detail": f"/projects/{project_id}",
+        "question_detail": f"/questions/{group_id}/{question_id}",
+        "consolidations": f"/consolidations/{project_id}",
+        "questions": "/questions",
+    }
+
+
+def timed(function: Callable[[Any], Any], value: Any, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(value)
+        seconds.append(time.perf_counter() - start)
+    return round(statistics.median(seconds) * 1000, 3)
+
+
+async def measure(client: httpx.AsyncClient, url: str, headers: dict[str, str], requests: int) -> dict[str, Any]:
+    results = {}
+    for name, (media_type, decode, encode) in FORMATS.items():
+        headers_ = {**headers, "Accept": media_type}
+        (await client.get(url, headers=headers_)).raise_for_status()  # warm up
+
+        seconds = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers_)
+            seconds.append(time.perf_counter() - start)
+        assert response.headers["Content-Type"] == media_type
+        payload = decode(response.content)
+
+        results[name] = {
+            "bytes": len(response.content),
+            "latency_p50_ms": round(statistics.median(seconds) * 1000, 3),
+            "decode_ms": timed(decode, response.content, requests),
+            "encode_ms": timed(encode, payload, requests),
+        }
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    await load_dataset(Dataset(users=args.users, projects=args.projects))
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        data = {"email": "admin@uni-jena.de", "password": "HalloWelt123"}
+        headers = {"Authorization": (await client.post("/users/login", json=data)).headers["Authorization"]}
+        return {name: await measure(client, url, headers, args.requests) for name, url in (await urls()).items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50, help="requests per route and format")
+    parser.add_argument("--users", type=int, default=200, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=2, help="projects of the generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
@@ -0,0 +1,112 @@
+"""Compares list endpoints served from column projections with the same lists hydrated as ORM entities.
+
+For questions, groups and comments of a generated dataset both paths are served by a minimal app:
+`orm` loads entities using their load profile and serializes them through the `SQLAlchemyDTO`,
+`rows` maps a column projected `select()` to `lib.dto.Row`s. Reports rows per second and the
+peak of memory allocated per request as traced by `tracemalloc`.
+
+Usage: python benchmarks/projections.py [--requests 20] [--users 200] [--projects 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Sequence
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+
+from domain.comments.dtos import CommentDTO, CommentRow  # noqa: E402
+from domain.comments.models import Comment  # noqa: E402
+from domain.comments.services import CommentsService  # noqa: E402
+from domain.groups.dtos import GroupDTO, GroupRow  # noqa: E402
+from domain.groups.models import Group  # noqa: E402
+from domain.groups.services import GroupService  # noqa: E402
+from domain.loading import profiles  # noqa: E402
+from domain.questions.dtos import QuestionOverviewDTO, QuestionRow  # noqa: E402
+from domain.questions.models import Question  # noqa: E402
+from domain.questions.services import QuestionService  # noqa: E402
+from lib.datasets import Dataset, load_dataset  # noqa: E402
+from lib.orm import AsyncSqlPlugin  # noqa: E402
+from lib.pagination import load_windows  # noqa: E402
+from litestar import Litestar, get  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+
+@get("/orm/questions", return_dto=QuestionOverviewDTO)
+async def orm_questions(session: AsyncSession) -> Sequence[Question]:
+    return (await session.scalars(select(Question).options(*profiles.options("question.overview")))).all()
+
+
+@get("/rows/questions")
+async def rows_questions(session: AsyncSession) -> list[QuestionRow]:
+    return await QuestionService.get_question_rows(session)
+
+
+@get("/orm/groups", return_dto=GroupDTO)
+async def orm_groups(session: AsyncSession) -> Sequence[Group]:
+    groups = (await session.scalars(select(Group).options(*profiles.options("group")))).all()
+    await load_windows(session, groups, Group.questions, 0)
+    return groups
+
+
+@get("/rows/groups")
+async def rows_groups(session: AsyncSession) -> list[GroupRow]:
+    return await GroupService.get_groups(session)
+
+
+@get("/orm/comments", return_dto=CommentDTO)
+async def orm_comments(session: AsyncSession) -> Sequence[Comment]:
+    return (await session.scalars(select(Comment).options(*profiles.options("comment")))).all()
+
+
+@get("/rows/comments")
+async def rows_comments(session: AsyncSession) -> list[CommentRow]:
+    return await CommentsService.get_comment_rows(session)
+
+
+route_handlers = [orm_questions, rows_questions, orm_groups, rows_groups, orm_comments, rows_comments]
+
+
+async def measure(client: httpx.AsyncClient, url: str, requests: int) -> dict[str, float | int]:
+    rows = len((await client.get(url)).json())  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        (await client.get(url)).raise_for_status()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    await client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"rows": rows, "rows_per_second": round(rows * requests / seconds), "peak_kib": round(peak / 1024, 1)}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    await load_dataset(Dataset(users=args.users, projects=args.projects))
+    sql_plugin = AsyncSqlPlugin()
+    app = Litestar(route_handlers, plugins=[sql_plugin.plugin])
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        return {
+            endpoint: {path: await measure(client, f"/{path}/{endpoint}", args.requests) for path in ["orm", "rows"]}
+            for endpoint in ["questions", "groups", "comments"]
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="requests per endpoint and path")
+    parser.add_argument("--users", type=int, default=200, help="users of the generated dataset")
+    parser.add_argument("--projects", type=int, default=2, help="projects of the generated dataset")
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
@@ -0,0 +1,56 @@
+"""Measures the throughput of `GET /users` with a large number of users.
+
+The users are generated into a fresh database (see `lib.datasets.Dataset`), the app is called in-process
+as system admin and the whole list is fetched `--requests` times.
+
+Usage: python benchmarks/users_throughput.py [--users 100000] [--requests 10]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "app"))
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    os.environ.setdefault("CONNECTION_STRING", f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'benchmark.sqlite'}")
+    os.environ.setdefault("CORS_ALLOW_ORIGIN", "*")
+    from app import app
+    from lib.datasets import Dataset, load_dataset
+
+    await load_dataset(Dataset(users=args.users, projects=0))
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    async with app.lifespan(), httpx.AsyncClient(base_url="http://benchmark", transport=transport) as client:
+        data = {"email": "admin@uni-jena.de", "password": "HalloWelt123"}
+        headers = {"Authorization": (await client.post("/users/login", json=data)).headers["Authorization"]}
+        users = len((await client.get("/users", headers=headers)).json())  # warm up
+
+        seconds = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            (await client.get("/users", headers=headers)).raise_for_status()
+            seconds.append(time.perf_counter() - start)
+
+    return {
+        "users": users,
+        "requests": args.requests,
+        "latency_p50_ms": round(statistics.median(seconds) * 1000, 1),
+        "users_per_second": round(users * len(seconds) / sum(seconds)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000, help="users of the generated dataset")
+    parser.add_argument("--requests", type=int, default=10)
+    print(json.dumps(asyncio.run(run(parser.parse_args())), indent=2))
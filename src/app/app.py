@@ -1,27 +1,41 @@
 import os
 
-from lib.orm import AsyncSqlPlugin
+from lib.orm import AsyncSqlPlugin, StrictLoading
 
 sql_plugin = AsyncSqlPlugin()
+strict_loading = StrictLoading.from_env()
 
 
 from domain.accounts.authentication.middleware import AuthenticationMiddleware
+from domain.accounts.guards import system_admin_guard
 from domain.accounts.authentication.services import EncryptionService
 from domain.accounts.controllers import UserController
 from domain.comments.controller import CommentController
 from domain.consolidations.controllers import ConsolidationController
 from domain.groups.controllers import GroupController
 from domain.projects.controllers import ProjectController
+from domain.projects.middleware import project_cache_key
 from domain.questions.controller import QuestionController
 from domain.ratings.controller import RatingController
 from domain.terms.controllers import TermController
+from lib.batch import Batch
+from lib.cache import ResponseCache
+from lib.channels import Channels
+from lib.compression import Compression
 from lib.mails import MailService
+from lib.memory import MemoryDiagnostics
+from lib.metrics import Metrics
+from lib.negotiation import NegotiatedRequest, NegotiatedResponse
+from lib.outbox import Outbox
+from lib.profiling import Profiler
+from lib.queries import QueryCounter
 from lib.services import MockDataService
+from lib.tracing import Tracer
 from litestar import Litestar
 from litestar.config.cors import CORSConfig
 from litestar.openapi import OpenAPIConfig
 
-cors_config = CORSConfig(allow_origins=[os.environ["CORS_ALLOW_ORIGIN"]], expose_headers=["Permissions-Project-Manager", "Permissions-Project-Engineer", "Permissions-Project-Member", "Permissions-Group-Member", "Permissions-Project-Manager"])
+cors_config = CORSConfig(allow_origins=[os.environ["CORS_ALLOW_ORIGIN"]], expose_headers=["Permissions-Project-Manager", "Permissions-Project-Engineer", "Permissions-Project-Member", "Permissions-Group-Member", "Permissions-Project-Manager", "ETag"])
 openapi_config = OpenAPIConfig("CQ Manager", "0.0.1", use_handler_docstrings=True)
 
 authenticator = AuthenticationMiddleware("Super Secret Token", "Authorization", 24)
@@ -29,6 +43,16 @@ encryption = EncryptionService()
 
 mock_data = MockDataService()
 mail_service = MailService.from_env()
+outbox = Outbox.from_env(mail_service)
+compression = Compression.from_env()
+response_cache = ResponseCache.from_env(compression.cache_key(project_cache_key))
+channels = Channels.from_env()
+query_counter = QueryCounter.from_env()
+metrics = Metrics([encryption.collect, outbox.collect, response_cache.collect], [system_admin_guard])
+tracer = Tracer.from_env([system_admin_guard])
+profiler = Profiler([system_admin_guard])
+batch = Batch()
+memory = MemoryDiagnostics([system_admin_guard])
 
 app = Litestar(
     route_handlers=[
@@ -41,14 +65,30 @@ app = Litestar(
         CommentController,
         TermController,
     ],
+    request_class=NegotiatedRequest,
+    response_class=NegotiatedResponse,
     cors_config=cors_config,
+    compression_config=compression.config,
     openapi_config=openapi_config,
-    plugins=[sql_plugin.plugin],
-    on_app_init=[sql_plugin.on_app_init, authenticator.on_app_init],
-    on_startup=[sql_plugin.on_startup, mock_data.on_startup],
+    response_cache_config=response_cache.config,
+    stores=response_cache.stores,
+    plugins=[sql_plugin.plugin, channels.plugin],
+    on_app_init=[
+        sql_plugin.on_app_init,
+        strict_loading.on_app_init,
+        authenticator.on_app_init,
+        batch.on_app_init,
+        channels.on_app_init,
+        query_counter.on_app_init,
+        metrics.on_app_init,
+        tracer.on_app_init,
+        profiler.on_app_init,
+        memory.on_app_init,
+    ],
+    on_startup=[sql_plugin.on_startup, mock_data.on_startup, outbox.on_startup],
+    on_shutdown=[outbox.on_shutdown, mail_service.on_shutdown],
     dependencies={
         "authenticator": authenticator.dependency,
         "encryption": encryption.dependency,
-        "mail_service": mail_service.dependency,
     },
 )
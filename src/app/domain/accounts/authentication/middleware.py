@@ -2,13 +2,15 @@ from dataclasses import dataclass, field
 from datetime import timedelta
 from typing import Any, Callable
 
-from lib.orm import session
+from lib.batch import lookup
+from lib.tracing import span
 from litestar import Response
 from litestar.config.app import AppConfig
 from litestar.connection import ASGIConnection
 from litestar.contrib.jwt import JWTAuth, Token
 from litestar.di import Provide
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..dtos import UserAccessDTO
 from ..models import User
@@ -34,11 +36,13 @@ class AuthenticationMiddleware:
         )
         object.__setattr__(self, "authenticator", authenticator)
 
+    @staticmethod
+    async def _get_user(session: AsyncSession, id: str) -> User | None:
+        return await session.scalar(select(User).where(User.id == id))
+
     async def _get_user_from_token(self, token: Token, _: "ASGIConnection[Any, Any, Any, Any]") -> User | None:
-        async with session() as _session:
-            if user := await _session.scalar(select(User).where(User.id == token.sub)):
-                return user
-        return None
+        with span("authentication"):
+            return await lookup(self._get_user, token.sub)
 
     def login(self, user: User) -> Response[UserAccessDTO]:
         """Handles `User` login and returns a `Response` with set headers.
@@ -48,7 +52,7 @@ class AuthenticationMiddleware:
         """
         ident = user.id.hex
         extra = {"email": user.email}
-        body = UserAccessDTO.model_validate(user)
+        body = UserAccessDTO.from_attributes(user)
         response = self.authenticator.login(ident, token_extras=extra, response_body=body)
         response.content.token = response.headers.get(self.header)
         return response
@@ -1,9 +1,11 @@
 import hashlib
 import os
 import re
+import time
 from dataclasses import dataclass, field
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
+from lib.metrics import Histogram, MetricFamily
 from litestar.di import Provide
 
 from .exceptions import InvalidPasswordFormatException, InvalidPasswordLengthException
@@ -30,17 +32,22 @@ class EncryptionService:
 
     _min_length: int = field(init=False, default=8)
     _format_pattern: re.Pattern[str] = field(init=False, default_factory=lambda: re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d).+$"))
+    _hash_seconds: Histogram = field(init=False, default_factory=Histogram, compare=False)
 
     def _hash_password(self, password: bytes, salt: bytes) -> bytes:
         """Delegates to `hashlib.scrypt` using this service's parameters."""
-        return hashlib.scrypt(
-            password,
-            salt=salt,
-            n=self.memory_cost_factor,
-            r=self.block_size,
-            p=self.parallelization_factor,
-            dklen=self.key_length,
-        )
+        start = time.perf_counter()
+        try:
+            return hashlib.scrypt(
+                password,
+                salt=salt,
+                n=self.memory_cost_factor,
+                r=self.block_size,
+                p=self.parallelization_factor,
+                dklen=self.key_length,
+            )
+        finally:
+            self._hash_seconds.observe(time.perf_counter() - start)
 
     def hash_password(self, password: str) -> PasswordHash:
         """Hash a `password` using `hashlib.scrypt`.
@@ -69,6 +76,10 @@ class EncryptionService:
         """
         return self._hash_password(password.encode(), salt)
 
+    def collect(self) -> Iterable[MetricFamily]:
+        """Gets the metrics of this service, hashes run on the event loop and therefore never queue."""
+        yield MetricFamily("password_hash_seconds", "histogram", "Password hash time.", [({}, self._hash_seconds)])
+
     @property
     def dependency(self) -> Provide:
         """Gets this service as dependency for litestar's dependency injection."""
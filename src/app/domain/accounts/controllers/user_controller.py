@@ -1,10 +1,13 @@
-from typing import Annotated, TypeVar
+from typing import Annotated, Any, TypeVar
 from uuid import UUID
 
-from litestar import Controller, Response, delete, get, post, put
+from domain.projects.dtos import DashboardRow
+from domain.projects.services import ProjectService
+from litestar import Controller, Request, Response, delete, get, post, put
 from litestar.enums import RequestEncodingType
 from litestar.params import Body, Dependency
 from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..authentication.middleware import AuthenticationMiddleware
@@ -22,6 +25,7 @@ from ..exceptions import (
     VerificationRequiredException,
 )
 from ..guards import system_admin_guard
+from ..models import User
 from ..services import UserService
 
 T = TypeVar("T")
@@ -38,6 +42,13 @@ class UserController(Controller):
         """Gets alls `Users`."""
         return await UserService.get_users(session)
 
+    @get("/me/dashboard", summary="Gets the Projects you are part of with your roles and counts")
+    async def get_dashboard_handler(
+        self, session: AsyncSession, request: Request[User, Any, Any]
+    ) -> list[DashboardRow]:
+        """Gets every `Project` you manage, engineer or are a member of, with its `Group`s and counts."""
+        return await ProjectService.get_dashboard(session, request.user.id)
+
     @get("/{user_email:str}")
     async def get_user_handler(self, session: AsyncSession, user_email: str) -> UserGetDTO:
         """Gets a specific `User`."""
@@ -54,13 +65,17 @@ class UserController(Controller):
         data: JsonEncoded[UserUpdateDTO],
     ) -> UserGetDTO:
         """Updates a specific `User`."""
-        if user := await UserService.update_user(session, encryption, user_email, data):
+        user_id = await session.scalar(select(User.id).where(User.email == user_email))
+        if user_id and (user := await UserService.update_user(session, encryption, user_email, data)):
+            await ProjectService.bump_user_revisions(session, user_id, "updated")
             return user
         raise UserNotFoundException(user_email)
 
     @delete("/{user_email:str}", guards=[system_admin_guard], status_code=HTTP_204_NO_CONTENT)
     async def delete_user_handler(self, session: AsyncSession, user_email: str) -> None:
         """Deletes a specific `User`."""
+        if user_id := await session.scalar(select(User.id).where(User.email == user_email)):
+            await ProjectService.bump_user_revisions(session, user_id, "deleted")
         if _ := await UserService.delete_user(session, user_email):
             return
         raise UserNotFoundException(user_email)
@@ -82,7 +97,7 @@ class UserController(Controller):
             return user
         raise UserNotFoundException(user_email)
 
-    @post("/login", status_code=HTTP_200_OK)
+    @post("/login", status_code=HTTP_200_OK, skip_compression=True)
     async def login_handler(
         self,
         authenticator: AuthenticationDependency,
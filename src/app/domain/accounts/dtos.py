@@ -1,11 +1,17 @@
 from uuid import UUID
 
-from lib.dto import BaseModel
+from lib.dto import BaseModel, ResponseModel, Row
 from pydantic import EmailStr
 
 
-class UserGetDTO(BaseModel):
-    email: EmailStr
+class UserRow(Row):
+    id: UUID
+    email: str
+    name: str
+
+
+class UserGetDTO(ResponseModel):
+    email: str
     name: str
     is_system_admin: bool
     is_verified: bool
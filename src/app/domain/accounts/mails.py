@@ -1,4 +1,6 @@
-from lib.mails import MailParameters, MailService
+from lib.mails import MailParameters
+from lib.outbox import Outbox
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .services import InvitedUsers
 
@@ -11,9 +13,9 @@ class UserMailService:
         return f"You've been invited to join CQ-Manager!\n\nYour initial credentials are: '{mail}' & '{password}'."
 
     @staticmethod
-    async def send_invitation_mail(mail_service: MailService, users: InvitedUsers):
+    async def queue_invitation_mail(session: AsyncSession, users: InvitedUsers):
         mails = [
             MailParameters(user.email, UserMailService.subject, UserMailService.body(user.email, password), False)
             for user, password in users.created
         ]
-        await mail_service.send_emails(mails)
+        await Outbox.add(session, mails)
@@ -3,6 +3,7 @@ import string
 from typing import Iterable, NamedTuple
 from uuid import UUID
 
+from lib.dto import rows
 from pydantic import EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -38,9 +39,8 @@ class UserService:
         :param session: An active database session.
         :return: A `list` of all `Users`.
         """
-        if users := await session.scalars(select(User)):
-            return [UserGetDTO.model_validate(user) for user in users.all()]
-        return []
+        statement = select(User.email, User.name, User.is_system_admin, User.is_verified)
+        return await rows(session, statement, UserGetDTO)
 
     @staticmethod
     async def get_user(session: AsyncSession, user_email: str) -> UserGetDTO | None:
@@ -51,7 +51,7 @@ class UserService:
         :return: The selected `User` if found.
         """
         if user := await session.scalar(select(User).where(User.email == user_email)):
-            return UserGetDTO.model_validate(user)
+            return UserGetDTO.from_attributes(user)
         return None
 
     @staticmethod
@@ -101,7 +101,7 @@ class UserService:
                 user.password_hash = password.hash
                 user.password_salt = password.salt
 
-            return UserGetDTO.model_validate(user)
+            return UserGetDTO.from_attributes(user)
         return None
 
     @staticmethod
@@ -151,7 +151,7 @@ class UserService:
             is_verified=False,
         )
         session.add(user)
-        return UserGetDTO.model_validate(user)
+        return UserGetDTO.from_attributes(user)
 
     @staticmethod
     async def verify_user(session: AsyncSession, user_email: str) -> UserGetDTO | None:
@@ -163,7 +163,7 @@ class UserService:
         """
         if user := await session.scalar(select(User).where(User.email == user_email)):
             user.is_verified = True
-            return UserGetDTO.model_validate(user)
+            return UserGetDTO.from_attributes(user)
         return None
 
     @staticmethod
@@ -1,16 +1,15 @@
-from typing import Annotated, Any, Sequence, TypeVar
+from typing import Annotated, Any, TypeVar
 from uuid import UUID
 
-from litestar import Controller, Request, get, post
+from litestar import Controller, Request, get, post, put
 from litestar.enums import RequestEncodingType
 from litestar.params import Body
-from litestar.status_codes import HTTP_200_OK
-from sqlalchemy import select
+from litestar.status_codes import HTTP_200_OK, HTTP_204_NO_CONTENT
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from ..accounts.models import User
-from .dtos import CommentCreate, CommentCreateDTO, CommentDTO
+from ..projects.guards import project_participant_guard
+from .dtos import CommentCreate, CommentCreateDTO, CommentDTO, CommentRow
 from .models import Comment
 from .services import CommentsService
 
@@ -22,20 +21,21 @@ class CommentController(Controller):
     path = "/comments"
     tags = ["Comments"]
 
-    @get("/", return_dto=CommentDTO, status_code=HTTP_200_OK)
-    async def get_comments(self, session: AsyncSession) -> Sequence[Comment]:
-        return (await session.scalars(select(Comment).options(selectinload(Comment.author)))).all()
+    @get("/", status_code=HTTP_200_OK)
+    async def get_comments(self, session: AsyncSession) -> list[CommentRow]:
+        return await CommentsService.get_comment_rows(session)
 
-    @get("/{question_id:uuid}", return_dto=CommentDTO, status_code=HTTP_200_OK)
-    async def get_comment(self, session: AsyncSession, question_id: UUID) -> Sequence[Comment]:
-        return (
-            await session.scalars(
-                select(Comment).where(Comment.question_id == question_id).options(selectinload(Comment.author))
-            )
-        ).all()
+    @get("/{question_id:uuid}", status_code=HTTP_200_OK)
+    async def get_comment(self, session: AsyncSession, question_id: UUID) -> list[CommentRow]:
+        return await CommentsService.get_comment_rows(session, Comment.question_id == question_id)
 
     @post("/", dto=CommentCreateDTO, return_dto=CommentDTO)
     async def create_comment(
         self, session: AsyncSession, data: JsonEncoded[CommentCreate], request: Request[User, Any, Any]
     ) -> Comment:
         return await CommentsService.create_comment(session=session, author_id=request.user.id, data=data)
+
+    @put("/read/{project_id:uuid}", status_code=HTTP_204_NO_CONTENT, guards=[project_participant_guard])
+    async def mark_read(self, session: AsyncSession, project_id: UUID, request: Request[User, Any, Any]) -> None:
+        """Marks all `Comment`s of a `Project` as read, they no longer count as unread on the dashboard."""
+        await CommentsService.mark_read(session, request.user.id, project_id)
@@ -1,7 +1,9 @@
+from datetime import datetime
 from uuid import UUID
 
 from advanced_alchemy.extensions.litestar import SQLAlchemyDTO, SQLAlchemyDTOConfig
-from lib.dto import BaseModel
+from domain.accounts.dtos import UserRow
+from lib.dto import BaseModel, Row
 from litestar.contrib.pydantic import PydanticDTO
 from litestar.dto import DTOConfig
 
@@ -23,6 +25,14 @@ class CommentDTO(SQLAlchemyDTO[Comment]):
     )
 
 
+class CommentRow(Row):
+    id: UUID
+    comment: str
+    author: UserRow
+    question_id: UUID
+    created_at: datetime
+
+
 class CommentCreate(BaseModel):
     comment: str
     question_id: UUID
@@ -0,0 +1,35 @@
+from domain.accounts.models import User
+from domain.questions.models import Question
+from lib.mails import MailParameters
+from lib.outbox import Outbox
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Comment
+
+
+class CommentMailService:
+    @staticmethod
+    def subject(question: str) -> str:
+        return f"New comment on '{question}'"
+
+    @staticmethod
+    def body(author: str, question: str, comment: str) -> str:
+        return f"{author} commented on your question '{question}' on CQ-Manager:\n\n{comment}"
+
+    @staticmethod
+    async def queue_comment_mail(session: AsyncSession, comment: Comment):
+        """Notifies the author of the commented `Question` with the next daily digest, unless they commented."""
+        statement = select(Question.question, Question.author_id, User.email).join(User, Question.author_id == User.id)
+        statement = statement.where(Question.id == comment.question_id)
+        question, author_id, receiver = (await session.execute(statement)).one()
+        if author_id == comment.author_id:
+            return
+        author = await session.scalar(select(User.name).where(User.id == comment.author_id))
+        mail = MailParameters(
+            receiver,
+            CommentMailService.subject(question),
+            CommentMailService.body(author, question, comment.comment),  # pyright: ignore
+            False,
+        )
+        await Outbox.add(session, [mail], digest=True)
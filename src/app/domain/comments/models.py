@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 
 from advanced_alchemy.base import UUIDAuditBase
-from sqlalchemy import ForeignKey
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import Column, ForeignKey, Table
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -12,6 +14,16 @@ if TYPE_CHECKING:
     from ..ratings.models import Question
 
 
+# comments of a project created before `read_at` are read by the user, see `CommentsService.mark_read`
+CommentReads = Table(
+    "comment_reads",
+    UUIDAuditBase.metadata,
+    Column[UUID]("user_id", ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+    Column[UUID]("project_id", ForeignKey("project.id", ondelete="CASCADE"), primary_key=True),
+    Column[datetime]("read_at", DateTimeUTC(timezone=True), nullable=False),
+)
+
+
 class Comment(UUIDAuditBase):
     comment: Mapped[str]
     question_id: Mapped[UUID] = mapped_column(ForeignKey("question.id"))
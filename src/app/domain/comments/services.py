@@ -1,12 +1,21 @@
-from typing import Sequence
+from datetime import datetime, timezone
+from typing import Any, Sequence
 from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from domain.accounts.dtos import UserRow
+from domain.accounts.models import User
+from domain.loading import profiles
+from domain.projects.models import Change
+from domain.projects.services import ProjectService
+from domain.questions.services import QuestionService
+from lib.dto import rows
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
 
-from .dtos import CommentCreate
-from .models import Comment
+from .dtos import CommentCreate, CommentRow
+from .mails import CommentMailService
+from .models import Comment, CommentReads
 
 
 class CommentsService:
@@ -14,12 +23,38 @@ class CommentsService:
     async def get_comments(session: AsyncSession, quesion_id: UUID) -> Sequence[Comment]:
         return (await session.scalars(select(Comment).where(Comment.question_id == quesion_id))).all()
 
+    @staticmethod
+    async def get_comment_rows(session: AsyncSession, *filters: ColumnElement[bool]) -> list[CommentRow]:
+        """Gets `CommentRow`s of all `Comment`s matching `filters`."""
+        statement = select(
+            Comment.id, Comment.comment, User.id, User.email, User.name, Comment.question_id, Comment.created_at
+        )
+        statement = statement.join(User, Comment.author).where(*filters)
+
+        def row(*values: Any) -> CommentRow:
+            return CommentRow(*values[:2], UserRow(*values[2:5]), *values[5:])
+
+        return await rows(session, statement, row)
+
+    @staticmethod
+    async def mark_read(session: AsyncSession, user_id: UUID, project_id: UUID) -> None:
+        """Marks all `Comment`s of a `Project` created so far as read by a given `User`."""
+        read = CommentReads.c.user_id == user_id, CommentReads.c.project_id == project_id
+        await session.execute(delete(CommentReads).where(*read))
+        values = {"user_id": user_id, "project_id": project_id, "read_at": datetime.now(timezone.utc)}
+        await session.execute(insert(CommentReads).values(values))
+        await session.commit()
+
     @staticmethod
     async def create_comment(session: AsyncSession, author_id: UUID, data: CommentCreate) -> Comment:
         comment = Comment(author_id=author_id, question_id=data.question_id, comment=data.comment)
         session.add(comment)
+        await session.flush()
+        if project_id := await QuestionService.get_project_id(session, data.question_id):
+            await ProjectService.bump_revision(session, project_id, Change("comment", comment.id, "created"))
+        await CommentMailService.queue_comment_mail(session, comment)
         await session.commit()
         await session.refresh(comment)
         return await session.scalar(
-            select(Comment).where(Comment.id == comment.id).options(selectinload(Comment.author))
+            select(Comment).where(Comment.id == comment.id).options(*profiles.options("comment"))
         )
@@ -3,13 +3,16 @@ from uuid import UUID
 
 from domain.accounts.models import User
 from domain.consolidations.services import ConsolidationService
-from domain.projects.middleware import UserProjectPermissionsMiddleware
+from domain.loading import profiles
+from domain.projects.middleware import ProjectRevisionMiddleware, UserProjectPermissionsMiddleware
+from domain.questions.dtos import QuestionOverviewDTO
 from domain.questions.models import Question
+from lib.pagination import WINDOW_SIZE, WindowSize, load_windows
 from litestar import Controller, Request, delete, get, post, put
 from litestar.enums import RequestEncodingType
+from litestar.pagination import CursorPagination
 from litestar.params import Body
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from .dtos import (
     ConsolidationCreate,
@@ -29,39 +32,60 @@ JsonEncoded = Annotated[T, Body(media_type=RequestEncodingType.JSON)]
 class ConsolidationController(Controller):
     path = "/consolidations"
     tags = ["Consolidations"]
-    middleware = [UserProjectPermissionsMiddleware]
+    middleware = [ProjectRevisionMiddleware, UserProjectPermissionsMiddleware]
 
-    default_options = [
-        selectinload(Consolidation.project),
-        selectinload(Consolidation.engineer),
-        selectinload(Consolidation.questions).options(selectinload(Question.author), selectinload(Question.ratings), selectinload(Question.group)),
-    ]
+    default_options = profiles.options("consolidation")
+    question_options = profiles.options("consolidation.questions")
+    question_page_options = profiles.options("question.overview")
 
     @get("/", return_dto=ConsolidationDTO)
     async def get_consolidations_handler(self, session: AsyncSession) -> Sequence[Consolidation]:
         """Gets a all `Consolidations`."""
-        return await ConsolidationService.get_consolidations(session, options=self.default_options)
+        consolidations = await ConsolidationService.get_consolidations(session, options=self.default_options)
+        await load_windows(session, consolidations, Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidations
 
-    @get("/{project_id:uuid}", return_dto=ConsolidationDTO)
+    @get("/{project_id:uuid}", return_dto=ConsolidationDTO, cache=True)
     async def get_project_consolidations_handler(
         self,
         session: AsyncSession,
         project_id: UUID,
     ) -> Sequence[Consolidation]:
         """Gets a all `Consolidations` belonging to a specific `Project`."""
-        return await ConsolidationService.get_consolidations(session, project_id, self.default_options)
+        consolidations = await ConsolidationService.get_consolidations(session, project_id, self.default_options)
+        await load_windows(session, consolidations, Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidations
 
-    @get("/{project_id:uuid}/{consolidation_id:uuid}", return_dto=ConsolidationDTO)
+    @get("/{project_id:uuid}/{consolidation_id:uuid}", return_dto=ConsolidationDTO, cache=True)
     async def get_project_consolidation_handler(
         self,
         session: AsyncSession,
         consolidation_id: UUID,
         project_id: UUID,
     ) -> Consolidation:
-        """Gets a single `Consolidation` belonging to a specific `Project`."""
-        return await ConsolidationService.get_consolidation(
+        """Gets a single `Consolidation` belonging to a specific `Project`.
+
+        Only the first window of `Question`s is embedded, use `questionsCursor` to fetch the rest.
+        """
+        consolidation = await ConsolidationService.get_consolidation(
             session, consolidation_id, project_id, self.default_options
         )
+        await load_windows(session, [consolidation], Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidation
+
+    @get("/{project_id:uuid}/{consolidation_id:uuid}/questions", return_dto=QuestionOverviewDTO, cache=True)
+    async def get_project_consolidation_questions_handler(
+        self,
+        session: AsyncSession,
+        consolidation_id: UUID,
+        project_id: UUID,
+        cursor: str | None = None,
+        size: WindowSize = WINDOW_SIZE,
+    ) -> CursorPagination[str | None, Question]:
+        """Gets a page of `Question`s within a `Consolidation`, pass the returned `cursor` to get the next page."""
+        return await ConsolidationService.get_questions(
+            session, consolidation_id, project_id, cursor, size, self.question_page_options
+        )
 
     @post("/{project_id:uuid}", dto=ConsolidationCreateDTO, return_dto=ConsolidationDTO)
     async def create_consolidation_handler(
@@ -72,9 +96,11 @@ class ConsolidationController(Controller):
         project_id: UUID,
     ) -> Consolidation:
         """Creates a new `Consolidation` within a given `Project`."""
-        return await ConsolidationService.create_consolidation(
+        consolidation = await ConsolidationService.create_consolidation(
             session, request.user.id, project_id, data, self.default_options
         )
+        await load_windows(session, [consolidation], Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidation
 
     @put("/{project_id:uuid}/{consolidation_id:uuid}", dto=ConsolidationUpdateDTO, return_dto=ConsolidationDTO)
     async def update_consolidation_handler(
@@ -85,9 +111,11 @@ class ConsolidationController(Controller):
         project_id: UUID,
     ) -> Consolidation:
         """Updates an existing `Consolidation` within a given `Project`."""
-        return await ConsolidationService.update_consolidation(
+        consolidation = await ConsolidationService.update_consolidation(
             session, consolidation_id, project_id, data, self.default_options
         )
+        await load_windows(session, [consolidation], Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidation
 
     @delete("/{project_id:uuid}/{consolidation_id:uuid}")
     async def delete_consolidation_handler(
@@ -108,7 +136,11 @@ class ConsolidationController(Controller):
         data: JsonEncoded[MoveQuestion],
     ) -> Consolidation:
         """Add `Questions` to an existing `Consolidation`."""
-        return await ConsolidationService.add_questions(session, consolidation_id, project_id, data, self.default_options)
+        consolidation = await ConsolidationService.add_questions(
+            session, consolidation_id, project_id, data, self.default_options
+        )
+        await load_windows(session, [consolidation], Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidation
 
     @put("/{project_id:uuid}/{consolidation_id:uuid}/questions/remove", dto=MoveQuestionDTO, return_dto=ConsolidationDTO)
     async def remove_question_handler(
@@ -119,4 +151,8 @@ class ConsolidationController(Controller):
         data: JsonEncoded[MoveQuestion],
     ) -> Consolidation:
         """Removes `Questions` from an existing `Consolidation`."""
-        return await ConsolidationService.remove_questions(session, consolidation_id, project_id,data, self.default_options)
+        consolidation = await ConsolidationService.remove_questions(
+            session, consolidation_id, project_id, data, self.default_options
+        )
+        await load_windows(session, [consolidation], Consolidation.questions, WINDOW_SIZE, self.question_options)
+        return consolidation
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from domain.questions.models import Question
 from lib.dto import BaseModel
 from litestar.contrib.pydantic.pydantic_dto_factory import PydanticDTO
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
@@ -15,7 +16,8 @@ class ConsolidationDTO(SQLAlchemyDTO[Consolidation]):
         include={
             "id",
             "name",
-            "no_questions."
+            "no_questions",
+            "questions_cursor",
             "engineer.id",
             "engineer.email",
             "engineer.name",
@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+from lib.pagination import encode_cursor
 from litestar.contrib.sqlalchemy.base import UUIDAuditBase
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, ForeignKey, Index, Table
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 from sqlalchemy.schema import ForeignKey
 
 if TYPE_CHECKING:
@@ -20,6 +21,8 @@ ConsolidatedQuestions = Table(
     UUIDAuditBase.metadata,
     Column[UUID]("consolidation_id", ForeignKey("consolidation.id"), primary_key=True),
     Column[UUID]("question_id", ForeignKey("question.id"), primary_key=True),
+    # the primary key leads with `consolidation_id`, whether a question is consolidated is looked up by this one
+    Index("ix_consolidated_questions_question_id", "question_id"),
 )
 
 
@@ -33,7 +36,15 @@ class Consolidation(UUIDAuditBase):
     questions: Mapped[list[Question]] = relationship(
         secondary="consolidated_questions", back_populates="consolidations"
     )
+    questions_total: Mapped[int | None] = query_expression()
 
     @hybrid_property
     def no_questions(self) -> int:
-        return len(self.questions)
+        return self.questions_total if self.questions_total is not None else len(self.questions)
+
+    @hybrid_property
+    def questions_cursor(self) -> str | None:
+        """Cursor to the `Question`s following a windowed `questions` collection, if any."""
+        if self.questions and len(self.questions) < self.no_questions:
+            return encode_cursor(self.questions[-1].created_at, self.questions[-1].id)
+        return None
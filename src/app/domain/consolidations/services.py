@@ -2,8 +2,13 @@ from itertools import chain
 from typing import Iterable, Sequence
 from uuid import UUID
 
+from domain.projects.models import Change
+from domain.projects.services import ProjectService
 from domain.questions.models import Question
+from lib.loading import load
+from lib.pagination import WINDOW_SIZE, paginate
 from litestar.exceptions import HTTPException
+from litestar.pagination import CursorPagination
 from litestar.status_codes import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
@@ -11,7 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.base import ExecutableOption
 
 from .dtos import ConsolidationCreate, ConsolidationUpdate, MoveQuestion
-from .models import Consolidation
+from .models import ConsolidatedQuestions, Consolidation
 
 
 class ConsolidationService:
@@ -64,6 +69,36 @@ class ConsolidationService:
             statement = statement.options(*options)
         return (await session.scalars(statement)).all()
 
+    @staticmethod
+    async def get_questions(
+        session: AsyncSession,
+        id: UUID,
+        project_id: UUID | None = None,
+        cursor: str | None = None,
+        size: int = WINDOW_SIZE,
+        options: Iterable[ExecutableOption] | None = None,
+    ) -> CursorPagination[str | None, Question]:
+        """Gets a page of `Question`s within a `Consolidation`.
+
+        :param session: An active database session.
+        :param id: Id of the `Consolidation`.
+        :param project_id: Id of the `Consolidation`s `Project`.
+        :param cursor: Cursor returned by the previous page, defaults to the first page.
+        :param size: Maximum number of `Question`s on this page.
+        :param options: Additional loading options, defaults to None.
+        :raises HTTPException: If no `Consolidation` was found.
+        :return: A page of `Question`s.
+        """
+        consolidation = await ConsolidationService.get_consolidation(session, id, project_id)
+        options = [] if not options else options
+        statement = (
+            select(Question)
+            .join(ConsolidatedQuestions, ConsolidatedQuestions.c.question_id == Question.id)
+            .where(ConsolidatedQuestions.c.consolidation_id == consolidation.id)
+            .options(*options)
+        )
+        return await paginate(session, statement, Question, cursor, size)
+
     @staticmethod
     async def create_consolidation(
         session: AsyncSession,
@@ -92,6 +127,9 @@ class ConsolidationService:
                 name=data.name, questions=questions, engineer_id=user_id, project_id=project_id
             )
             session.add(consolidation)
+            await session.flush()
+            change = Change("consolidation", consolidation.id, "created")
+            await ProjectService.bump_revision(session, project_id, change)
             await session.commit()
         except IntegrityError as error:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST) from error
@@ -110,6 +148,7 @@ class ConsolidationService:
         """
         consolidation = await ConsolidationService.get_consolidation(session, id, project_id)
         await session.delete(consolidation)
+        await ProjectService.bump_revision(session, consolidation.project_id, Change("consolidation", id, "deleted"))
         return True
 
     @staticmethod
@@ -132,13 +171,15 @@ class ConsolidationService:
         :return: The updated `Consolidation`.
         """
         if data.name:
-            consolidation = await ConsolidationService.get_consolidation(session, id, project_id, options=options)
+            consolidation = await ConsolidationService.get_consolidation(session, id, project_id)
             consolidation.name = data.name
             try:
+                change = Change("consolidation", consolidation.id, "updated")
+                await ProjectService.bump_revision(session, consolidation.project_id, change)
                 await session.commit()
             except IntegrityError as error:
                 raise HTTPException(status_code=HTTP_400_BAD_REQUEST) from error
-            return consolidation
+            return await ConsolidationService.get_consolidation(session, id, project_id, options=options)
         raise HTTPException(status_code=HTTP_404_NOT_FOUND)
 
     @staticmethod
@@ -162,10 +203,14 @@ class ConsolidationService:
         if not data.ids:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="No Ids were given.")
 
-        consolidation = await ConsolidationService.get_consolidation(session, id, project_id, options=options)
+        consolidation = await ConsolidationService.get_consolidation(
+            session, id, project_id, options=[load(Consolidation.questions)]
+        )
         questions = await session.scalars(select(Question).where(Question.id.in_(data.ids)))
 
         consolidation.questions = [*set(chain(consolidation.questions, questions))]
+        change = Change("consolidation", consolidation.id, "updated")
+        await ProjectService.bump_revision(session, consolidation.project_id, change)
         await session.commit()
         return await ConsolidationService.get_consolidation(session, id, project_id, options=options)
 
@@ -190,10 +235,14 @@ class ConsolidationService:
         if not data.ids:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="No Ids were given.")
 
-        consolidation = await ConsolidationService.get_consolidation(session, id, project_id, options=options)
+        consolidation = await ConsolidationService.get_consolidation(
+            session, id, project_id, options=[load(Consolidation.questions)]
+        )
         questions = await session.scalars(select(Question).where(Question.id.in_(data.ids)))
         for question in questions:
             if question in consolidation.questions:
                 consolidation.questions.remove(question)
+        change = Change("consolidation", consolidation.id, "updated")
+        await ProjectService.bump_revision(session, consolidation.project_id, change)
         await session.commit()
         return await ConsolidationService.get_consolidation(session, id, project_id, options=options)
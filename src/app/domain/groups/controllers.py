@@ -1,25 +1,26 @@
-from typing import Annotated, Any, Sequence, TypeVar
+from typing import Annotated, Any, TypeVar
 from uuid import UUID
-from lib.mails import MailService
 from domain.accounts.authentication.services import EncryptionService
 from domain.accounts.models import User
 from domain.groups.models import Group
-from domain.projects.middleware import UserProjectPermissionsMiddleware
+from domain.loading import profiles
+from domain.projects.middleware import ProjectRevisionMiddleware, UserProjectPermissionsMiddleware
+from domain.questions.dtos import QuestionOverviewDTO
 from domain.questions.models import Question
+from lib.pagination import WINDOW_SIZE, WindowSize, load_windows
 from litestar import Controller, delete, get, post, put
 from litestar.connection.request import Request
 from litestar.enums import RequestEncodingType
 from litestar.exceptions import HTTPException
+from litestar.pagination import CursorPagination
 from litestar.params import Body
 from litestar.status_codes import HTTP_404_NOT_FOUND
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from litestar.background_tasks import BackgroundTasks, BackgroundTask
-from litestar import Response
 from .dtos import (
     GroupCreateDTO,
     GroupDetailDTO,
     GroupDTO,
+    GroupRow,
     GroupUpdateDTO,
     GroupUsersAddDTO,
     GroupUsersRemoveDTO,
@@ -35,36 +36,52 @@ JsonEncoded = Annotated[T, Body(media_type=RequestEncodingType.JSON)]
 class GroupController(Controller):
     path = "/groups"
     tags = ["Groups"]
-    middleware = [UserGroupPermissionsMiddleware, UserProjectPermissionsMiddleware]
-
-    default_options = [
-        selectinload(Group.members),
-        selectinload(Group.project),
-        selectinload(Group.questions).options(
-            selectinload(Question.author),
-            selectinload(Question.ratings),
-        ),
-    ]
-
-    @get("/", return_dto=GroupDTO)
-    async def get_groups_handler(self, session: AsyncSession) -> Sequence[Group]:
+    middleware = [ProjectRevisionMiddleware, UserGroupPermissionsMiddleware, UserProjectPermissionsMiddleware]
+
+    default_options = profiles.options("group")
+    question_options = profiles.options("group.questions")
+    question_page_options = profiles.options("question.overview")
+
+    @get("/")
+    async def get_groups_handler(self, session: AsyncSession) -> list[GroupRow]:
         """Gets all `Group`s."""
-        return await GroupService.get_groups(session, options=self.default_options)
+        return await GroupService.get_groups(session)
 
-    @get("/{project_id:uuid}", return_dto=GroupDTO)
-    async def get_project_groups_handler(self, session: AsyncSession, project_id: UUID) -> Sequence[Group]:
+    @get("/{project_id:uuid}", cache=True)
+    async def get_project_groups_handler(self, session: AsyncSession, project_id: UUID) -> list[GroupRow]:
         """Gets all `Group`s. belonging to a given `Project`."""
-        return await GroupService.get_groups(session, project_id, self.default_options)
+        return await GroupService.get_groups(session, project_id)
 
-    @get("/{project_id:uuid}/{group_id:uuid}", return_dto=GroupDetailDTO)
+    @get("/{project_id:uuid}/{group_id:uuid}", return_dto=GroupDetailDTO, cache=True)
     async def get_group_handler(self, session: AsyncSession, group_id: UUID, project_id: UUID) -> Group:
-        """Gets a single `Group` belonging to a given `Project`."""
-        return await GroupService.get_group(session, group_id, project_id, self.default_options)
+        """Gets a single `Group` belonging to a given `Project`.
+
+        Only the first window of `Question`s is embedded, use `questionsCursor` to fetch the rest.
+        """
+        group = await GroupService.get_group(session, group_id, project_id, self.default_options)
+        await load_windows(session, [group], Group.questions, WINDOW_SIZE, self.question_options)
+        return group
+
+    @get("/{project_id:uuid}/{group_id:uuid}/questions", return_dto=QuestionOverviewDTO, cache=True)
+    async def get_group_questions_handler(
+        self,
+        session: AsyncSession,
+        group_id: UUID,
+        project_id: UUID,
+        cursor: str | None = None,
+        size: WindowSize = WINDOW_SIZE,
+    ) -> CursorPagination[str | None, Question]:
+        """Gets a page of `Question`s within a `Group`, pass the returned `cursor` to get the next page."""
+        return await GroupService.get_questions(
+            session, group_id, project_id, cursor, size, self.question_page_options
+        )
 
     @get("/direct/{group_id:uuid}", summary="Gets a single Group by its UUID only", return_dto=GroupDetailDTO)
     async def get_direct_handler(self, session: AsyncSession, group_id: UUID) -> Group:
         """Gets a single `Group`."""
-        return await GroupService.get_group(session, group_id, None, self.default_options)
+        group = await GroupService.get_group(session, group_id, None, self.default_options)
+        await load_windows(session, [group], Group.questions, WINDOW_SIZE, self.question_options)
+        return group
 
     @post("/{project_id:uuid}", return_dto=GroupDTO)
     async def create_group_handler(
@@ -73,23 +90,17 @@ class GroupController(Controller):
         encryption: EncryptionService,
         data: JsonEncoded[GroupCreateDTO],
         project_id: UUID,
-        mail_service: MailService,
-    ) -> Response[Group]:
+    ) -> Group:
         """Creates a `Group` under a given `Project`."""
-        tasks: list[BackgroundTask] = []
-        group, invite_task, message_task = await GroupService.create(
+        group = await GroupService.create(
             session,
             encryption,
             data,
             project_id,
             self.default_options,
         )
-        if invite_task:
-            tasks.append(BackgroundTask(invite_task, mail_service))
-        if message_task:
-            tasks.append(BackgroundTask(message_task, mail_service))
-        session.expunge_all()
-        return Response(group, background=BackgroundTasks(tasks) if tasks else None)
+        await load_windows(session, [group], Group.questions, 0)
+        return group
 
     @put("/{project_id:uuid}/{group_id:uuid}", return_dto=GroupDTO)
     async def update_group_handler(
@@ -100,7 +111,9 @@ class GroupController(Controller):
         project_id: UUID,
     ) -> Group:
         """Updates a `Group` under a given `Project`."""
-        return await GroupService.update(session, group_id, project_id, data, self.default_options)
+        group = await GroupService.update(session, group_id, project_id, data, self.default_options)
+        await load_windows(session, [group], Group.questions, 0)
+        return group
 
     @delete("/{project_id:uuid}/{group_id:uuid}")
     async def delete_group_handler(self, session: AsyncSession, group_id: UUID, project_id: UUID) -> None:
@@ -117,11 +130,9 @@ class GroupController(Controller):
         group_id: UUID,
         project_id: UUID,
         data: JsonEncoded[GroupUsersAddDTO],
-        mail_service: MailService,
-    ) -> Response[Group]:
+    ) -> Group:
         """Adds members to a `Group` under a given `Project`, `User`s are created the do not exists yet."""
-        tasks: list[BackgroundTask] = []
-        group, invite_task, message_task = await GroupService.add_members(
+        group = await GroupService.add_members(
             session,
             encryption,
             group_id,
@@ -129,12 +140,8 @@ class GroupController(Controller):
             data,
             self.default_options,
         )
-        if invite_task:
-            tasks.append(BackgroundTask(invite_task, mail_service))
-        if message_task:
-            tasks.append(BackgroundTask(message_task, mail_service))
-        session.expunge_all()
-        return Response(group, background=BackgroundTasks(tasks) if tasks else None)
+        await load_windows(session, [group], Group.questions, 0)
+        return group
 
     @put("/{project_id:uuid}/{group_id:uuid}/members/remove", return_dto=GroupDTO)
     async def remove_members_handler(
@@ -145,22 +152,24 @@ class GroupController(Controller):
         data: JsonEncoded[GroupUsersRemoveDTO],
     ) -> Group:
         """Removes members from a `Group` under a given `Project`."""
-        return await GroupService.remove_members(session, group_id, project_id, data, self.default_options)
+        group = await GroupService.remove_members(session, group_id, project_id, data, self.default_options)
+        await load_windows(session, [group], Group.questions, 0)
+        return group
 
-    @get("/my_groups", summary="Gets all Groups you are a member of", return_dto=GroupDTO)
-    async def my_groups(self, request: Request[User, Any, Any], session: AsyncSession) -> Sequence[Group]:
+    @get("/my_groups", summary="Gets all Groups you are a member of")
+    async def my_groups(self, request: Request[User, Any, Any], session: AsyncSession) -> list[GroupRow]:
         """Gets all `Group`s you are a member of."""
-        return await GroupService.my_groups(session, request.user.id, options=self.default_options)
+        return await GroupService.my_groups(session, request.user.id)
 
-    @get("/my_groups/{project_id:uuid}", summary="Gets all Groups you are a member of", return_dto=GroupDTO)
+    @get("/my_groups/{project_id:uuid}", summary="Gets all Groups you are a member of")
     async def my_groups_by_projects(
         self,
         request: Request[User, Any, Any],
         session: AsyncSession,
         project_id: UUID,
-    ) -> Sequence[Group]:
+    ) -> list[GroupRow]:
         """Gets all `Group`s you are a member of, filtered by a `Project`."""
-        return await GroupService.my_groups(session, request.user.id, project_id, self.default_options)
+        return await GroupService.my_groups(session, request.user.id, project_id)
 
     @post("/{group_id:uuid}/extend_members", return_dto=GroupDTO)
     async def extend_members_handler(
@@ -169,11 +178,9 @@ class GroupController(Controller):
         encryption: EncryptionService,
         group_id: UUID,
         data: JsonEncoded[GroupUsersAddDTO],
-        mail_service: MailService,
-    ) -> Response[Group]:
+    ) -> Group:
         """Extends the list of members in a `Group`."""
-        tasks: list[BackgroundTask] = []
-        group, invite_task, message_task = await GroupService.add_members(
+        group = await GroupService.add_members(
             session,
             encryption,
             group_id,
@@ -181,9 +188,5 @@ class GroupController(Controller):
             data,
             self.default_options,
         )
-        if invite_task:
-            tasks.append(BackgroundTask(invite_task, mail_service))
-        if message_task:
-            tasks.append(BackgroundTask(message_task, mail_service))
-        session.expunge_all()
-        return Response(group, background=BackgroundTasks(tasks) if tasks else None)
+        await load_windows(session, [group], Group.questions, 0)
+        return group
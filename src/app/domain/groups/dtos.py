@@ -1,6 +1,7 @@
+from datetime import datetime
 from uuid import UUID
 
-from lib.dto import BaseModel, NonEmptyString
+from lib.dto import BaseModel, NonEmptyString, Row
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
 from pydantic import EmailStr
 
@@ -26,6 +27,24 @@ class GroupDTO(SQLAlchemyDTO[Group]):
     )
 
 
+class GroupProjectRow(Row):
+    id: UUID
+    name: str
+    description: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class GroupRow(Row):
+    id: UUID
+    name: str
+    no_members: int
+    no_questions: int
+    created_at: datetime
+    updated_at: datetime
+    project: GroupProjectRow
+
+
 class GroupDetailDTO(SQLAlchemyDTO[Group]):
     config = SQLAlchemyDTOConfig(
         rename_strategy="camel",
@@ -45,6 +64,8 @@ class GroupDetailDTO(SQLAlchemyDTO[Group]):
             "members.0.id",
             "members.0.email",
             "members.0.name",
+            "questions_cursor",
+            "questions.0.id",
             "questions.0.question",
             "questions.0.aggregated_rating",
             "questions.0.author.id",
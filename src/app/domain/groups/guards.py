@@ -3,7 +3,7 @@ from uuid import UUID
 
 from domain.accounts.models import User
 from domain.projects.exceptions import ProjectManagerRequiredException
-from lib.orm import session
+from lib.batch import lookup
 from lib.utils import get_path_param
 from litestar.connection.base import ASGIConnection
 from litestar.exceptions.http_exceptions import ImproperlyConfiguredException
@@ -22,9 +22,8 @@ async def group_member_guard(connection: ASGIConnection[Any, User, Any, Any], _:
         return
 
     if group_id := get_path_param(UUID, "group_id", connection):
-        async with session() as session_:
-            if await GroupService.is_member(session_, group_id, connection.user.id):
-                return
+        if await lookup(GroupService.is_member, group_id, connection.user.id):
+            return
 
         raise GroupMembershipRequiredException()
     raise ImproperlyConfiguredException()
@@ -39,9 +38,8 @@ async def project_manager_guard(connection: ASGIConnection[Any, User, Any, Any],
         return
 
     if group_id := get_path_param(UUID, "group_id", connection):
-        async with session() as session_:
-            if await GroupService.is_manager(session_, group_id, connection.user.id):
-                return
+        if await lookup(GroupService.is_manager, group_id, connection.user.id):
+            return
 
         raise ProjectManagerRequiredException()
     raise ImproperlyConfiguredException()
@@ -1,7 +1,9 @@
 from itertools import chain
 
 from domain.accounts.services import InvitedUsers
-from lib.mails import MailParameters, MailService
+from lib.mails import MailParameters
+from lib.outbox import Outbox
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .models import Group
 
@@ -16,7 +18,7 @@ class GroupMailService:
         return f"You've been added to '{group}' a group within the '{project}' project on CQ-Manger."
 
     @staticmethod
-    async def send_invitation_mail(mail_service: MailService, users: InvitedUsers, group: Group):
+    async def queue_invitation_mail(session: AsyncSession, users: InvitedUsers, group: Group):
         mails = [
             MailParameters(
                 user.email,
@@ -26,4 +28,4 @@ class GroupMailService:
             )
             for user in chain(map(lambda u: u[0], users.created), users.existing)
         ]
-        await mail_service.send_emails(mails)
+        await Outbox.add(session, mails)
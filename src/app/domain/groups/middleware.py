@@ -1,9 +1,9 @@
 from uuid import UUID
 
 from domain.groups.services import GroupService
+from lib.batch import lookup
 from lib.middleware import AbstractUserPermissionsMiddleware
 from litestar.datastructures import MutableScopeHeaders
-from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class UserGroupPermissionsMiddleware(AbstractUserPermissionsMiddleware):
@@ -15,6 +15,6 @@ class UserGroupPermissionsMiddleware(AbstractUserPermissionsMiddleware):
     def param_name(self) -> str:
         return "group_id"
 
-    async def set_headers(self, headers: MutableScopeHeaders, session: AsyncSession, id: UUID, user_id: UUID) -> None:
-        headers[self._headers[0]] = str(await GroupService.is_member(session, id, user_id))
-        headers[self._headers[1]] = str(await GroupService.is_manager(session, id, user_id))
+    async def set_headers(self, headers: MutableScopeHeaders, id: UUID, user_id: UUID) -> None:
+        headers[self._headers[0]] = str(await lookup(GroupService.is_member, id, user_id))
+        headers[self._headers[1]] = str(await lookup(GroupService.is_manager, id, user_id))
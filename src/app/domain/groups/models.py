@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import UUID
 
+from lib.pagination import encode_cursor
 from litestar.contrib.sqlalchemy.base import UUIDAuditBase
 from sqlalchemy import Column, ForeignKey, Table
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 if TYPE_CHECKING:
     from domain.accounts.models import User
@@ -30,6 +31,7 @@ class Group(UUIDAuditBase):
     project: Mapped[Project] = relationship(back_populates="groups")
     members: Mapped[list[User]] = relationship(secondary="group_members", back_populates="joined_groups")
     questions: Mapped[list[Question]] = relationship(back_populates="group")
+    questions_total: Mapped[int | None] = query_expression()
 
     @hybrid_property
     def no_members(self) -> int:
@@ -37,4 +39,11 @@ class Group(UUIDAuditBase):
 
     @hybrid_property
     def no_questions(self) -> int:
-        return len(self.questions)
+        return self.questions_total if self.questions_total is not None else len(self.questions)
+
+    @hybrid_property
+    def questions_cursor(self) -> str | None:
+        """Cursor to the `Question`s following a windowed `questions` collection, if any."""
+        if self.questions and len(self.questions) < self.no_questions:
+            return encode_cursor(self.questions[-1].created_at, self.questions[-1].id)
+        return None
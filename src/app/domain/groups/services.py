@@ -1,5 +1,4 @@
-from functools import partial
-from typing import Coroutine, Iterable, Sequence
+from typing import Any, Iterable
 from itertools import chain
 from uuid import UUID
 
@@ -7,21 +6,25 @@ from domain.accounts.authentication.services import EncryptionService
 from domain.accounts.mails import UserMailService
 from domain.accounts.models import User
 from domain.accounts.services import UserService
-from domain.projects.models import Project
+from domain.projects.models import Change, Project
+from domain.projects.services import ProjectService
+from domain.questions.models import Question
+from lib.dto import rows
+from lib.loading import load
+from lib.pagination import WINDOW_SIZE, paginate
 from litestar.exceptions import HTTPException
+from litestar.pagination import CursorPagination
 from litestar.status_codes import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import ColumnElement
 
-from .dtos import GroupCreateDTO, GroupUpdateDTO, GroupUsersAddDTO, GroupUsersRemoveDTO
+from .dtos import GroupCreateDTO, GroupProjectRow, GroupRow, GroupUpdateDTO, GroupUsersAddDTO, GroupUsersRemoveDTO
 from .mails import GroupMailService
-from .models import Group
+from .models import Group, GroupMembers
 from .exceptions import EmptyNameException
 
-AsyncCallable = Coroutine[None, None, None]
-
 
 class GroupService:
     @staticmethod
@@ -45,19 +48,47 @@ class GroupService:
         return group
 
     @staticmethod
-    async def get_groups(
+    async def get_groups(session: AsyncSession, project_id: UUID | None = None) -> list[GroupRow]:
+        filters = [Group.project_id == project_id] if project_id else []
+        return await GroupService.get_group_rows(session, *filters)
+
+    @staticmethod
+    async def get_group_rows(session: AsyncSession, *filters: ColumnElement[bool]) -> list[GroupRow]:
+        """Gets `GroupRow`s of all `Group`s matching `filters`, counting related rows using subqueries."""
+        statement = select(
+            Group.id,
+            Group.name,
+            select(func.count()).where(GroupMembers.c.group_id == Group.id).scalar_subquery(),
+            select(func.count()).where(Question.group_id == Group.id).scalar_subquery(),
+            Group.created_at,
+            Group.updated_at,
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.created_at,
+            Project.updated_at,
+        )
+        statement = statement.join(Project, Group.project).where(*filters)
+
+        def row(*values: Any) -> GroupRow:
+            return GroupRow(*values[:6], GroupProjectRow(*values[6:]))
+
+        return await rows(session, statement, row)
+
+    @staticmethod
+    async def get_questions(
         session: AsyncSession,
+        id: UUID,
         project_id: UUID | None = None,
+        cursor: str | None = None,
+        size: int = WINDOW_SIZE,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> Sequence[Group]:
-        if project_id:
-            statement = select(Group).where(Group.project_id == project_id)
-        else:
-            statement = select(Group)
-
-        if options:
-            statement = statement.options(*options)
-        return (await session.scalars(statement)).all()
+    ) -> CursorPagination[str | None, Question]:
+        """Gets a page of `Question`s belonging to a `Group`, ordered by creation."""
+        group = await GroupService.get_group(session, id, project_id)
+        options = [] if not options else options
+        statement = select(Question).where(Question.group_id == group.id).options(*options)
+        return await paginate(session, statement, Question, cursor, size)
 
     @staticmethod
     async def create(
@@ -66,10 +97,9 @@ class GroupService:
         data: GroupCreateDTO,
         project_id: UUID,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> tuple[Group, partial[AsyncCallable] | None, partial[AsyncCallable] | None]:
+    ) -> Group:
         if not data.name:
             raise EmptyNameException()
-        options = options or []
         members: list[User] = []
         members_ = None
         if data.members:
@@ -77,12 +107,15 @@ class GroupService:
             members.extend([*members_.existing, *map(lambda u: u[0], members_.created)])
         group = Group(name=data.name, project_id=project_id, members=members)
         session.add(group)
+        await session.flush()
+        if members_:
+            group = await GroupService.get_group(session, group.id, project_id, [load(Group.project)])
+            await UserMailService.queue_invitation_mail(session, members_)
+            await GroupMailService.queue_invitation_mail(session, members_, group)
+        await ProjectService.bump_revision(session, project_id, Change("group", group.id, "created"))
         await session.commit()
         await session.refresh(group)
-        group = await GroupService.get_group(session, group.id, project_id, [*options, selectinload(Group.project)])
-        invite_task = partial(UserMailService.send_invitation_mail, users=members_) if members_ else None
-        message_task = partial(GroupMailService.send_invitation_mail, users=members_, group=group) if members_ else None
-        return group, invite_task, message_task
+        return await GroupService.get_group(session, group.id, project_id, options)
 
     @staticmethod
     async def add_members(
@@ -92,7 +125,7 @@ class GroupService:
         project_id: UUID | None,
         data: GroupUsersAddDTO,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> tuple[Group, partial[AsyncCallable] | None, partial[AsyncCallable] | None]:
+    ) -> Group:
         if not data.emails:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
@@ -101,21 +134,21 @@ class GroupService:
             id,
             project_id,
             [
-                selectinload(Group.members),
-                selectinload(Group.project),
+                load(Group.members),
+                load(Group.project),
             ],
         )
         members = await UserService.get_or_create_users(session, encryption, data.emails)
         group.members.extend(
             filter(lambda x: x not in group.members, chain(members.existing, map(lambda u: u[0], members.created))),
         )
-        
-        invite_task = partial(UserMailService.send_invitation_mail, users=members) if members.created else None
-        message_task = partial(GroupMailService.send_invitation_mail, users=members, group=group)
+        await UserMailService.queue_invitation_mail(session, members)
+        await GroupMailService.queue_invitation_mail(session, members, group)
 
+        await ProjectService.bump_revision(session, group.project_id, Change("group", group.id, "updated"))
         await session.commit()
         await session.refresh(group)
-        return await GroupService.get_group(session, group.id, project_id, options), invite_task, message_task
+        return await GroupService.get_group(session, group.id, project_id, options)
 
     @staticmethod
     async def remove_members(
@@ -128,12 +161,13 @@ class GroupService:
         if not data.ids:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
-        group = await GroupService.get_group(session, id, project_id, [selectinload(Group.members)])
+        group = await GroupService.get_group(session, id, project_id, [load(Group.members)])
 
         ids = set(data.ids)
         ex_members = filter(lambda user: user.id in ids, group.members)
         _ = [group.members.remove(user) for user in ex_members]
 
+        await ProjectService.bump_revision(session, group.project_id, Change("group", group.id, "updated"))
         await session.commit()
         await session.refresh(group)
         return await GroupService.get_group(session, group.id, project_id, options)
@@ -149,6 +183,7 @@ class GroupService:
         group = await GroupService.get_group(session, id, project_id)
         group.name = data.name if data.name else group.name
 
+        await ProjectService.bump_revision(session, group.project_id, Change("group", group.id, "updated"))
         await session.commit()
         await session.refresh(group)
         return await GroupService.get_group(session, group.id, project_id, options)
@@ -160,21 +195,16 @@ class GroupService:
         project_id: UUID,
     ) -> bool:
         result = await session.execute(delete(Group).where(Group.id == id, Group.project_id == project_id))
-        return True if result.rowcount > 0 else False
+        if result.rowcount > 0:
+            await ProjectService.bump_revision(session, project_id, Change("group", id, "deleted"))
+            return True
+        return False
 
     @staticmethod
-    async def my_groups(
-        session: AsyncSession,
-        user_id: UUID,
-        project_id: UUID | None = None,
-        options: Iterable[ExecutableOption] | None = None,
-    ) -> Sequence[Group]:
+    async def my_groups(session: AsyncSession, user_id: UUID, project_id: UUID | None = None) -> list[GroupRow]:
         """Returns all `Groups`s a given `User` is a member of."""
-        options = [] if not options else options
-        statement = select(Group) if not project_id else select(Group).where(Group.project_id == project_id)
-        statement = statement.filter(Group.members.any(User.id == user_id))
-        statement = statement.options(*options)
-        return (await session.scalars(statement)).all()
+        filters = [Group.project_id == project_id] if project_id else []
+        return await GroupService.get_group_rows(session, Group.members.any(User.id == user_id), *filters)
 
     @staticmethod
     async def is_member(session: AsyncSession, id: UUID, user_id: UUID) -> bool:
@@ -191,7 +221,7 @@ class GroupService:
         statement = (
             select(Group)
             .where(Group.id == id)
-            .options(selectinload(Group.project).options(selectinload(Project.managers)))
+            .options(load(Group.project, Project.managers))
         )
         # i think this could be done on the db as well but im not sure how without warnings,
         # this should be fine given the expected result size
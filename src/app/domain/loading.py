@@ -0,0 +1,47 @@
+from domain.accounts.models import User  # pyright: ignore  # targets of all relationships must be resolvable
+from domain.comments.models import Comment
+from domain.consolidations.models import Consolidation
+from domain.groups.models import Group
+from domain.projects.models import Project
+from domain.questions.models import Question
+from domain.ratings.models import Rating
+from domain.terms.models import Passage
+from domain.versions.models import Version
+from lib.loading import edge, profiles
+
+# profiles of all routes, named after the loaded model and the rendered shape, see `lib.loading`
+
+profiles.register(
+    "project",
+    Project,
+    Project.managers,
+    Project.engineers,
+    edge(Project.groups, Group.members, Group.questions),
+    edge(Project.consolidations, Consolidation.engineer, Consolidation.questions),
+)
+profiles.register("group", Group, Group.members, Group.project)
+profiles.register("group.questions", Question, Question.author, Question.ratings)
+profiles.register("consolidation", Consolidation, Consolidation.project, Consolidation.engineer)
+profiles.register("consolidation.questions", Question, Question.author, Question.ratings, Question.group)
+profiles.register(
+    "question.overview", Question, Question.author, Question.ratings, Question.consolidations, Question.group
+)
+profiles.register(
+    "question.detail", Question, Question.author, Question.editor, edge(Question.group, Group.project)
+)
+profiles.register("question.ratings", Question, edge(Question.ratings, Rating.author))
+profiles.register("question.comments", Question, edge(Question.comments, Comment.author))
+profiles.register(
+    "question.consolidations",
+    Question,
+    edge(
+        Question.consolidations,
+        edge(Consolidation.questions, Question.author),
+        Consolidation.engineer,
+        Consolidation.project,
+    ),
+)
+profiles.register("question.versions", Question, edge(Question.versions, Version.editor))
+profiles.register("question.annotations", Question, edge(Question.annotations, Passage.term))
+profiles.register("comment", Comment, Comment.author)
+profiles.register("rating", Rating, Rating.author)
@@ -1,32 +1,33 @@
-from typing import Annotated, Any, Sequence, TypeVar
+from typing import Annotated, Any, AsyncGenerator, Sequence, TypeVar
 from uuid import UUID
 
 from domain.accounts.authentication.services import EncryptionService
 from domain.accounts.models import User
-from domain.consolidations.models import Consolidation
-from domain.groups.models import Group
-from litestar import Controller, delete, get, post, put
+from domain.loading import profiles
+from lib.pagination import WindowSize
+from litestar import Controller, WebSocket, delete, get, post, put, websocket
+from litestar.channels import ChannelsPlugin
 from litestar.connection.request import Request
 from litestar.enums import RequestEncodingType
 from litestar.exceptions import HTTPException
 from litestar.params import Body
+from litestar.response import ServerSentEvent
 from litestar.status_codes import HTTP_404_NOT_FOUND
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from lib.mails import MailService
 from .dtos import (
+    ProjectChangesDTO,
     ProjectCreateDTO,
     ProjectDetailDTO,
     ProjectDTO,
+    ProjectRow,
     ProjectUpdateDTO,
     ProjectUsersAddDTO,
     ProjectUsersRemoveDTO,
 )
-from .middleware import UserProjectPermissionsMiddleware
+from .guards import project_participant_guard
+from .middleware import ProjectRevisionMiddleware, UserProjectPermissionsMiddleware
 from .models import Project
-from .services import ProjectService
-from litestar import Response
-from litestar.background_tasks import BackgroundTasks, BackgroundTask
+from .services import CHANGES_PAGE_SIZE, ProjectService
 
 
 T = TypeVar("T")
@@ -36,26 +37,15 @@ JsonEncoded = Annotated[T, Body(media_type=RequestEncodingType.JSON)]
 class ProjectController(Controller):
     path = "/projects"
     tags = ["Project"]
-    middleware = [UserProjectPermissionsMiddleware]
-
-    default_options = [
-        selectinload(Project.managers),
-        selectinload(Project.engineers),
-        selectinload(Project.groups).options(
-            selectinload(Group.members),
-            selectinload(Group.questions),
-        ),
-        selectinload(Project.consolidations).options(
-            selectinload(Consolidation.engineer),
-            selectinload(Consolidation.questions),
-        ),
-    ]
-
-    @get("/", return_dto=ProjectDTO)
-    async def get_projects_handler(self, session: AsyncSession) -> Sequence[Project]:
-        return await ProjectService.get_projects(session, self.default_options)
-
-    @get("/{project_id:uuid}", return_dto=ProjectDetailDTO)
+    middleware = [ProjectRevisionMiddleware, UserProjectPermissionsMiddleware]
+
+    default_options = profiles.options("project")
+
+    @get("/")
+    async def get_projects_handler(self, session: AsyncSession) -> list[ProjectRow]:
+        return await ProjectService.get_projects(session)
+
+    @get("/{project_id:uuid}", return_dto=ProjectDetailDTO, cache=True)
     async def get_project_handler(self, session: AsyncSession, project_id: UUID) -> Project:
         return await ProjectService.get_project(session, project_id, self.default_options)
 
@@ -65,22 +55,8 @@ class ProjectController(Controller):
         session: AsyncSession,
         encryption: EncryptionService,
         data: JsonEncoded[ProjectCreateDTO],
-        mail_service: MailService,
-    ) -> Response[Project]:
-        tasks: list[BackgroundTask] = []
-        project, invite_task1, invite_task2, manager_task, engineers_task = await ProjectService.create(
-            session, encryption, data, self.default_options
-        )
-        if invite_task1:
-            tasks.append(BackgroundTask(invite_task1, mail_service))
-        if invite_task2:
-            tasks.append(BackgroundTask(invite_task2, mail_service))
-        if manager_task:
-            tasks.append(BackgroundTask(manager_task, mail_service))
-        if engineers_task:
-            tasks.append(BackgroundTask(engineers_task, mail_service))
-        session.expunge_all()
-        return Response(project, background=BackgroundTasks(tasks))
+    ) -> Project:
+        return await ProjectService.create(session, encryption, data, self.default_options)
 
     @put("/{project_id:uuid}", return_dto=ProjectDTO)
     async def update_project_handler(
@@ -104,18 +80,8 @@ class ProjectController(Controller):
         encryption: EncryptionService,
         project_id: UUID,
         data: JsonEncoded[ProjectUsersAddDTO],
-        mail_service: MailService,
-    ) -> Response[Project]:
-        tasks: list[BackgroundTask] = []
-        project, invite_task, manager_task = await ProjectService.add_managers(
-            session, encryption, project_id, data, self.default_options
-        )
-        if invite_task:
-            tasks.append(BackgroundTask(invite_task, mail_service))
-        if manager_task:
-            tasks.append(BackgroundTask(manager_task, mail_service))
-        session.expunge_all()
-        return Response(project, background=BackgroundTasks(tasks))
+    ) -> Project:
+        return await ProjectService.add_managers(session, encryption, project_id, data, self.default_options)
 
     @put("/{project_id:uuid}/managers/remove", return_dto=ProjectDTO)
     async def remove_managers_handler(
@@ -133,16 +99,8 @@ class ProjectController(Controller):
         encryption: EncryptionService,
         project_id: UUID,
         data: JsonEncoded[ProjectUsersAddDTO],
-        mail_service: MailService,
-    ) -> Response[Project]:
-        tasks: list[BackgroundTask] = []
-        project, invite_task, engineer_task = await ProjectService.add_engineers(session, encryption, project_id, data, self.default_options)
-        if invite_task:
-            tasks.append(BackgroundTask(invite_task, mail_service))
-        if engineer_task:
-            tasks.append(BackgroundTask(engineer_task, mail_service))
-        session.expunge_all()
-        return Response(project, background=BackgroundTasks(tasks))
+    ) -> Project:
+        return await ProjectService.add_engineers(session, encryption, project_id, data, self.default_options)
 
     @put("/{project_id:uuid}/engineers/remove", return_dto=ProjectDTO)
     async def remove_engineers_handler(
@@ -153,7 +111,55 @@ class ProjectController(Controller):
     ) -> Project:
         return await ProjectService.remove_engineers(session, project_id, data, self.default_options)
 
+    @get(
+        "/{project_id:uuid}/changes",
+        summary="Gets the changes made to a Project since a given revision",
+        guards=[project_participant_guard],
+    )
+    async def get_changes_handler(
+        self,
+        session: AsyncSession,
+        project_id: UUID,
+        since: int = 0,
+        size: WindowSize = CHANGES_PAGE_SIZE,
+    ) -> ProjectChangesDTO:
+        """Gets entity level changes made to a `Project` after revision `since`, oldest first.
+
+        Pass the returned `revision` as `since` to continue, while `more` is set further changes are available.
+        Only the latest change per entity is guaranteed to be retained, `updated` should be treated as an upsert.
+        Responds with `410` if the requested changes were discarded, the project has to be reloaded.
+        """
+        return await ProjectService.get_changes(session, project_id, since, size)
+
+    @get("/{project_id:uuid}/events", summary="Streams changes to a Project", guards=[project_participant_guard])
+    async def events_handler(self, channels: ChannelsPlugin, project_id: UUID) -> ServerSentEvent:
+        """Streams changes made to a `Project` as server-sent events, each event covers a single revision.
+
+        Events are best effort, use `/changes` with the last seen revision to catch up after reconnecting.
+        """
+
+        async def stream() -> AsyncGenerator[bytes, None]:
+            async with channels.start_subscription(ProjectService.channel(project_id)) as subscriber:
+                async for event in subscriber.iter_events():
+                    yield event
+
+        return ServerSentEvent(stream())
+
+    @websocket("/{project_id:uuid}/events/ws", guards=[project_participant_guard])
+    async def events_socket_handler(
+        self,
+        socket: WebSocket[User, Any, Any],
+        channels: ChannelsPlugin,
+        project_id: UUID,
+    ) -> None:
+        """Streams changes made to a `Project` over a websocket, see `/events`."""
+        await socket.accept()
+        async with channels.start_subscription(ProjectService.channel(project_id)) as subscriber:
+            async with subscriber.run_in_background(socket.send_data):
+                while True:
+                    await socket.receive_data("text")
+
     @get("/my_projects", summary="Gets all Projects you are a part of", return_dto=ProjectDTO)
     async def my_projects(self, request: Request[User, Any, Any], session: AsyncSession) -> Sequence[Project]:
-        """Get all projects you are part of, meaning you are a member of any `Group` within one of these `Project`s."""
+        """Get all projects you are part of, meaning you manage, engineer or are a member of any of their `Group`s."""
         return await ProjectService.my_projects(session, request.user.id, self.default_options)
@@ -1,10 +1,12 @@
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from lib.dto import BaseModel, NonEmptyString
+from lib.dto import BaseModel, NonEmptyString, ResponseModel, Row
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
 from pydantic import EmailStr
 
-from .models import Project
+from .models import ChangeAction, Project
 
 
 class ProjectDTO(SQLAlchemyDTO[Project]):
@@ -23,6 +25,40 @@ class ProjectDTO(SQLAlchemyDTO[Project]):
     )
 
 
+class ProjectRow(Row):
+    id: UUID
+    name: str
+    description: str | None
+    no_managers: int
+    no_engineers: int
+    no_groups: int
+    no_consolidations: int
+    total_members: int
+
+
+ProjectRole = Literal["manager", "engineer", "member"]
+
+
+class DashboardGroupRow(Row):
+    id: UUID
+    name: str
+    is_member: bool
+    no_questions: int
+
+
+class DashboardRow(Row):
+    """A `Project` as listed on a `User`s dashboard, see `ProjectService.get_dashboard`."""
+
+    id: UUID
+    name: str
+    description: str | None
+    roles: list[ProjectRole]
+    no_questions: int
+    no_unconsolidated_questions: int
+    no_unread_comments: int
+    groups: list[DashboardGroupRow]
+
+
 class ProjectDetailDTO(SQLAlchemyDTO[Project]):
     config = SQLAlchemyDTOConfig(
         rename_strategy="camel",
@@ -81,3 +117,17 @@ class ProjectUsersRemoveDTO(BaseModel):
 class ProjectUpdateDTO(BaseModel):
     name: NonEmptyString | None
     description: NonEmptyString | None = None
+
+
+class ProjectChangeDTO(ResponseModel):
+    revision: int
+    entity: str
+    entity_id: UUID
+    action: ChangeAction
+    changed_at: datetime
+
+
+class ProjectChangesDTO(ResponseModel):
+    changes: list[ProjectChangeDTO]
+    revision: int
+    more: bool
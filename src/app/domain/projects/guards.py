@@ -2,7 +2,7 @@ from typing import Any
 from uuid import UUID
 
 from domain.accounts.models import User
-from lib.orm import session
+from lib.batch import lookup
 from lib.utils import get_path_param
 from litestar.connection.base import ASGIConnection
 from litestar.exceptions.http_exceptions import ImproperlyConfiguredException
@@ -22,9 +22,8 @@ async def project_manager_guard(connection: ASGIConnection[Any, User, Any, Any],
     Requires a `project_id: UUID` path parameter to be set.
     """
     if project_id := get_path_param(UUID, "project_id", connection):
-        async with session() as session_:
-            if await ProjectService.is_manager(session_, project_id, connection.user.id):
-                return
+        if await lookup(ProjectService.is_manager, project_id, connection.user.id):
+            return
 
         raise ProjectManagerRequiredException()
     raise ImproperlyConfiguredException()
@@ -36,9 +35,8 @@ async def ontology_engineer_guard(connection: ASGIConnection[Any, User, Any, Any
     Requires a `project_id: UUID` path parameter to be set.
     """
     if project_id := get_path_param(UUID, "project_id", connection):
-        async with session() as session_:
-            if await ProjectService.is_engineer(session_, project_id, connection.user.id):
-                return
+        if await lookup(ProjectService.is_engineer, project_id, connection.user.id):
+            return
 
         raise ProjectEngineerRequiredException()
     raise ImproperlyConfiguredException()
@@ -51,8 +49,24 @@ async def project_member_guard(connection: ASGIConnection[Any, User, Any, Any],
     """
 
     if project_id := get_path_param(UUID, "project_id", connection):
-        async with session() as session_:
-            if await ProjectService.is_member(session_, project_id, connection.user.id):
+        if await lookup(ProjectService.is_member, project_id, connection.user.id):
+            return
+
+        raise ProjectMembershipRequiredException()
+    raise ImproperlyConfiguredException()
+
+
+async def project_participant_guard(connection: ASGIConnection[Any, User, Any, Any], _: BaseRouteHandler) -> None:
+    """Limit route access to managers, ontology engineers and members of a project as well as system admins.
+
+    Requires a `project_id: UUID` path parameter to be set.
+    """
+    if project_id := get_path_param(UUID, "project_id", connection):
+        if connection.user.is_system_admin:
+            return
+
+        for check in (ProjectService.is_manager, ProjectService.is_engineer, ProjectService.is_member):
+            if await lookup(check, project_id, connection.user.id):
                 return
 
         raise ProjectMembershipRequiredException()
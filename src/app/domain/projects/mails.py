@@ -2,7 +2,9 @@ from itertools import chain
 from typing import Literal
 
 from domain.accounts.services import InvitedUsers
-from lib.mails import MailParameters, MailService
+from lib.mails import MailParameters
+from lib.outbox import Outbox
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .models import Project
 
@@ -17,8 +19,8 @@ class ProjectMailService:
         return f"You've been assigned as '{type}' to '{project}' a project on CQ-Manger."
 
     @staticmethod
-    async def send_invitation_mail(
-        mail_service: MailService,
+    async def queue_invitation_mail(
+        session: AsyncSession,
         users: InvitedUsers,
         project: Project,
         role: Literal["manager", "ontology engineer"],
@@ -32,4 +34,4 @@ class ProjectMailService:
             )
             for user in chain(map(lambda u: u[0], users.created), users.existing)
         ]
-        await mail_service.send_emails(mails)
+        await Outbox.add(session, mails)
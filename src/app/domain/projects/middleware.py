@@ -1,9 +1,22 @@
+import hashlib
+from typing import Any
+from urllib.parse import urlencode
 from uuid import UUID
 
+from domain.accounts.models import User
 from domain.projects.services import ProjectService
 from lib.middleware import AbstractUserPermissionsMiddleware
+from lib.negotiation import negotiate
+from lib.batch import lookup
+from lib.utils import get_path_param
+from litestar import HttpMethod, Request
+from litestar.connection.base import ASGIConnection
 from litestar.datastructures import MutableScopeHeaders
-from sqlalchemy.ext.asyncio import AsyncSession
+from litestar.enums import ScopeType
+from litestar.exceptions import ImproperlyConfiguredException
+from litestar.middleware.base import AbstractMiddleware
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+from litestar.types import Message, Receive, Scope, Send
 
 
 class UserProjectPermissionsMiddleware(AbstractUserPermissionsMiddleware):
@@ -15,7 +28,81 @@ class UserProjectPermissionsMiddleware(AbstractUserPermissionsMiddleware):
     def param_name(self) -> str:
         return "project_id"
 
-    async def set_headers(self, headers: MutableScopeHeaders, session: AsyncSession, id: UUID, user_id: UUID) -> None:
-        headers[self._headers[0]] = str(await ProjectService.is_manager(session, id, user_id))
-        headers[self._headers[1]] = str(await ProjectService.is_engineer(session, id, user_id))
-        headers[self._headers[2]] = str(await ProjectService.is_member(session, id, user_id))
+    async def set_headers(self, headers: MutableScopeHeaders, id: UUID, user_id: UUID) -> None:
+        headers[self._headers[0]] = str(await lookup(ProjectService.is_manager, id, user_id))
+        headers[self._headers[1]] = str(await lookup(ProjectService.is_engineer, id, user_id))
+        headers[self._headers[2]] = str(await lookup(ProjectService.is_member, id, user_id))
+
+
+class ProjectRevisionMiddleware(AbstractMiddleware):
+    """Answers conditional `GET`s on project routes using the project's change counter.
+
+    Every write to a `Project` or its children bumps the project's revision (see `ProjectService.bump_revision`).
+    `GET` requests carrying a `project_id` url parameter are tagged with a weak `ETag` derived from that
+    revision, if the client already holds the current tag the handler is skipped and `304` is returned.
+
+    Notes:
+        * must be placed before all other route middlewares, permission headers are not sent on `304`
+        * the tag includes the `User` as responses and permission headers differ per user
+        * the tag includes the negotiated media type, JSON and MessagePack are distinct representations
+        * the revision is stored in the connection's state, see `project_cache_key`
+    """
+
+    scopes = {ScopeType.HTTP}
+    exclude = ["/users/register", "/users/login", "/schema", "/events$"]
+
+    @staticmethod
+    def etag(revision: int, user_id: UUID, media_type: str) -> str:
+        """Builds the weak entity tag for a project `revision` as seen by a given `User` in a given `media_type`."""
+        digest = hashlib.sha1(f"{revision}:{user_id}:{media_type}".encode()).hexdigest()[:16]
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def matches(etag: str, if_none_match: str | None) -> bool:
+        """Weakly compares an `ETag` against the contents of an `If-None-Match` header."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        connection: ASGIConnection[Any, User, Any, Any] = ASGIConnection(scope)
+        parameter = get_path_param(UUID, "project_id", connection)
+        if Request(scope).method != HttpMethod.GET or not parameter:
+            return await self.app(scope, receive, send)
+
+        revision = await lookup(ProjectService.get_revision, parameter)
+        connection.state.project_revision = revision
+        etag = self.etag(revision, connection.user.id, negotiate(connection))
+
+        if self.matches(etag, connection.headers.get("If-None-Match")):
+            headers = [(b"etag", etag.encode()), (b"cache-control", b"private, no-cache")]
+            await send({"type": "http.response.start", "status": HTTP_304_NOT_MODIFIED, "headers": headers})
+            return await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == HTTP_200_OK:
+                headers = MutableScopeHeaders.from_message(message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = "private, no-cache"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def project_cache_key(request: Request[User, Any, Any]) -> str:
+    """Builds response cache keys for project routes guarded by `ProjectRevisionMiddleware`.
+
+    The key contains the project's revision, so any write to the project makes previous entries unreachable.
+    Payloads do not depend on the `User` apart from system admin rights, permission headers and `ETag`s
+    are set by the route middlewares on every response including cached ones.
+    Only query parameters declared by the handler are part of the key, so clients can't mint entries at will.
+    The negotiated media type is part of the key, responses are cached encoded.
+    """
+    if (revision := request.state.get("project_revision")) is None:
+        raise ImproperlyConfiguredException("Cached project routes require the ProjectRevisionMiddleware.")
+
+    declared = request.route_handler.parsed_fn_signature.parameters
+    query_params = sorted((key, value) for key, value in request.query_params.dict().items() if key in declared)
+    version = f"{revision}:{int(request.user.is_system_admin)}:{negotiate(request)}"
+    return f"{request.method}{request.url.path}?{urlencode(query_params, doseq=True)}#{version}"
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Literal, NamedTuple
 from uuid import UUID
 
 from litestar.contrib.sqlalchemy.base import UUIDAuditBase
-from sqlalchemy import Column, ForeignKey, Table
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table, Uuid
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,6 +31,35 @@ ProjectEngineers = Table(
 )
 
 
+# monotonic change counter per project, rows outlive their project so that deletions change it as well
+# changes up to and including `horizon` have been discarded from the change log
+ProjectRevisions = Table(
+    "project_revisions",
+    UUIDAuditBase.metadata,
+    Column[UUID]("project_id", Uuid, primary_key=True),
+    Column[int]("revision", Integer, nullable=False, default=0),
+    Column[int]("horizon", Integer, nullable=False, default=0),
+)
+
+
+# append-only log of entity level changes, each row belongs to the revision created by the write
+ProjectChanges = Table(
+    "project_changes",
+    UUIDAuditBase.metadata,
+    Column[int]("id", Integer, primary_key=True, autoincrement=True),
+    Column[UUID]("project_id", Uuid, nullable=False),
+    Column[int]("revision", Integer, nullable=False),
+    Column[str]("entity", String(length=32), nullable=False),
+    Column[UUID]("entity_id", Uuid, nullable=False),
+    Column[str]("action", String(length=16), nullable=False),
+    Column[datetime]("changed_at", DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)),
+    Index("ix_project_changes_project_id_revision", "project_id", "revision"),
+)
+
+ChangeAction = Literal["created", "updated", "deleted"]
+Change = NamedTuple("Change", [("entity", str), ("entity_id", UUID), ("action", ChangeAction)])
+
+
 class Project(UUIDAuditBase):
     name: Mapped[str] = mapped_column()
     description: Mapped[str | None] = mapped_column(default=None)
@@ -1,24 +1,51 @@
-from functools import partial
-from typing import Coroutine, Iterable, Sequence
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Sequence, get_args
 from uuid import UUID
 
 from domain.accounts.authentication.services import EncryptionService
 from domain.accounts.mails import UserMailService
 from domain.accounts.models import User
 from domain.accounts.services import UserService
-from domain.groups.models import Group
+from domain.comments.models import Comment, CommentReads
+from domain.consolidations.models import ConsolidatedQuestions, Consolidation
+from domain.groups.models import Group, GroupMembers
+from domain.questions.models import Question
+from domain.ratings.models import Rating
+from domain.versions.models import Version
+from lib.channels import publish_on_commit
+from lib.dto import rows
+from lib.loading import load
 from litestar.exceptions import HTTPException
-from litestar.status_codes import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-from sqlalchemy import delete, select
+from litestar.status_codes import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_410_GONE
+from sqlalchemy import and_, case, delete, func, insert, literal, or_, select, union, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
-
-from .dtos import ProjectCreateDTO, ProjectUpdateDTO, ProjectUsersAddDTO, ProjectUsersRemoveDTO
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import CompoundSelect
+
+from .dtos import (
+    DashboardGroupRow,
+    DashboardRow,
+    ProjectChangeDTO,
+    ProjectChangesDTO,
+    ProjectCreateDTO,
+    ProjectRole,
+    ProjectRow,
+    ProjectUpdateDTO,
+    ProjectUsersAddDTO,
+    ProjectUsersRemoveDTO,
+)
 from .mails import ProjectMailService
-from .models import Project
+from .models import Change, ChangeAction, Project, ProjectChanges, ProjectEngineers, ProjectManagers, ProjectRevisions
+
+CHANGES_PAGE_SIZE = 100
+COMPACTION_INTERVAL = 100
+CHANGE_RETENTION = timedelta(days=30)
 
-AsyncCallable = Coroutine[None, None, None]
+# dialects supporting `INSERT ... ON CONFLICT DO UPDATE`
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
 
 class ProjectService:
@@ -38,13 +65,24 @@ class ProjectService:
         return project
 
     @staticmethod
-    async def get_projects(
-        session: AsyncSession, options: Iterable[ExecutableOption] | None = None
-    ) -> Sequence[Project]:
-        statement = select(Project)
-        if options:
-            statement = statement.options(*options)
-        return (await session.scalars(statement)).all()
+    async def get_projects(session: AsyncSession) -> list[ProjectRow]:
+        return await ProjectService.get_project_rows(session)
+
+    @staticmethod
+    async def get_project_rows(session: AsyncSession, *filters: ColumnElement[bool]) -> list[ProjectRow]:
+        """Gets `ProjectRow`s of all `Project`s matching `filters`, counting related rows using subqueries."""
+        members = select(func.count()).select_from(GroupMembers).join(Group).where(Group.project_id == Project.id)
+        statement = select(
+            Project.id,
+            Project.name,
+            Project.description,
+            select(func.count()).where(ProjectManagers.c.project_id == Project.id).scalar_subquery(),
+            select(func.count()).where(ProjectEngineers.c.project_id == Project.id).scalar_subquery(),
+            select(func.count()).where(Group.project_id == Project.id).scalar_subquery(),
+            select(func.count()).where(Consolidation.project_id == Project.id).scalar_subquery(),
+            members.scalar_subquery(),
+        ).where(*filters)
+        return await rows(session, statement, ProjectRow)
 
     @staticmethod
     async def create(
@@ -52,13 +90,7 @@ class ProjectService:
         encryption: EncryptionService,
         data: ProjectCreateDTO,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> tuple[
-        Project,
-        partial[AsyncCallable] | None,
-        partial[AsyncCallable] | None,
-        partial[AsyncCallable] | None,
-        partial[AsyncCallable] | None,
-    ]:
+    ) -> Project:
         managers: list[User] = []
         managers_ = None
         if data.managers:
@@ -73,29 +105,17 @@ class ProjectService:
 
         project = Project(name=data.name, description=data.description, managers=managers, engineers=engineers)
         session.add(project)
-        await session.commit()
-        await session.refresh(project)
-        project = await ProjectService.get_project(session, project.id, options)
-
-        invite_task1, invite_task2 = None, None
-        if managers_ and managers_.created:
-            invite_task1 = partial(UserMailService.send_invitation_mail, users=managers_)
-        if engineers_ and engineers_.created:
-            invite_task2 = partial(UserMailService.send_invitation_mail, users=engineers_)
-
-        manager_task = None
+        await session.flush()
         if managers_:
-            manager_task = partial(
-                ProjectMailService.send_invitation_mail, users=managers_, project=project, role="manager"
-            )
-
-        engineers_task = None
+            await UserMailService.queue_invitation_mail(session, managers_)
+            await ProjectMailService.queue_invitation_mail(session, managers_, project, "manager")
         if engineers_:
-            engineers_task = partial(
-                ProjectMailService.send_invitation_mail, users=engineers_, project=project, role="ontology engineer"
-            )
-
-        return project, invite_task1, invite_task2, manager_task, engineers_task
+            await UserMailService.queue_invitation_mail(session, engineers_)
+            await ProjectMailService.queue_invitation_mail(session, engineers_, project, "ontology engineer")
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "created"))
+        await session.commit()
+        await session.refresh(project)
+        return await ProjectService.get_project(session, project.id, options)
 
     @staticmethod
     async def add_managers(
@@ -104,12 +124,12 @@ class ProjectService:
         id: UUID,
         data: ProjectUsersAddDTO,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> tuple[Project, partial[AsyncCallable] | None, partial[AsyncCallable] | None]:
+    ) -> Project:
         if not data.emails:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
         managers = await UserService.get_or_create_users(session, encryption, data.emails)
-        project = await ProjectService.get_project(session, id, [selectinload(Project.managers)])
+        project = await ProjectService.get_project(session, id, [load(Project.managers)])
 
         project.managers.extend(
             filter(
@@ -118,19 +138,13 @@ class ProjectService:
             ),
         )
 
-        initiation_task = None
-        if managers:
-            initiation_task = partial(UserMailService.send_invitation_mail, users=managers)
-
-        manager_task = None
-        if managers:
-            manager_task = partial(
-                ProjectMailService.send_invitation_mail, users=managers, project=project, role="manager"
-            )
+        await UserMailService.queue_invitation_mail(session, managers)
+        await ProjectMailService.queue_invitation_mail(session, managers, project, "manager")
 
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "updated"))
         await session.commit()
         await session.refresh(project)
-        return await ProjectService.get_project(session, project.id, options), initiation_task, manager_task
+        return await ProjectService.get_project(session, project.id, options)
 
     @staticmethod
     async def remove_managers(
@@ -142,12 +156,13 @@ class ProjectService:
         if not data.ids:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
-        project = await ProjectService.get_project(session, id, [selectinload(Project.managers)])
+        project = await ProjectService.get_project(session, id, [load(Project.managers)])
 
         ids = set(data.ids)
         ex_managers = filter(lambda user: user.id in ids, project.managers)
         _ = [project.managers.remove(user) for user in ex_managers]
 
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "updated"))
         await session.commit()
         await session.refresh(project)
         return await ProjectService.get_project(session, project.id, options)
@@ -159,12 +174,12 @@ class ProjectService:
         id: UUID,
         data: ProjectUsersAddDTO,
         options: Iterable[ExecutableOption] | None = None,
-    ) -> tuple[Project, partial[AsyncCallable] | None, partial[AsyncCallable] | None]:
+    ) -> Project:
         if not data.emails:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
         engineers = await UserService.get_or_create_users(session, encryption, data.emails)
-        project = await ProjectService.get_project(session, id, [selectinload(Project.engineers)])
+        project = await ProjectService.get_project(session, id, [load(Project.engineers)])
 
         project.engineers.extend(
             filter(
@@ -173,19 +188,13 @@ class ProjectService:
             ),
         )
 
-        initiation_task = None
-        if engineers:
-            initiation_task = partial(UserMailService.send_invitation_mail, users=engineers)
-
-        engineers_task = None
-        if engineers:
-            engineers_task = partial(
-                ProjectMailService.send_invitation_mail, users=engineers, project=project, role="ontology engineer"
-            )
+        await UserMailService.queue_invitation_mail(session, engineers)
+        await ProjectMailService.queue_invitation_mail(session, engineers, project, "ontology engineer")
 
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "updated"))
         await session.commit()
         await session.refresh(project)
-        return await ProjectService.get_project(session, project.id, options), initiation_task, engineers_task
+        return await ProjectService.get_project(session, project.id, options)
 
     @staticmethod
     async def remove_engineers(
@@ -197,16 +206,143 @@ class ProjectService:
         if not data.ids:
             raise HTTPException(status_code=HTTP_400_BAD_REQUEST)  # TODO: raise explicit exception
 
-        project = await ProjectService.get_project(session, id, [selectinload(Project.engineers)])
+        project = await ProjectService.get_project(session, id, [load(Project.engineers)])
 
         ids = set(data.ids)
         ex_engineers = filter(lambda user: user.id in ids, project.engineers)
         _ = [project.engineers.remove(user) for user in ex_engineers]
 
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "updated"))
         await session.commit()
         await session.refresh(project)
         return await ProjectService.get_project(session, project.id, options)
 
+    @staticmethod
+    async def get_revision(session: AsyncSession, id: UUID) -> int:
+        """Gets the change counter of a given `Project`, `0` if it was never changed."""
+        statement = select(ProjectRevisions.c.revision).where(ProjectRevisions.c.project_id == id)
+        return await session.scalar(statement) or 0
+
+    @staticmethod
+    async def bump_revision(session: AsyncSession, id: UUID, *changes: Change) -> int:
+        """Increments the change counter of a given `Project` and appends `changes` to its change log.
+
+        Must be called by every write that changes data visible through a `Project`s routes,
+        within the same transaction as the change itself. Every `COMPACTION_INTERVAL` revisions
+        the change log is compacted as well. Once committed the changes are published on the project's channel.
+
+        :return: The new revision.
+        """
+        if upsert := _UPSERTS.get(session.bind.dialect.name):
+            statement = upsert(ProjectRevisions).values(project_id=id, revision=1)
+            statement = statement.on_conflict_do_update(
+                index_elements=[ProjectRevisions.c.project_id],
+                set_={"revision": ProjectRevisions.c.revision + 1},
+            )
+            revision: int = await session.scalar(statement.returning(ProjectRevisions.c.revision))  # type: ignore
+        else:
+            statement = update(ProjectRevisions).where(ProjectRevisions.c.project_id == id)
+            statement = statement.values(revision=ProjectRevisions.c.revision + 1)
+            if not (revision := await session.scalar(statement.returning(ProjectRevisions.c.revision))):
+                revision = 1
+                await session.execute(insert(ProjectRevisions).values(project_id=id, revision=revision))
+
+        if changes:
+            values = [{"project_id": id, "revision": revision, **change._asdict()} for change in changes]
+            await session.execute(insert(ProjectChanges), values)
+            event = {"revision": revision, "changes": [change._asdict() for change in changes]}
+            publish_on_commit(session, ProjectService.channel(id), event)
+        if revision % COMPACTION_INTERVAL == 0:
+            await ProjectService.compact_changes(session, id)
+        return revision
+
+    @staticmethod
+    async def bump_user_revisions(session: AsyncSession, user_id: UUID, action: ChangeAction) -> None:
+        """Bumps every `Project` showing a given `User`, as member, role or author of its content."""
+        by_group = select(Group.project_id).join(GroupMembers).where(GroupMembers.c.user_id == user_id)
+        by_question = select(Group.project_id).join(Question)
+        by_question = by_question.where((Question.author_id == user_id) | (Question.editor_id == user_id))
+        statement = union(
+            select(ProjectManagers.c.project_id).where(ProjectManagers.c.user_id == user_id),
+            select(ProjectEngineers.c.project_id).where(ProjectEngineers.c.user_id == user_id),
+            select(Consolidation.project_id).where(Consolidation.engineer_id == user_id),
+            by_group,
+            by_question,
+            select(Group.project_id).join(Question).join(Comment).where(Comment.author_id == user_id),
+            select(Group.project_id).join(Question).join(Rating).where(Rating.author_id == user_id),
+            select(Group.project_id).join(Question).join(Version).where(Version.editor_id == user_id),
+        )
+        for project_id in (await session.scalars(statement)).all():
+            await ProjectService.bump_revision(session, project_id, Change("user", user_id, action))
+
+    @staticmethod
+    def channel(id: UUID) -> str:
+        """Gets the name of the channel events of a given `Project` are published on."""
+        return f"projects.{id}"
+
+    @staticmethod
+    async def compact_changes(session: AsyncSession, id: UUID, retention: timedelta = CHANGE_RETENTION) -> None:
+        """Bounds the change log of a given `Project`.
+
+        Only the latest change per entity is kept, clients treat `updated` as an upsert anyway.
+        Changes older than `retention` are dropped entirely and the project's horizon is moved past them,
+        clients that have not synced since then have to reload the project.
+        """
+        latest = select(func.max(ProjectChanges.c.id)).where(ProjectChanges.c.project_id == id)
+        latest = latest.group_by(ProjectChanges.c.entity, ProjectChanges.c.entity_id)
+        await session.execute(
+            delete(ProjectChanges).where(ProjectChanges.c.project_id == id, ProjectChanges.c.id.not_in(latest))
+        )
+
+        expired = select(func.max(ProjectChanges.c.revision)).where(
+            ProjectChanges.c.project_id == id,
+            ProjectChanges.c.changed_at < datetime.now(timezone.utc) - retention,
+        )
+        if horizon := await session.scalar(expired):
+            await session.execute(
+                delete(ProjectChanges).where(ProjectChanges.c.project_id == id, ProjectChanges.c.revision <= horizon)
+            )
+            statement = update(ProjectRevisions).where(ProjectRevisions.c.project_id == id)
+            await session.execute(statement.values(horizon=horizon))
+
+    @staticmethod
+    async def get_changes(
+        session: AsyncSession,
+        id: UUID,
+        since: int = 0,
+        size: int = CHANGES_PAGE_SIZE,
+    ) -> ProjectChangesDTO:
+        """Gets the changes made to a given `Project` after revision `since`.
+
+        Pages only end on revision boundaries, so a page may exceed `size` if a single revision does.
+
+        :param since: The last revision known to the client.
+        :param size: The maximum number of changes on this page.
+        :raises HTTPException: If changes after `since` have been discarded, the client has to reload the project.
+        :return: The changes and the revision to pass as `since` for the next page.
+        """
+        statement = select(ProjectRevisions.c.horizon).where(ProjectRevisions.c.project_id == id)
+        if since < (await session.scalar(statement) or 0):
+            raise HTTPException(status_code=HTTP_410_GONE, detail="Changes since this revision were discarded.")
+
+        statement = select(ProjectChanges).where(ProjectChanges.c.project_id == id, ProjectChanges.c.revision > since)
+        statement = statement.order_by(ProjectChanges.c.revision, ProjectChanges.c.id)
+        changes = (await session.execute(statement.limit(size + 1))).all()
+
+        more = len(changes) > size
+        if more:
+            cut = changes[size].revision
+            changes = [change for change in changes[:size] if change.revision != cut]
+            if not changes:
+                statement = statement.where(ProjectChanges.c.revision == cut)
+                changes = (await session.execute(statement)).all()
+
+        return ProjectChangesDTO(
+            changes=[ProjectChangeDTO.from_attributes(change) for change in changes],
+            revision=changes[-1].revision if changes else max(since, await ProjectService.get_revision(session, id)),
+            more=more,
+        )
+
     @staticmethod
     async def update(
         session: AsyncSession,
@@ -218,14 +354,22 @@ class ProjectService:
         project.name = data.name if data.name else project.name
         project.description = data.description if data.description else project.description
 
+        await ProjectService.bump_revision(session, project.id, Change("project", project.id, "updated"))
         await session.commit()
         await session.refresh(project)
         return await ProjectService.get_project(session, project.id, options)
 
     @staticmethod
     async def delete(session: AsyncSession, id: UUID) -> bool:
+        """Deletes a `Project` and publishes the deletion as its last change.
+
+        Its revision and change log are kept, ETags and cached responses of the project must not become valid again.
+        """
         result = await session.execute(delete(Project).where(Project.id == id))
-        return True if result.rowcount > 0 else False
+        if result.rowcount > 0:
+            await ProjectService.bump_revision(session, id, Change("project", id, "deleted"))
+            return True
+        return False
 
     @staticmethod
     async def my_projects(
@@ -233,12 +377,79 @@ class ProjectService:
         user_id: UUID,
         options: Iterable[ExecutableOption] | None = None,
     ) -> Sequence[Project]:
-        """Returns all `Project`s a given `User` is a member of."""
+        """Returns all `Project`s a given `User` manages, engineers or is a member of, each once."""
         options = [] if not options else options
-        statement = select(Project).join(Group).filter(Group.members.any(User.id == user_id))
+        participations = ProjectService.participations(user_id).subquery()
+        statement = select(Project).where(Project.id.in_(select(participations.c.project_id)))
         statement = statement.options(*options)
         return (await session.scalars(statement)).all()
 
+    @staticmethod
+    def participations(user_id: UUID) -> CompoundSelect:
+        """Selects `project_id` and `role` of every `ProjectRole` a given `User` has, once per `Project` and role."""
+        managers = select(ProjectManagers.c.project_id, literal("manager").label("role"))
+        engineers = select(ProjectEngineers.c.project_id, literal("engineer"))
+        members = select(Group.project_id, literal("member")).join(GroupMembers, GroupMembers.c.group_id == Group.id)
+        return union(
+            managers.where(ProjectManagers.c.user_id == user_id),
+            engineers.where(ProjectEngineers.c.user_id == user_id),
+            members.where(GroupMembers.c.user_id == user_id),
+        )
+
+    @staticmethod
+    async def get_dashboard(session: AsyncSession, user_id: UUID) -> list[DashboardRow]:
+        """Gets a `DashboardRow` of every `Project` a given `User` has any `ProjectRole` in.
+
+        Runs two statements regardless of the number of projects, one for the projects with their roles and counts
+        joined from grouped subqueries and one for their groups. Comments are unread if written by another `User`
+        after the user last marked the project's comments read (see `CommentsService.mark_read`).
+        """
+        participations = ProjectService.participations(user_id).subquery()
+        project_ids = select(participations.c.project_id)
+        flags = [func.max(case((participations.c.role == role, 1), else_=0)) for role in get_args(ProjectRole)]
+        roles = select(participations.c.project_id, *flags).group_by(participations.c.project_id).subquery()
+
+        consolidated = select(ConsolidatedQuestions).where(ConsolidatedQuestions.c.question_id == Question.id)
+        unconsolidated = func.count(case((~consolidated.exists(), Question.id))).label("unconsolidated")
+        questions = select(Group.project_id, func.count(Question.id).label("total"), unconsolidated)
+        questions = questions.join(Question, Group.questions).where(Group.project_id.in_(project_ids))
+        questions = questions.group_by(Group.project_id).subquery()
+
+        read = and_(CommentReads.c.user_id == user_id, CommentReads.c.project_id == Group.project_id)
+        unread = select(Group.project_id, func.count(Comment.id).label("total")).join(Question, Group.questions)
+        unread = unread.join(Comment, Question.comments).outerjoin(CommentReads, read)
+        unread = unread.where(Group.project_id.in_(project_ids), Comment.author_id != user_id)
+        unread = unread.where(or_(CommentReads.c.read_at.is_(None), Comment.created_at > CommentReads.c.read_at))
+        unread = unread.group_by(Group.project_id).subquery()
+
+        member = select(GroupMembers).where(GroupMembers.c.group_id == Group.id, GroupMembers.c.user_id == user_id)
+        counts = select(Question.group_id, func.count().label("total")).join(Group, Question.group)
+        counts = counts.where(Group.project_id.in_(project_ids)).group_by(Question.group_id).subquery()
+        statement = select(Group.project_id, Group.id, Group.name, member.exists(), func.coalesce(counts.c.total, 0))
+        statement = statement.outerjoin(counts, counts.c.group_id == Group.id).where(Group.project_id.in_(project_ids))
+        groups: defaultdict[UUID, list[DashboardGroupRow]] = defaultdict(list)
+        for project_id, id, name, is_member, no_questions in await session.execute(statement.order_by(Group.name)):
+            groups[project_id].append(DashboardGroupRow(id, name, bool(is_member), no_questions))
+
+        statement = select(
+            Project.id,
+            Project.name,
+            Project.description,
+            *roles.c[1:],
+            func.coalesce(questions.c.total, 0),
+            func.coalesce(questions.c.unconsolidated, 0),
+            func.coalesce(unread.c.total, 0),
+        )
+        statement = statement.join(roles, roles.c.project_id == Project.id)
+        statement = statement.outerjoin(questions, questions.c.project_id == Project.id)
+        statement = statement.outerjoin(unread, unread.c.project_id == Project.id)
+
+        def row(id: UUID, name: str, description: str | None, *values: Any) -> DashboardRow:
+            project_roles = [role for role, flag in zip(get_args(ProjectRole), values) if flag]
+            return DashboardRow(id, name, description, project_roles, *values[len(flags) :], groups[id])
+
+        return await rows(session, statement.order_by(Project.name), row)
+
     @staticmethod
     async def is_manager(session: AsyncSession, id: UUID, user_id: UUID) -> bool:
         """Checks wether a given `User` is a manager of the given `Project`."""
@@ -2,14 +2,15 @@ from typing import Annotated, Any, Sequence, TypeVar
 from uuid import UUID
 
 from domain.accounts.models import User
-from domain.comments.models import Comment
-from domain.consolidations.models import Consolidation
 from domain.groups.middleware import UserGroupPermissionsMiddleware
 from domain.groups.models import Group
-from domain.projects.middleware import UserProjectPermissionsMiddleware
+from domain.loading import profiles
+from domain.projects.middleware import ProjectRevisionMiddleware, UserProjectPermissionsMiddleware
+from domain.projects.models import Change
+from domain.projects.services import ProjectService
 from domain.questions.services import QuestionService
-from domain.ratings.models import Rating
 from domain.versions.models import Version
+from lib.loading import load
 from litestar import Controller, Request, delete, get, post, put
 from litestar.enums import RequestEncodingType
 from litestar.exceptions import HTTPException
@@ -18,13 +19,12 @@ from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CON
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from .dtos import (
     QuestionCreate,
     QuestionCreateDTO,
     QuestionDetailDTO,
-    QuestionOverviewDTO,
+    QuestionRow,
 )
 from .models import Question
 from domain.terms.services import AnnotationService
@@ -39,26 +39,9 @@ JsonEncoded = Annotated[T, Body(media_type=RequestEncodingType.JSON)]
 class QuestionController(Controller):
     path = "/questions/"
     tags = ["Questions"]
-    middleware = [UserGroupPermissionsMiddleware, UserProjectPermissionsMiddleware]
-
-    default_options = [
-        selectinload(Question.author),
-        selectinload(Question.ratings),
-        selectinload(Question.consolidations),
-        selectinload(Question.group).options(selectinload(Group.project)),
-    ]
-    detail_options = [
-        selectinload(Question.author),
-        selectinload(Question.ratings).options(selectinload(Rating.author)),
-        selectinload(Question.consolidations).options(
-            selectinload(Consolidation.questions).options(selectinload(Question.author)),
-            selectinload(Consolidation.engineer),
-        ),
-        selectinload(Question.group).options(selectinload(Group.project)),
-        selectinload(Question.versions),
-        selectinload(Question.annotations).options(selectinload(Passage.term)),
-        selectinload(Question.comments).options(selectinload(Comment.author)),
-    ]
+    middleware = [ProjectRevisionMiddleware, UserGroupPermissionsMiddleware, UserProjectPermissionsMiddleware]
+
+    detail_options = profiles.options("question.detail")
 
     @post("/{group_id:uuid}", dto=QuestionCreateDTO, return_dto=QuestionDetailDTO, status_code=HTTP_201_CREATED)
     async def create_question(
@@ -67,6 +50,7 @@ class QuestionController(Controller):
         data: JsonEncoded[QuestionCreate],
         request: Request[User, Any, Any],
         group_id: UUID,
+        expand: str | None = None,
     ) -> Question:
         """
         Creates a new `Question`
@@ -75,10 +59,12 @@ class QuestionController(Controller):
         :param request: Request[User, Any, Any]
         :param session: The session object to use for database operations.
         :param data: The question data to be created.
+        :param expand: Comma separated relationships to include in the response.
         :return: The created question data.
         """
+        options = [*self.detail_options, *QuestionDetailDTO.expansions.options(expand)]
         try:
-            statement = select(Group).where(Group.id == group_id).options(selectinload(Group.project))
+            statement = select(Group).where(Group.id == group_id).options(load(Group.project))
             if not (group := await session.scalar(statement)):
                 raise HTTPException(status_code=404, detail="Group not found.")
 
@@ -101,12 +87,12 @@ class QuestionController(Controller):
             )
 
             session.add(question)
+            await session.flush()
+            await ProjectService.bump_revision(session, group.project_id, Change("question", question.id, "created"))
             await session.commit()
             await session.refresh(question)
 
-            question = await session.scalar(
-                select(Question).where(Question.id == question.id).options(*self.detail_options)
-            )
+            question = await session.scalar(select(Question).where(Question.id == question.id).options(*options))
             if question:
                 return question
             else:
@@ -114,29 +100,37 @@ class QuestionController(Controller):
         except IntegrityError:
             raise HTTPException(status_code=400, detail="Integrity violated.")
 
-    @get("/", return_dto=QuestionOverviewDTO, status_code=HTTP_200_OK)
-    async def get_questions(self, session: AsyncSession) -> Sequence[Question]:
+    @get("/", status_code=HTTP_200_OK)
+    async def get_questions(self, session: AsyncSession) -> list[QuestionRow]:
         """
         :param session: AsyncSession object used to execute the database query and retrieve questions.
         :return: A list of QuestionDTO objects representing the retrieved questions.
         """
-        return (await session.scalars(select(Question).options(*self.default_options))).all()
+        return await QuestionService.get_question_rows(session)
 
-    @get("/{group_id:uuid}", return_dto=QuestionOverviewDTO, status_code=HTTP_200_OK)
-    async def get_group_questions(self, session: AsyncSession, group_id: UUID) -> Sequence[Question]:
+    @get("/{group_id:uuid}", status_code=HTTP_200_OK)
+    async def get_group_questions(self, session: AsyncSession, group_id: UUID) -> list[QuestionRow]:
         """Gets all `Question`s belonging to a given `Group`."""
-        return (
-            await session.scalars(select(Question).where(Question.group_id == group_id).options(*self.default_options))
-        ).all()
+        return await QuestionService.get_question_rows(session, Question.group_id == group_id)
 
     @get("/{group_id:uuid}/{question_id:uuid}", return_dto=QuestionDetailDTO, status_code=HTTP_200_OK)
-    async def get_question(self, session: AsyncSession, question_id: UUID, group_id: UUID) -> Question:
+    async def get_question(
+        self,
+        session: AsyncSession,
+        question_id: UUID,
+        group_id: UUID,
+        expand: str | None = None,
+    ) -> Question:
         """
         Retrieves a question by its ID.
 
+        Related collections are only loaded when requested, e.g. `?expand=ratings,comments`.
+        Allowed expansions are `ratings`, `comments`, `consolidations`, `versions` and `annotations`.
+
         :param group_id:
         :param session: An `AsyncSession` object representing the database session.
         :param question_id: A `UUID` object representing the ID of the question to retrieve.
+        :param expand: Comma separated relationships to include in the response.
         :return: A `QuestionDTO` object containing the retrieved question.
         :raises HTTPException: If the question with the specified ID is not found.
         """
@@ -144,7 +138,7 @@ class QuestionController(Controller):
         question = await session.scalar(
             select(Question)
             .where(Question.id == question_id, Question.group_id == group_id)
-            .options(*self.detail_options)
+            .options(*self.detail_options, *QuestionDetailDTO.expansions.options(expand))
         )
 
         if not question:
@@ -164,7 +158,9 @@ class QuestionController(Controller):
         data: JsonEncoded[QuestionCreate],
         question_id: UUID,
         request: Request[User, Any, Any],
+        expand: str | None = None,
     ) -> Question:
+        options = [*self.detail_options, *QuestionDetailDTO.expansions.options(expand)]
         question = await session.scalar(select(Question).where(Question.id == question_id))
 
         if not question:
@@ -182,12 +178,14 @@ class QuestionController(Controller):
             question.question = data.question
             question.version_number = question.version_number + 1
             session.add(question)
+            if project_id := await QuestionService.get_project_id(session, question.id):
+                await ProjectService.bump_revision(session, project_id, Change("question", question.id, "updated"))
             await session.commit()
             await session.refresh(question)
             await session.refresh(version)
 
             if updated_question := await session.scalar(
-                select(Question).where(Question.id == question.id).options(*self.detail_options)
+                select(Question).where(Question.id == question.id).options(*options)
             ):
                 return updated_question
             else:
@@ -215,14 +213,16 @@ class QuestionController(Controller):
         if not question:
             raise HTTPException(status_code=404, detail="Question not found")
 
+        if project_id := await QuestionService.get_project_id(session, question.id):
+            await ProjectService.bump_revision(session, project_id, Change("question", question.id, "deleted"))
         await session.delete(question)
         return
 
     @get(
         "/by_project/{project_id:uuid}",
         summary="Gets all Questions that are part of a Project",
-        return_dto=QuestionOverviewDTO,
+        cache=True,
     )
-    async def by_project(self, session: AsyncSession, project_id: UUID) -> Sequence[Question]:
+    async def by_project(self, session: AsyncSession, project_id: UUID) -> list[QuestionRow]:
         """Gets all `Question`s that are part of a `Project`."""
-        return await QuestionService.get_questions_by_project(session, project_id, self.detail_options)
+        return await QuestionService.get_questions_by_project(session, project_id)
@@ -1,13 +1,14 @@
 from uuid import UUID
 
-from lib.dto import BaseModel
+from domain.accounts.dtos import UserRow
+from domain.loading import profiles
+from domain.terms.dtos import AnnotationDTO
+from lib.dto import BaseModel, ExpandableDTO, Expansion, ExpansionRegistry, Row
 from litestar.contrib.pydantic.pydantic_dto_factory import PydanticDTO
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
 from litestar.dto import DTOConfig
 
 from .models import Question
-from domain.terms.dtos import AnnotationDTO
-
 
 
 class QuestionOverviewDTO(SQLAlchemyDTO[Question]):
@@ -17,7 +18,7 @@ class QuestionOverviewDTO(SQLAlchemyDTO[Question]):
             "group.id",
             "group.name",
             "question",
-            "rating",
+            "aggregated_rating",
             "author.id",
             "author.email",
             "author.name",
@@ -27,7 +28,21 @@ class QuestionOverviewDTO(SQLAlchemyDTO[Question]):
     )
 
 
-class QuestionDetailDTO(SQLAlchemyDTO[Question]):
+class QuestionGroupRow(Row):
+    id: UUID
+    name: str
+
+
+class QuestionRow(Row):
+    id: UUID
+    group: QuestionGroupRow
+    question: str
+    aggregated_rating: int
+    author: UserRow
+    no_consolidations: int
+
+
+class QuestionDetailDTO(ExpandableDTO[Question]):
     config = SQLAlchemyDTOConfig(
         max_nested_depth=3,
         include={
@@ -35,11 +50,6 @@ class QuestionDetailDTO(SQLAlchemyDTO[Question]):
             "question",
             "group_id",
             "version_number",
-            "ratings.0.rating",
-            "ratings.0.author.id",
-            "ratings.0.author.email",
-            "ratings.0.author.name",
-            "aggregated_rating",
             "author.id",
             "author.email",
             "author.name",
@@ -50,39 +60,72 @@ class QuestionDetailDTO(SQLAlchemyDTO[Question]):
             "group.name",
             "group.project.id",
             "group.project.name",
-            "comments.0.author.id",
-            "comments.0.author.email",
-            "comments.0.author.name",
-            "comments.0.comment",
-            "comments.0.created_at",
-            "no_consolidations",
-            "consolidations.0.id",
-            "consolidations.0.name",
-            "consolidations.0.no_questions",
-            "consolidations.0.project.id",
-            "consolidations.0.project.name",
-            "consolidations.0.engineer.id",
-            "consolidations.0.engineer.email",
-            "consolidations.0.engineer.name",
-            "consolidations.0.questions.0.id",
-            "consolidations.0.questions.0.group_id",
-            "consolidations.0.questions.0.question",
-            "consolidations.0.questions.0.author.id",
-            "consolidations.0.questions.0.author.email",
-            "consolidations.0.questions.0.author.name",
-            "versions.0.question_string",
-            "versions.0.version_number",
-            "versions.0.editor.id",
-            "versions.0.editor.email",
-            "versions.0.editor.name",
-            "annotations.0.id",
-            "annotations.0.content",
-            "annotations.0.term.id",
-            "annotations.0.term.content",
-
         },
         rename_strategy="camel",
     )
+    expansions = ExpansionRegistry(
+        {
+            "ratings": Expansion(
+                include={
+                    "ratings.0.rating",
+                    "ratings.0.author.id",
+                    "ratings.0.author.email",
+                    "ratings.0.author.name",
+                    "aggregated_rating",
+                },
+                options=profiles.options("question.ratings"),
+            ),
+            "comments": Expansion(
+                include={
+                    "comments.0.author.id",
+                    "comments.0.author.email",
+                    "comments.0.author.name",
+                    "comments.0.comment",
+                    "comments.0.created_at",
+                },
+                options=profiles.options("question.comments"),
+            ),
+            "consolidations": Expansion(
+                include={
+                    "no_consolidations",
+                    "consolidations.0.id",
+                    "consolidations.0.name",
+                    "consolidations.0.no_questions",
+                    "consolidations.0.project.id",
+                    "consolidations.0.project.name",
+                    "consolidations.0.engineer.id",
+                    "consolidations.0.engineer.email",
+                    "consolidations.0.engineer.name",
+                    "consolidations.0.questions.0.id",
+                    "consolidations.0.questions.0.group_id",
+                    "consolidations.0.questions.0.question",
+                    "consolidations.0.questions.0.author.id",
+                    "consolidations.0.questions.0.author.email",
+                    "consolidations.0.questions.0.author.name",
+                },
+                options=profiles.options("question.consolidations"),
+            ),
+            "versions": Expansion(
+                include={
+                    "versions.0.question_string",
+                    "versions.0.version_number",
+                    "versions.0.editor.id",
+                    "versions.0.editor.email",
+                    "versions.0.editor.name",
+                },
+                options=profiles.options("question.versions"),
+            ),
+            "annotations": Expansion(
+                include={
+                    "annotations.0.id",
+                    "annotations.0.content",
+                    "annotations.0.term.id",
+                    "annotations.0.term.content",
+                },
+                options=profiles.options("question.annotations"),
+            ),
+        }
+    )
 
 
 class QuestionCreate(BaseModel):
@@ -1,21 +1,52 @@
-from typing import Iterable, Sequence
+from typing import Any
 from uuid import UUID
 
+from domain.accounts.dtos import UserRow
+from domain.accounts.models import User
+from domain.consolidations.models import ConsolidatedQuestions
 from domain.groups.models import Group
-from sqlalchemy import select
+from domain.ratings.models import Rating
+from lib.dto import rows
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import ColumnElement
 
+from .dtos import QuestionGroupRow, QuestionRow
 from .models import Question
 
 
 class QuestionService:
     @staticmethod
-    async def get_questions_by_project(
-        session: AsyncSession,
-        project_id: UUID,
-        options: Iterable[ExecutableOption] | None = None,
-    ) -> Sequence[Question]:
-        options = [] if not options else options
-        statement = select(Question).join(Group).filter(Group.project_id == project_id).options(*options)
-        return (await session.scalars(statement)).all()
+    async def get_project_id(session: AsyncSession, question_id: UUID) -> UUID | None:
+        """Gets the id of the `Project` a `Question` belongs to, `None` if the question does not exist."""
+        statement = select(Group.project_id).join(Question).where(Question.id == question_id)
+        return await session.scalar(statement)
+
+    @staticmethod
+    async def get_questions_by_project(session: AsyncSession, project_id: UUID) -> list[QuestionRow]:
+        return await QuestionService.get_question_rows(session, Group.project_id == project_id)
+
+    @staticmethod
+    async def get_question_rows(session: AsyncSession, *filters: ColumnElement[bool]) -> list[QuestionRow]:
+        """Gets `QuestionRow`s of all `Question`s matching `filters`, aggregating related rows using subqueries."""
+        average = func.coalesce(func.sum(Rating.rating) // func.count(), 0)
+        rating = select(average).where(Rating.question_id == Question.id)
+        consolidations = select(func.count()).where(ConsolidatedQuestions.c.question_id == Question.id)
+        statement = select(
+            Question.id,
+            Group.id,
+            Group.name,
+            Question.question,
+            rating.scalar_subquery(),
+            User.id,
+            User.email,
+            User.name,
+            consolidations.scalar_subquery(),
+        )
+        statement = statement.join(Group, Question.group).join(User, Question.author).where(*filters)
+
+        def row(*values: Any) -> QuestionRow:
+            group, author = QuestionGroupRow(*values[1:3]), UserRow(*values[5:8])
+            return QuestionRow(values[0], group, *values[3:5], author, values[8])
+
+        return await rows(session, statement, row)
@@ -1,9 +1,12 @@
 from uuid import UUID, uuid4
 
+from domain.loading import profiles
+from domain.projects.models import Change
+from domain.projects.services import ProjectService
+from domain.questions.services import QuestionService
 from litestar.exceptions import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from .dtos import RatingSet
 from .models import Rating
@@ -20,27 +23,33 @@ class RatingService:
         :return: The saved ratings.
         :rtype: RatingSet
         """
+        project_id = await QuestionService.get_project_id(session, data.question_id)
+
         if rating := await session.scalar(
             select(Rating)
             .where(Rating.author_id == author_id)
             .where(Rating.question_id == data.question_id)
-            .options(selectinload(Rating.author))
+            .options(*profiles.options("rating"))
         ):
             rating.rating = data.rating
             session.add(rating)
+            if project_id:
+                await ProjectService.bump_revision(session, project_id, Change("rating", rating.id, "updated"))
             await session.commit()
             await session.refresh(rating)
 
         else:
             rating = Rating(id=uuid4(), rating=data.rating, author_id=author_id, question_id=data.question_id)
             session.add(rating)
+            if project_id:
+                await ProjectService.bump_revision(session, project_id, Change("rating", rating.id, "created"))
             await session.commit()
             await session.refresh(rating)
             rating = await session.scalar(
                 select(Rating)
                 .where(Rating.author_id == author_id)
                 .where(Rating.question_id == data.question_id)
-                .options(selectinload(Rating.author))
+                .options(*profiles.options("rating"))
             )
 
         return rating
@@ -50,7 +59,7 @@ class RatingService:
             select(Rating)
             .where(Rating.author_id == user_id)
             .where(Rating.question_id == question_id)
-            .options(selectinload(Rating.author))
+            .options(*profiles.options("rating"))
         ):
             return rating
         else:
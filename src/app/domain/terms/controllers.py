@@ -1,31 +1,30 @@
 from typing import Sequence
 from uuid import UUID
 
-from domain.questions.dtos import QuestionOverviewDTO
-from domain.questions.models import Question
+from domain.projects.middleware import ProjectRevisionMiddleware
+from domain.questions.dtos import QuestionRow
 from litestar import Controller, get, put
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .dtos import AnnotationAddDTO, AnnotationRemove, AnnotationRemoveDTO, PassageDTO, TermDTO
+from .dtos import AnnotationAddDTO, AnnotationRemove, AnnotationRemoveDTO, PassageDTO, TermRow
 from .models import Passage, Term
 from .services import AnnotationService
 
-from domain.questions.controller import QuestionController
-
 
 class TermController(Controller):
     tags = ["Terms"]
     path = "/terms"
+    middleware = [ProjectRevisionMiddleware]
 
-    @get("/", summary="Get All", return_dto=TermDTO)
-    async def get_all(self, session: AsyncSession) -> Sequence[Term]:
+    @get("/", summary="Get All")
+    async def get_all(self, session: AsyncSession) -> list[TermRow]:
         """Gets all `Terms` within the system."""
-        return await AnnotationService.list(session)
+        return await AnnotationService.get_term_rows(session)
 
-    @get("/project/{project_id:uuid}", summary="Get Terms by Project", return_dto=TermDTO)
-    async def get_all_project(self, session: AsyncSession, project_id: UUID) -> Sequence[Term]:
+    @get("/project/{project_id:uuid}", summary="Get Terms by Project", cache=True)
+    async def get_all_project(self, session: AsyncSession, project_id: UUID) -> list[TermRow]:
         """Gets all `Term`s and  `Passage`s within a `Project`."""
-        return await AnnotationService.list(session, (Term.project_id == project_id,))
+        return await AnnotationService.get_term_rows(session, Term.project_id == project_id)
 
     @get("/question/{question_id:uuid}", summary="Get Passages by Question", return_dto=PassageDTO)
     async def get_all_question_project(self, session: AsyncSession, question_id: UUID) -> Sequence[Passage]:
@@ -42,9 +41,11 @@ class TermController(Controller):
         """Removes one or more `Passage`s and `Term`s from a `Question`, returns leftover `Passage`s."""
         return await AnnotationService.remove_annotations(session, question_id, data)
 
-    @get("/{project_id:uuid}/{term_id:uuid}", summary="Get Question by Term", return_dto=QuestionOverviewDTO)
-    async def get_by_term(self, session: AsyncSession, project_id: UUID, term_id: UUID) -> Sequence[Question]:
+    @get(
+        "/{project_id:uuid}/{term_id:uuid}",
+        summary="Get Question by Term",
+        cache=True,
+    )
+    async def get_by_term(self, session: AsyncSession, project_id: UUID, term_id: UUID) -> list[QuestionRow]:
         """Gets all `Question`s within a given `Project` that share the given `Term`."""
-        return await AnnotationService.list_questions_by_term(
-            session, term_id, project_id, QuestionController.default_options
-        )
+        return await AnnotationService.list_questions_by_term(session, term_id, project_id)
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from lib.dto import BaseModel, NonEmptyString
+from lib.dto import BaseModel, NonEmptyString, Row
 from litestar.contrib.pydantic import PydanticDTO
 from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO, SQLAlchemyDTOConfig
 from litestar.dto import DTOConfig
@@ -15,6 +15,12 @@ class TermDTO(SQLAlchemyDTO[Term]):
     )
 
 
+class TermRow(Row):
+    id: UUID
+    project_id: UUID
+    content: str
+
+
 class PassageDTO(SQLAlchemyDTO[Passage]):
     config = SQLAlchemyDTOConfig(
         include={"id", "term_id", "content"},
@@ -1,30 +1,28 @@
 from typing import Iterable, Sequence
 from uuid import UUID
 
+from domain.projects.models import Change
+from domain.projects.services import ProjectService
+from domain.questions.dtos import QuestionRow
 from domain.questions.models import Question
+from domain.questions.services import QuestionService
+from lib.dto import rows
+from lib.loading import load
 from litestar.exceptions import NotFoundException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.elements import ColumnElement
 
-from .dtos import AnnotationAddDTO, AnnotationRemove
+from .dtos import AnnotationAddDTO, AnnotationRemove, TermRow
 from .models import Passage, Term
 
 
 class AnnotationService:
     @staticmethod
-    async def list(
-        session: AsyncSession,
-        filters: Iterable[ColumnElement[bool]] | None = None,
-        options: Iterable[ExecutableOption] | None = None,
-    ) -> Sequence[Term]:
-        options = [] if not options else options
-        filters = [] if not filters else filters
-        statement = select(Term).where(*filters).options(*options)
-        scalars = await session.scalars(statement)
-        return scalars.all()
+    async def get_term_rows(session: AsyncSession, *filters: ColumnElement[bool]) -> list[TermRow]:
+        """Gets `TermRow`s of all `Term`s matching `filters`."""
+        return await rows(session, select(Term.id, Term.project_id, Term.content).where(*filters), TermRow)
 
     @staticmethod
     async def list_by_question(
@@ -42,19 +40,9 @@ class AnnotationService:
         return scalars.all()
 
     @staticmethod
-    async def list_questions_by_term(
-        session: AsyncSession,
-        term_id: UUID,
-        project_id: UUID,
-        options: Iterable[ExecutableOption] | None = None,
-    ) -> Sequence[Question]:
-        options = [] if not options else options
-        subquery = select(Term).where(Term.id == term_id, Term.project_id == project_id).subquery()
-        statement = select(Question).join(Passage, Question.annotations)
-        statement = statement.join(subquery, Passage.term_id == subquery.c.id)
-        statement = statement.options(*options)
-        scalars = await session.scalars(statement)
-        return scalars.all()
+    async def list_questions_by_term(session: AsyncSession, term_id: UUID, project_id: UUID) -> list[QuestionRow]:
+        term = Passage.term.has((Term.id == term_id) & (Term.project_id == project_id))
+        return await QuestionService.get_question_rows(session, Question.annotations.any(term))
 
     @staticmethod
     async def get_or_create_term(session: AsyncSession, project_id: UUID, term: str) -> Term:
@@ -63,6 +51,8 @@ class AnnotationService:
 
         model = Term(content=term, project_id=project_id)
         session.add(model)
+        await session.flush()
+        await ProjectService.bump_revision(session, project_id, Change("term", model.id, "created"))
         await session.commit()
         await session.refresh(model)
         return model
@@ -96,8 +86,8 @@ class AnnotationService:
             select(Question)
             .where(Question.id == question_id)
             .options(
-                selectinload(Question.annotations).options(selectinload(Passage.term)),
-                selectinload(Question.group),
+                load(Question.annotations, Passage.term),
+                load(Question.group),
                 *options,
             )
         )
@@ -109,6 +99,8 @@ class AnnotationService:
                 assert question
                 if passage not in question.annotations:
                     question.annotations.append(passage)
+            change = Change("question", question.id, "updated")
+            await ProjectService.bump_revision(session, question.group.project_id, change)
             return question.annotations
         raise NotFoundException()
 
@@ -123,9 +115,11 @@ class AnnotationService:
         statement = (
             select(Question)
             .where(Question.id == question_id)
-            .options(selectinload(Question.annotations), selectinload(Question.group))
+            .options(load(Question.annotations), load(Question.group))
         )
         if question := await session.scalar(statement):
+            change = Change("question", question.id, "updated")
+            await ProjectService.bump_revision(session, question.group.project_id, change)
             if data.term_ids:
                 statement = select(Passage).where(
                     Passage.term_id.in_(data.term_ids),
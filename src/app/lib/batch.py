@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+from urllib.parse import unquote
+
+import msgspec
+from anyio import CancelScope, Lock, create_task_group, sleep_forever
+from litestar import Request, post
+from litestar.config.app import AppConfig
+from litestar.exceptions import ValidationException
+from litestar.router import Router
+from litestar.status_codes import HTTP_200_OK, HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED, HTTP_400_BAD_REQUEST
+from litestar.types import Guard, HTTPScope, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .dto import BaseModel, ResponseModel
+from .negotiation import negotiate
+from .orm import session
+
+T = TypeVar("T")
+
+_SHARED_HEADERS = {b"authorization", b"cookie", b"accept"}
+"""Headers of a batch passed to all of its requests, they can't be set per request."""
+
+_CONDITIONAL_HEADERS = {b"if-none-match", b"if-match", b"if-modified-since"}
+"""Headers of a batch not passed to its requests, they are set per request."""
+
+_EMPTY_STATUS_CODES = {HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED}
+"""Status codes of responses without a body, all other responses are streamed if sent without a length."""
+
+_BODY_HEADERS = {b"accept-encoding", b"content-length", b"content-type", b"transfer-encoding"}
+"""Headers describing the body of a batch, requests are sent without a body and answered uncompressed."""
+
+
+@dataclass
+class _Context:
+    session: AsyncSession
+    lock: Lock = field(default_factory=Lock)
+    results: dict[Hashable, Any] = field(default_factory=dict)
+
+
+_context: ContextVar[_Context | None] = ContextVar("batch", default=None)
+
+
+async def lookup(function: Callable[..., Awaitable[T]], *args: Hashable) -> T:
+    """Calls `function(session, *args)` using a new session, within a batch the result is shared.
+
+    Used for the lookups repeated by every request, e.g. the `User` of a token, guards and permission headers.
+    Within a `Batch` all lookups use the batch's session one at a time and each lookup runs at most once.
+    """
+    if not (context := _context.get()):
+        async with session() as session_:
+            return await function(session_, *args)
+
+    key = (function, *args)
+    async with context.lock:
+        if key not in context.results:
+            context.results[key] = await function(context.session, *args)
+        return context.results[key]
+
+
+class BatchRequest(BaseModel):
+    path: str
+    headers: dict[str, str] = {}
+
+
+class BatchResponse(ResponseModel):
+    status: int
+    headers: dict[str, str]
+    body: msgspec.Raw | str | None
+    """The encoded body if encoded as negotiated for the batch, otherwise its text."""
+
+
+@dataclass(frozen=True)
+class Batch:
+    """Runs several `GET` requests concurrently in a single round trip at `path`.
+
+    Requests are dispatched through the whole application as if sent separately, sharing the batch's
+    headers and authorization. Lookups done by every request share a session and their results (see `lookup`),
+    so the `User`, guards and permission headers of a project are looked up once per batch.
+    Responses are returned in order, their bodies embedded as is.
+
+    Notes:
+        * route handlers use a session per request, sessions can't be used concurrently
+        * responses of a request are not compressed, the batch's response is
+        * streamed responses (sent without a `Content-Length`) are not supported and answered with `400`
+    """
+
+    guards: list[Guard] = field(default_factory=list)
+    max_requests: int = 20
+    path: str = "/batch"
+
+    def _scope(self, scope: HTTPScope, request: BatchRequest) -> HTTPScope:
+        path, _, query_string = request.path.partition("?")
+        headers = [header for header in scope["headers"] if header[0] not in _CONDITIONAL_HEADERS | _BODY_HEADERS]
+        headers.append((b"accept-encoding", b"identity"))
+        for name, value in request.headers.items():
+            if (name_ := name.lower().encode("latin-1")) not in _SHARED_HEADERS | _BODY_HEADERS:
+                headers.append((name_, value.encode("latin-1")))
+
+        return {  # type: ignore
+            "type": "http",
+            "asgi": scope.get("asgi", {"version": "3.0"}),
+            "http_version": scope.get("http_version", "1.1"),
+            "scheme": scope.get("scheme", "http"),
+            "server": scope.get("server"),
+            "client": scope.get("client"),
+            "root_path": scope.get("root_path", ""),
+            "method": "GET",
+            "path": unquote(path),
+            "raw_path": path.encode(),
+            "query_string": query_string.encode(),
+            "headers": headers,
+            "state": {},
+        }
+
+    async def dispatch(self, request: Request[Any, Any, Any], batch_request: BatchRequest) -> BatchResponse:
+        """Dispatches a single request of a batch through the application."""
+        status, headers, body, received, streamed = 500, {}, bytearray(), False, False
+
+        async def receive() -> Message:
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await sleep_forever()
+            return {"type": "http.disconnect"}
+
+        with CancelScope() as cancel_scope:
+
+            async def send(message: Message) -> None:
+                nonlocal status, headers, streamed
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in message["headers"]}
+                    if "content-length" not in headers and status not in _EMPTY_STATUS_CODES:
+                        streamed = True
+                        cancel_scope.cancel()
+                elif message["type"] == "http.response.body":
+                    body.extend(message.get("body", b""))
+
+            await request.app(self._scope(request.scope, batch_request), receive, send)  # type: ignore
+
+        if streamed:
+            return BatchResponse(HTTP_400_BAD_REQUEST, {}, "Streamed responses can't be batched.")
+        headers.pop("content-length", None)
+        if not body:
+            return BatchResponse(status, headers, None)
+        if headers.get("content-type", "").partition(";")[0] == negotiate(request):
+            return BatchResponse(status, headers, msgspec.Raw(bytes(body)))
+        return BatchResponse(status, headers, body.decode(errors="replace"))
+
+    @property
+    def router(self) -> Router:
+        """Gets a router running batches of requests."""
+
+        @post("/", status_code=HTTP_200_OK, summary="Runs GET requests in a single round trip")
+        async def batch_handler(request: Request[Any, Any, Any], data: list[BatchRequest]) -> list[BatchResponse]:
+            """Runs the `GET` requests of a batch concurrently and returns their responses in order.
+
+            Requests share the headers of the batch, only other headers (e.g. `If-None-Match`) can be set per request.
+            """
+            if len(data) > self.max_requests:
+                raise ValidationException(f"Batches are limited to {self.max_requests} requests.")
+            if invalid := [item.path for item in data if not item.path.startswith("/")]:
+                raise ValidationException(f"Paths must be absolute: {', '.join(invalid)}")
+
+            responses: list[BatchResponse | None] = [None] * len(data)
+
+            async def run(index: int, item: BatchRequest) -> None:
+                responses[index] = await self.dispatch(request, item)
+
+            async with session() as session_:
+                token = _context.set(_Context(session_))
+                try:
+                    async with create_task_group() as task_group:
+                        for index, item in enumerate(data):
+                            task_group.start_soon(run, index, item)
+                finally:
+                    _context.reset(token)
+            return [response for response in responses if response]
+
+        return Router(self.path, route_handlers=[batch_handler], guards=self.guards, tags=["Batch"])
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Registers the batch route."""
+        app_config.route_handlers.append(self.router)
+        return app_config
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from os import environ
+from typing import Iterable
+
+from anyio import Lock
+from litestar.config.response_cache import ResponseCacheConfig, default_cache_key_builder, default_do_cache_predicate
+from litestar.stores.base import StorageObject, Store
+from litestar.types import CacheKeyBuilder, HTTPScope
+
+from .metrics import MetricFamily
+
+
+def _cache_response_filter(scope: HTTPScope, status_code: int) -> bool:
+    """Only caches responses of handlers opting in, `litestar` applies its cache to all methods of a path."""
+    return bool(scope["route_handler"].cache) and default_do_cache_predicate(scope, status_code)
+
+
+class LRUStore(Store):
+    """In memory store bounded by the total size of its values, evicting the least recently used values first."""
+
+    __slots__ = ("max_size", "hits", "misses", "_store", "_size", "_lock")
+
+    def __init__(self, max_size: int = 64 * 2**20) -> None:
+        """Initializes an empty store.
+
+        :param max_size: The maximum number of bytes held by this store.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._store: OrderedDict[str, StorageObject] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def _pop(self, key: str) -> StorageObject | None:
+        if storage_obj := self._store.pop(key, None):
+            self._size -= len(storage_obj.data)
+        return storage_obj
+
+    async def set(self, key: str, value: str | bytes, expires_in: int | timedelta | None = None) -> None:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        if len(value) > self.max_size:
+            return
+
+        async with self._lock:
+            self._pop(key)
+            self._store[key] = StorageObject.new(data=value, expires_in=expires_in)
+            self._size += len(value)
+            while self._size > self.max_size:
+                self._pop(next(iter(self._store)))
+
+    async def get(self, key: str, renew_for: int | timedelta | None = None) -> bytes | None:
+        async with self._lock:
+            if not (storage_obj := self._store.get(key)):
+                self.misses += 1
+                return None
+
+            if storage_obj.expired:
+                self._pop(key)
+                self.misses += 1
+                return None
+
+            if renew_for and storage_obj.expires_at:
+                storage_obj = self._store[key] = StorageObject.new(data=storage_obj.data, expires_in=renew_for)
+
+            self._store.move_to_end(key)
+            self.hits += 1
+            return storage_obj.data
+
+    async def delete(self, key: str) -> None:
+        async with self._lock:
+            self._pop(key)
+
+    async def delete_all(self) -> None:
+        async with self._lock:
+            self._store.clear()
+            self._size = 0
+
+    async def exists(self, key: str) -> bool:
+        storage_obj = self._store.get(key)
+        return storage_obj is not None and not storage_obj.expired
+
+    async def expires_in(self, key: str) -> int | None:
+        if storage_obj := self._store.get(key):
+            return storage_obj.expires_in
+        return None
+
+
+@dataclass(frozen=True)
+class ResponseCache:
+    """Wraps `litestar's` response cache, route handlers opt in using `cache=True`.
+
+    Entries are not invalidated explicitly, instead the `key_builder` is expected to include
+    a version of the cached data so that writes make stale entries unreachable.
+    Unreachable entries are dropped by the store's eviction or expiry.
+    """
+
+    store: Store = field(default_factory=LRUStore)
+    key_builder: CacheKeyBuilder = default_cache_key_builder
+    expiration: int = 300
+    store_name: str = "response_cache"
+
+    @property
+    def config(self) -> ResponseCacheConfig:
+        """Gets the configuration passed to the application."""
+        return ResponseCacheConfig(self.expiration, self.key_builder, self.store_name, _cache_response_filter)
+
+    @property
+    def stores(self) -> dict[str, Store]:
+        """Gets the stores to register with the application."""
+        return {self.store_name: self.store}
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Gets the lookups of this cache, only `LRUStore` counts them."""
+        if isinstance(self.store, LRUStore):
+            lookups = [({"result": "hit"}, self.store.hits), ({"result": "miss"}, self.store.misses)]
+            yield MetricFamily("response_cache_lookups_total", "counter", "Response cache lookups.", lookups)
+            yield MetricFamily("response_cache_bytes", "gauge", "Cached bytes.", [({}, self.store._size)])
+
+    @classmethod
+    def from_env(cls, key_builder: CacheKeyBuilder = default_cache_key_builder) -> ResponseCache:
+        """Creates a `ResponseCache` from the environment.
+
+        `RESPONSE_CACHE_REDIS_URL` selects a redis store shared by all workers (requires `redis`), entries expire
+        natively and redis should be run with a `maxmemory` limit and an LRU eviction policy to bound it.
+        Otherwise an `LRUStore` of `RESPONSE_CACHE_SIZE` bytes is used per worker.
+        """
+        size = environ.get("RESPONSE_CACHE_SIZE")
+        expiration = environ.get("RESPONSE_CACHE_EXPIRATION")
+        expiration_ = int(expiration) if expiration else 300
+        if url := environ.get("RESPONSE_CACHE_REDIS_URL"):
+            from litestar.stores.redis import RedisStore
+
+            return cls(RedisStore.with_client(url), key_builder, expiration_)  # pyright: ignore
+        return cls(LRUStore(int(size) if size else 64 * 2**20), key_builder, expiration_)
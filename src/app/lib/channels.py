@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from os import environ
+from typing import Any
+
+from litestar.channels import ChannelsBackend, ChannelsPlugin
+from litestar.channels.backends.memory import MemoryChannelsBackend
+from litestar.config.app import AppConfig
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+_EVENTS_KEY = "channel_events"
+
+
+def publish_on_commit(session: AsyncSession, channel: str, data: Any) -> None:
+    """Queues `data` to be published on `channel` once the current transaction of `session` commits.
+
+    Events of rolled back transactions are discarded.
+    """
+    session.info.setdefault(_EVENTS_KEY, []).append((channel, data))
+
+
+@dataclass(frozen=True)
+class Channels:
+    """Wraps `litestar's` channels plugin and publishes events queued by `publish_on_commit`.
+
+    Notes:
+        * events are best effort, they are dropped while the plugin is not running and for subscribers
+          lagging more than `max_backlog` events behind
+    """
+
+    backend: ChannelsBackend = field(default_factory=MemoryChannelsBackend)
+    max_backlog: int = 1000
+    plugin: ChannelsPlugin = field(init=False)
+
+    def __post_init__(self) -> None:
+        plugin = ChannelsPlugin(
+            backend=self.backend,
+            arbitrary_channels_allowed=True,
+            subscriber_max_backlog=self.max_backlog,
+            subscriber_backlog_strategy="dropleft",
+        )
+        object.__setattr__(self, "plugin", plugin)
+
+    def _publish(self, session: Session) -> None:
+        for channel, data in session.info.pop(_EVENTS_KEY, []):
+            try:
+                self.plugin.publish(data, channel)
+            except RuntimeError:
+                return
+
+    def _discard(self, session: Session, *_: Any) -> None:
+        session.info.pop(_EVENTS_KEY, None)
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Hooks publishing into the session lifecycle."""
+        if not event.contains(Session, "after_commit", self._publish):
+            event.listen(Session, "after_commit", self._publish)
+            event.listen(Session, "after_rollback", self._discard)
+        return app_config
+
+    @classmethod
+    def from_env(cls) -> Channels:
+        """Creates `Channels` from the environment.
+
+        `CHANNELS_REDIS_URL` selects a redis broker shared by all workers (requires `redis`),
+        otherwise events are only delivered within a single process.
+        """
+        if url := environ.get("CHANNELS_REDIS_URL"):
+            from litestar.channels.backends.redis import RedisChannelsPubSubBackend
+            from redis.asyncio import Redis
+
+            return cls(RedisChannelsPubSubBackend(redis=Redis.from_url(url)))  # pyright: ignore
+        return cls()
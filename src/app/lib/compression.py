@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib.util import find_spec
+from os import environ
+from typing import Any, Literal
+
+from litestar import Request
+from litestar.config.compression import CompressionConfig
+from litestar.enums import CompressionEncoding
+from litestar.types import CacheKeyBuilder
+
+
+@dataclass(frozen=True)
+class Compression:
+    """Wraps `litestar's` compression middleware, route handlers opt out using `skip_compression=True`.
+
+    Responses are compressed using `backend` if the client accepts it and gzip otherwise, bodies smaller
+    than `minimum_size` bytes are sent as is. Streamed responses are compressed regardless of their size,
+    every chunk is flushed so clients can decode NDJSON lines or server-sent events as they arrive.
+
+    Notes:
+        * the response cache wraps the compression middleware, responses are cached compressed and served
+          without compressing them again, see `cache_key`
+        * routes reflecting user input next to secrets in the same body should opt out (BREACH)
+    """
+
+    backend: Literal["gzip", "brotli"] = "gzip"
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 5
+    opt_key: str = "skip_compression"
+
+    @property
+    def config(self) -> CompressionConfig:
+        """Gets the configuration passed to the application."""
+        return CompressionConfig(
+            self.backend,
+            minimum_size=self.minimum_size,
+            gzip_compress_level=self.gzip_level,
+            brotli_quality=self.brotli_quality,
+            exclude_opt_key=self.opt_key,
+        )
+
+    def encoding(self, request: Request[Any, Any, Any]) -> str:
+        """Gets the content coding the compression middleware selects for `request`, `identity` if none."""
+        if request.route_handler.opt.get(self.opt_key):
+            return "identity"
+        accepted = request.headers.get("Accept-Encoding", "")
+        preferred = CompressionEncoding.BROTLI if self.backend == "brotli" else CompressionEncoding.GZIP
+        for encoding in (preferred, CompressionEncoding.GZIP):
+            if encoding in accepted:  # matches like the middleware does
+                return encoding
+        return "identity"
+
+    def cache_key(self, key_builder: CacheKeyBuilder) -> CacheKeyBuilder:
+        """Extends `key_builder` by the content coding, `litestar` does not vary cached responses by it."""
+
+        def builder(request: Request[Any, Any, Any]) -> str:
+            return f"{key_builder(request)}~{self.encoding(request)}"
+
+        return builder
+
+    @classmethod
+    def from_env(cls) -> Compression:
+        """Creates a `Compression` from the environment.
+
+        `COMPRESSION_BACKEND` selects `brotli` (requires `brotli`, the default if installed) or `gzip`,
+        `COMPRESSION_MINIMUM_SIZE` sets the size in bytes below which responses are not compressed.
+        """
+        backend = environ.get("COMPRESSION_BACKEND") or ("brotli" if find_spec("brotli") else "gzip")
+        minimum_size = environ.get("COMPRESSION_MINIMUM_SIZE")
+        return cls(backend, int(minimum_size) if minimum_size else 1024)  # type: ignore
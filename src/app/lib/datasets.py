@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from domain.accounts.models import User
+from domain.comments.models import Comment
+from domain.consolidations.models import ConsolidatedQuestions, Consolidation
+from domain.groups.models import Group, GroupMembers
+from domain.projects.models import Project, ProjectEngineers, ProjectManagers
+from domain.questions.models import Question
+from domain.ratings.models import Rating
+from domain.terms.models import AnnotatedPassages, Passage, Term
+from domain.versions.models import Version
+from litestar.contrib.sqlalchemy.base import UUIDBase
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .orm import _engine
+from .services import MockDataService
+
+_words = (
+    "ontology competency question term concept relation property class instance domain range axiom "
+    "which what how many does is there every some only all given a the of for to in with by "
+    "person organisation event place time document dataset measurement sample method result"
+).split()
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Generates a deterministic synthetic dataset of `Project`s and their children and bulk loads it.
+
+    Rows are inserted using `executemany` on the tables directly, bypassing the ORM. All users share the
+    password of the mock data (`HalloWelt123`) and are named `{prefix}{n}@example.org`, projects are loaded
+    one transaction at a time. The same `seed` and parameters always yield the same rows and ids.
+
+    Notes:
+        * managers, engineers and members of a project are drawn from the generated users
+        * datasets can only be loaded into the same database once per `prefix` and `seed`,
+          otherwise unique constraints are violated
+    """
+
+    users: int = 1_000
+    projects: int = 10
+    managers_per_project: int = 2
+    engineers_per_project: int = 3
+    groups_per_project: int = 10
+    members_per_group: int = 10
+    questions_per_group: int = 50
+    versions_per_question: int = 2
+    ratings_per_question: int = 3
+    comments_per_question: int = 2
+    terms_per_project: int = 50
+    passages_per_question: int = 2
+    consolidations_per_project: int = 2
+    questions_per_consolidation: int = 10
+    seed: int = 0
+    prefix: str = "user"
+    chunk_size: int = 10_000
+
+    def _text(self, rng: random.Random, words: int) -> str:
+        return " ".join(rng.choices(_words, k=words)).capitalize() + "?"
+
+    async def _flush(self, connection: AsyncConnection, rows: dict[Table, list[dict[str, Any]]]) -> None:
+        for table in UUIDBase.metadata.sorted_tables:
+            values = rows.pop(table, [])
+            for start in range(0, len(values), self.chunk_size):
+                await connection.execute(insert(table), values[start : start + self.chunk_size])
+
+    async def load(self, engine: AsyncEngine = _engine) -> dict[str, int]:
+        """Generates and inserts the dataset using `engine`.
+
+        :return: The number of rows inserted per table.
+        """
+        rng = random.Random(self.seed)
+        clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        counts: dict[str, int] = defaultdict(int)
+
+        def uuid() -> UUID:
+            return UUID(int=rng.getrandbits(128), version=4)
+
+        def audited(**values: Any) -> dict[str, Any]:
+            nonlocal clock
+            clock += timedelta(milliseconds=1)  # distinct timestamps keep cursor pagination realistic
+            return {"id": uuid(), "created_at": clock, "updated_at": clock, **values}
+
+        def add(table: Table, row: dict[str, Any]) -> None:
+            rows[table].append(row)
+            counts[table.name] += 1
+
+        rows: dict[Table, list[dict[str, Any]]] = defaultdict(list)
+        users = [
+            audited(
+                email=f"{self.prefix}{n}@example.org",
+                name=f"{self.prefix.capitalize()} {n}",
+                password_hash=MockDataService.mock_password,
+                password_salt=MockDataService.mock_salt,
+                is_system_admin=False,
+                is_verified=True,
+            )
+            for n in range(self.users)
+        ]
+        user_ids = [user["id"] for user in users]
+        for user in users:
+            add(User.__table__, user)  # type: ignore
+        async with engine.begin() as connection:
+            await self._flush(connection, rows)
+
+        for p in range(self.projects):
+            project = audited(name=f"Project {p} of {self.prefix}", description=self._text(rng, 12))
+            add(Project.__table__, project)  # type: ignore
+            for user_id in rng.sample(user_ids, self.managers_per_project):
+                add(ProjectManagers, {"user_id": user_id, "project_id": project["id"]})
+            engineers = rng.sample(user_ids, self.engineers_per_project)
+            for user_id in engineers:
+                add(ProjectEngineers, {"user_id": user_id, "project_id": project["id"]})
+            question_ids: list[UUID] = []
+
+            terms = [audited(content=f"term {p}-{t}", project_id=project["id"]) for t in range(self.terms_per_project)]
+            for term in terms:
+                add(Term.__table__, term)  # type: ignore
+
+            for g in range(self.groups_per_project):
+                group = audited(name=f"Group {p}-{g}", project_id=project["id"])
+                add(Group.__table__, group)  # type: ignore
+                members = rng.sample(user_ids, self.members_per_group)
+                for user_id in members:
+                    add(GroupMembers, {"user_id": user_id, "group_id": group["id"]})
+
+                for q in range(self.questions_per_group):
+                    author_id = rng.choice(members)
+                    question = audited(
+                        question=self._text(rng, rng.randint(6, 20)),
+                        version_number=self.versions_per_question + 1,
+                        author_id=author_id,
+                        editor_id=rng.choice(members),
+                        group_id=group["id"],
+                    )
+                    add(Question.__table__, question)  # type: ignore
+                    question_ids.append(question["id"])
+                    for v in range(self.versions_per_question):
+                        version = audited(
+                            question_string=self._text(rng, rng.randint(6, 20)),
+                            version_number=v + 1,
+                            editor_id=rng.choice(members),
+                            question_id=question["id"],
+                        )
+                        add(Version.__table__, version)  # type: ignore
+                    for user_id in rng.sample(members, min(self.ratings_per_question, len(members))):
+                        rating = audited(rating=rng.randint(1, 5), question_id=question["id"], author_id=user_id)
+                        add(Rating.__table__, rating)  # type: ignore
+                    for _ in range(self.comments_per_question):
+                        comment = audited(
+                            comment=self._text(rng, rng.randint(4, 30)),
+                            question_id=question["id"],
+                            author_id=rng.choice(members),
+                        )
+                        add(Comment.__table__, comment)  # type: ignore
+                    for a in range(self.passages_per_question if terms else 0):
+                        passage = audited(content=f"passage {g}-{q}-{a}", term_id=rng.choice(terms)["id"])
+                        add(Passage.__table__, passage)  # type: ignore
+                        add(AnnotatedPassages, {"question_id": question["id"], "passage_id": passage["id"]})
+
+            for c in range(self.consolidations_per_project if engineers else 0):
+                name = f"Consolidation {p}-{c} of {self.prefix}"
+                consolidation = audited(name=name, engineer_id=rng.choice(engineers), project_id=project["id"])
+                add(Consolidation.__table__, consolidation)  # type: ignore
+                for question_id in rng.sample(question_ids, min(self.questions_per_consolidation, len(question_ids))):
+                    add(ConsolidatedQuestions, {"consolidation_id": consolidation["id"], "question_id": question_id})
+
+            async with engine.begin() as connection:
+                await self._flush(connection, rows)
+
+        return dict(counts)
+
+
+async def load_dataset(dataset: Dataset, engine: AsyncEngine = _engine) -> tuple[dict[str, int], float]:
+    """Creates missing tables and loads `dataset`.
+
+    :return: The number of rows inserted per table and the seconds taken.
+    """
+    start = time.perf_counter()
+    async with engine.begin() as connection:
+        await connection.run_sync(UUIDBase.metadata.create_all)
+    counts = await dataset.load(engine)
+    return counts, time.perf_counter() - start
@@ -1,8 +1,20 @@
-from typing import Annotated
+from dataclasses import dataclass, replace
+from typing import AbstractSet, Annotated, Any, Callable, ClassVar, Iterable, Mapping, NamedTuple, TypeVar
 
+import msgspec
+from litestar.contrib.sqlalchemy.dto import SQLAlchemyDTO
+from litestar.exceptions import HTTPException
+from litestar.status_codes import HTTP_400_BAD_REQUEST
+from litestar.types.serialization import LitestarEncodableType
 from pydantic import BaseModel as _BaseModel
 from pydantic import Field
 from pydantic.functional_validators import AfterValidator
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.base import ExecutableOption
+
+T = TypeVar("T")
+S = TypeVar("S", bound="ResponseModel")
 
 
 def _non_empty_string(s: str) -> str:
@@ -16,3 +28,103 @@ NonEmptyStringField = Field(description="A non empty string.")
 
 class BaseModel(_BaseModel):
     model_config = {"from_attributes": True}
+
+
+class ResponseModel(msgspec.Struct):
+    """Base of read-only response models.
+
+    Unlike `BaseModel`, which is meant for validating request bodies, instances are created without
+    validation and encoded by `msgspec` directly.
+    """
+
+    @classmethod
+    def from_attributes(cls: type[S], obj: Any) -> S:
+        """Creates an instance from the equally named attributes of `obj`, fields with defaults keep them."""
+        required = cls.__struct_fields__[: len(cls.__struct_fields__) - len(cls.__struct_defaults__)]
+        return cls(*(getattr(obj, name) for name in required))
+
+
+class Row(ResponseModel, rename="camel"):
+    """Base of read-only response models built from column projections, see `rows`.
+
+    Rows bypass the identity map and the transfer machinery of `SQLAlchemyDTO`,
+    they are meant for list endpoints serving many instances of a small, fixed shape.
+    """
+
+
+async def rows(session: AsyncSession, statement: Select[Any], row: Callable[..., T]) -> list[T]:
+    """Executes a column projected `statement` and maps each result row to `row`.
+
+    :param session: An active database session.
+    :param statement: A `select()` of columns, not of entities, in the order `row` expects them.
+    :param row: A `Row` type or a function building one from the selected columns.
+    :return: The mapped rows.
+    """
+    return [row(*values) for values in await session.execute(statement)]
+
+
+Expansion = NamedTuple("Expansion", [("include", AbstractSet[str]), ("options", Iterable[ExecutableOption])])
+
+
+@dataclass(frozen=True)
+class ExpansionRegistry:
+    """Whitelist of optional relationships a route may load on request.
+
+    Each `Expansion` pairs the dotted DTO field names it adds with the loader options required
+    to populate them, clients select expansions through a comma separated `?expand=` parameter.
+    """
+
+    expansions: Mapping[str, Expansion]
+
+    def parse(self, expand: str | None) -> frozenset[str]:
+        """Parses an `expand` query parameter.
+
+        :param expand: A comma separated list of expansion names.
+        :raises HTTPException: If an expansion is not registered.
+        :return: The requested expansion names.
+        """
+        if not expand:
+            return frozenset()
+
+        keys = frozenset(key for key in map(str.strip, expand.split(",")) if key)
+        if unknown := keys - self.expansions.keys():
+            detail = f"Unknown expansions: {', '.join(sorted(unknown))}. Allowed: {', '.join(sorted(self.expansions))}."
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=detail)
+        return keys
+
+    def options(self, expand: str | None) -> list[ExecutableOption]:
+        """Gets the loader options for all requested expansions."""
+        return [option for key in sorted(self.parse(expand)) for option in self.expansions[key].options]
+
+    def include(self, keys: Iterable[str]) -> frozenset[str]:
+        """Gets the DTO fields added by the given expansions."""
+        return frozenset(field for key in keys for field in self.expansions[key].include)
+
+
+class ExpandableDTO(SQLAlchemyDTO[T]):
+    """`SQLAlchemyDTO` whose field set grows with the `?expand=` query parameter.
+
+    The configured `include` set acts as the slim default payload. For every requested combination
+    of expansions a DTO variant is derived once per route handler and its backend is cached by litestar.
+
+    Notes:
+        * route handlers must load the matching `ExpansionRegistry.options`, otherwise
+          serialization will trigger lazy loads
+    """
+
+    expansions: ClassVar[ExpansionRegistry]
+
+    def data_to_encodable_type(self, data: Any) -> LitestarEncodableType:
+        keys = self.expansions.parse(self.asgi_connection.query_params.get("expand"))
+        if not keys:
+            return super().data_to_encodable_type(data)
+
+        handler_id = self.asgi_connection.route_handler.handler_id  # pyright: ignore
+        variant_id = f"{handler_id}?expand={','.join(sorted(keys))}"
+        if variant_id not in self._dto_backends:
+            config = replace(self.config, include={*self.config.include, *self.expansions.include(keys)})
+            variant = type(f"{type(self).__name__}Expanded", (type(self),), {"config": config})
+            field_definition = self._dto_backends[handler_id]["return_backend"].field_definition
+            variant.create_for_field_definition(field_definition, variant_id)
+
+        return self._dto_backends[variant_id]["return_backend"].encode_data(data)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Mapping
+
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+from sqlalchemy.sql.base import ExecutableOption
+
+Strategy = Callable[[InstrumentedAttribute[Any]], _AbstractLoad]
+
+
+def by_cardinality(relationship: InstrumentedAttribute[Any]) -> _AbstractLoad:
+    """Joins to-one relationships into the parent's statement, to-many relationships are loaded
+    using one additional `IN` query, which does not multiply the parent's rows.
+    """
+    return selectinload(relationship) if relationship.property.uselist else joinedload(relationship)
+
+
+@dataclass(frozen=True)
+class Edge:
+    """A relationship to load along with the relationships to load from its targets."""
+
+    relationship: InstrumentedAttribute[Any]
+    nested: tuple[Edge, ...] = ()
+
+    def option(self, strategy: Strategy = by_cardinality) -> _AbstractLoad:
+        """Gets the loader option of this edge and all nested edges."""
+        option = strategy(self.relationship)
+        return option.options(*(edge.option(strategy) for edge in self.nested)) if self.nested else option
+
+
+def edge(relationship: InstrumentedAttribute[Any], *nested: InstrumentedAttribute[Any] | Edge) -> Edge:
+    """Creates an `Edge`, nested relationships may be given without wrapping them."""
+    return Edge(relationship, tuple(item if isinstance(item, Edge) else Edge(item) for item in nested))
+
+
+def load(relationship: InstrumentedAttribute[Any], *nested: InstrumentedAttribute[Any] | Edge) -> _AbstractLoad:
+    """Gets the loader option of a relationship chosen by its cardinality (see `by_cardinality`).
+
+    :param relationship: The relationship to load.
+    :param nested: Relationships to load from its targets.
+    """
+    return edge(relationship, *nested).option()
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """A named set of relationships loaded along with instances of `model`."""
+
+    name: str
+    model: type[Any]
+    edges: tuple[Edge, ...]
+
+    def options(self, strategy: Strategy = by_cardinality) -> list[ExecutableOption]:
+        """Gets the loader options of all edges using `strategy`."""
+        return [edge.option(strategy) for edge in self.edges]
+
+
+class LoadProfiles(Mapping[str, LoadProfile]):
+    """Registry of `LoadProfile`s shared by controllers, services and DTOs.
+
+    Profiles describe what to load, the loader strategy of each relationship is derived from its
+    cardinality, so routes rendering the same shape share one definition.
+    """
+
+    def __init__(self) -> None:
+        self._profiles: dict[str, LoadProfile] = {}
+
+    def register(
+        self, name: str, model: type[Any], *edges: InstrumentedAttribute[Any] | Edge
+    ) -> list[ExecutableOption]:
+        """Registers a profile.
+
+        :param name: A unique name, e.g. `"question.overview"`.
+        :param model: The model the profile is loaded with.
+        :param edges: The relationships to load, nested relationships are given using `edge`.
+        :raises ValueError: If a profile with the same name is registered already.
+        :return: The loader options of the profile.
+        """
+        if name in self._profiles:
+            raise ValueError(f"Load profile {name} is registered already.")
+        profile = LoadProfile(name, model, tuple(item if isinstance(item, Edge) else Edge(item) for item in edges))
+        self._profiles[name] = profile
+        return profile.options()
+
+    def options(self, name: str) -> list[ExecutableOption]:
+        """Gets the loader options of a registered profile."""
+        return self._profiles[name].options()
+
+    def __getitem__(self, name: str) -> LoadProfile:
+        return self._profiles[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._profiles)
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+profiles = LoadProfiles()
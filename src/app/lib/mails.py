@@ -1,22 +1,91 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from email.mime.text import MIMEText
 from os import environ
-from typing import Iterable, NamedTuple
+from typing import AsyncIterator, Iterable, NamedTuple
 import asyncio
+import time
 import aiosmtplib
 from litestar.di import Provide
 
 MailParameters = NamedTuple("MailParameters", [("receiver", str), ("subject", str), ("body", str), ("html", bool)])
 
 
+class SMTPPool:
+    """Bounded pool of reusable SMTP connections.
+
+    At most `size` connections are open and used at once, further senders wait for a free connection.
+    Connections idle for longer than `health_check_interval` seconds are checked using `NOOP`
+    before reuse, broken connections and connections that failed to send are replaced.
+    """
+
+    def __init__(self, hostname: str, port: int, size: int = 4, health_check_interval: float = 30) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(hostname=self.hostname, port=self.port)
+        await client.connect()
+        return client
+
+    async def _is_healthy(self, client: aiosmtplib.SMTP, last_used: float) -> bool:
+        if not client.is_connected:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            await client.noop()
+            return True
+        except aiosmtplib.SMTPException:
+            return False
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Borrows a connection, preferring the most recently used idle one."""
+        async with self._semaphore:
+            client = None
+            while self._idle and not client:
+                candidate, last_used = self._idle.pop()
+                if await self._is_healthy(candidate, last_used):
+                    client = candidate
+                else:
+                    candidate.close()
+            client = client or await self._connect()
+
+            try:
+                yield client
+            except BaseException:
+                client.close()
+                raise
+            self._idle.append((client, time.monotonic()))
+
+    async def close(self) -> None:
+        """Closes all idle connections."""
+        while self._idle:
+            client, _ = self._idle.pop()
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
 @dataclass(frozen=True)
 class MailService:
     sender: str
     smtp_server: str
     port: int
     stdout: bool = False
+    pool_size: int = 4
+    pool: SMTPPool = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "pool", SMTPPool(self.smtp_server, self.port, self.pool_size))
 
     def _create_message(self, receivers: list[str] | str, subject: str, body: str, html: bool = False) -> MIMEText:
         """Builds a `MIMEText` message."""
@@ -31,11 +100,16 @@ class MailService:
         if self.stdout:
             print(message)
             return
-        await aiosmtplib.send(message, hostname=self.smtp_server, port=self.port)  # pyright: ignore[reportUnknownMemberType]
+        async with self.pool.connection() as client:
+            await client.send_message(message)
 
     async def send_emails(self, mails: Iterable[MailParameters]) -> None:
         await asyncio.gather(*[self.send_email([mail.receiver], mail.subject, mail.body, mail.html) for mail in mails])
 
+    async def on_shutdown(self) -> None:
+        """Closes pooled SMTP connections."""
+        await self.pool.close()
+
     @property
     def dependency(self) -> Provide:
         """Gets this middleware as dependency for litestar's dependency injection."""
@@ -47,4 +121,11 @@ class MailService:
         port = environ.get("SMPT_PORT")
         sender = environ.get("SMPT_SENDER")
         stdout = environ.get("USE_SMPT")
-        return cls(sender, smtp_server, int(port if port else "587"), False if stdout else True)  # pyright: ignore
+        pool_size = environ.get("SMPT_POOL_SIZE")
+        return cls(
+            sender,  # pyright: ignore
+            smtp_server,  # pyright: ignore
+            int(port if port else "587"),
+            False if stdout else True,
+            int(pool_size if pool_size else "4"),
+        )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Literal, NamedTuple
+
+from litestar import get, post
+from litestar.config.app import AppConfig
+from litestar.enums import ScopeType
+from litestar.exceptions import ClientException, NotFoundException
+from litestar.middleware.base import DefineMiddleware
+from litestar.router import Router
+from litestar.types import ASGIApp, Guard, Receive, Scope, Send
+
+from .utils import get_route_name
+
+Snapshot = NamedTuple("Snapshot", [("id", int), ("created_at", datetime), ("snapshot", tracemalloc.Snapshot)])
+RoutePeak = NamedTuple("RoutePeak", [("requests", int), ("peak", int), ("total", int)])
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+# allocations of tracemalloc itself and of imports are noise
+_filters = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _statistics(stats: list[Any], limit: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "trace": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size": stat.size,
+            "count": stat.count,
+            **({"sizeDiff": stat.size_diff, "countDiff": stat.count_diff} if hasattr(stat, "size_diff") else {}),
+        }
+        for stat in stats[:limit]
+    ]
+
+
+@dataclass
+class _State:
+    snapshots: list[Snapshot] = field(default_factory=list)
+    routes: dict[str, RoutePeak] = field(default_factory=dict)
+    next_id: int = 1
+
+
+@dataclass(frozen=True)
+class MemoryDiagnostics:
+    """Traces allocations using `tracemalloc` on demand, served at `path`.
+
+    While tracing, snapshots can be taken and compared grouped by line, file or traceback,
+    and the peak of traced memory is recorded per route. Nothing is recorded while tracing is stopped.
+
+    Notes:
+        * peaks are measured process wide, concurrent requests inflate each others' peaks
+        * tracing slows down allocations considerably and holds `keep` snapshots in memory,
+          it is meant for short diagnostic sessions
+    """
+
+    guards: list[Guard] = field(default_factory=list)
+    keep: int = 10
+    path: str = "/memory"
+    _state: _State = field(default_factory=_State, init=False, compare=False)
+
+    def middleware(self, app: ASGIApp) -> ASGIApp:
+        routes = self._state.routes
+
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP or not tracemalloc.is_tracing():
+                return await app(scope, receive, send)
+
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            try:
+                await app(scope, receive, send)
+            finally:
+                if tracemalloc.is_tracing():
+                    peak = tracemalloc.get_traced_memory()[1] - before
+                    route = get_route_name(scope)
+                    requests, max_peak, total = routes.get(route, RoutePeak(0, 0, 0))
+                    routes[route] = RoutePeak(requests + 1, max(max_peak, peak), total + peak)
+
+        return middleware
+
+    def start(self, frames: int = 1) -> None:
+        """Starts tracing, dropping snapshots and peaks of previous sessions."""
+        tracemalloc.stop()
+        self._state.snapshots.clear()
+        self._state.routes.clear()
+        tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stops tracing, snapshots and peaks are kept."""
+        tracemalloc.stop()
+
+    def take_snapshot(self) -> Snapshot:
+        """Takes a snapshot, dropping the oldest one once `keep` snapshots are stored."""
+        taken = tracemalloc.take_snapshot().filter_traces(_filters)
+        snapshot = Snapshot(self._state.next_id, datetime.now(timezone.utc), taken)
+        self._state.next_id += 1
+        self._state.snapshots = [*self._state.snapshots, snapshot][-self.keep :]
+        return snapshot
+
+    def get_snapshot(self, snapshot_id: int) -> Snapshot:
+        """Gets a stored snapshot.
+
+        :raises NotFoundException: If the snapshot was dropped or never taken.
+        """
+        snapshots = (snapshot for snapshot in self._state.snapshots if snapshot.id == snapshot_id)
+        if not (snapshot := next(snapshots, None)):
+            raise NotFoundException(f"Snapshot {snapshot_id} not found.")
+        return snapshot
+
+    @property
+    def router(self) -> Router:
+        """Gets a router controlling tracing and serving snapshots, their differences and peaks per route."""
+
+        def status() -> dict[str, Any]:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshots = [{"id": snapshot.id, "createdAt": snapshot.created_at} for snapshot in self._state.snapshots]
+            return {"tracing": tracemalloc.is_tracing(), "current": current, "peak": peak, "snapshots": snapshots}
+
+        @get("/", sync_to_thread=False, include_in_schema=False)
+        def status_handler() -> dict[str, Any]:
+            return status()
+
+        @post("/start", sync_to_thread=False, include_in_schema=False)
+        def start_handler(frames: int = 1) -> dict[str, Any]:
+            self.start(frames)
+            return status()
+
+        @post("/stop", sync_to_thread=False, include_in_schema=False)
+        def stop_handler() -> dict[str, Any]:
+            self.stop()
+            return status()
+
+        @post("/snapshots", sync_to_thread=True, include_in_schema=False)
+        def take_snapshot_handler(group_by: GroupBy = "lineno", limit: int = 25) -> dict[str, Any]:
+            if not tracemalloc.is_tracing():
+                raise ClientException("Tracing is not started.")
+            snapshot = self.take_snapshot()
+            return {"id": snapshot.id, "statistics": _statistics(snapshot.snapshot.statistics(group_by), limit)}
+
+        @get("/snapshots/{snapshot_id:int}", sync_to_thread=True, include_in_schema=False)
+        def snapshot_handler(snapshot_id: int, group_by: GroupBy = "lineno", limit: int = 25) -> dict[str, Any]:
+            snapshot = self.get_snapshot(snapshot_id)
+            return {"id": snapshot.id, "statistics": _statistics(snapshot.snapshot.statistics(group_by), limit)}
+
+        @get("/snapshots/{snapshot_id:int}/diff/{other_id:int}", sync_to_thread=True, include_in_schema=False)
+        def diff_handler(
+            snapshot_id: int, other_id: int, group_by: GroupBy = "lineno", limit: int = 25
+        ) -> dict[str, Any]:
+            snapshot, other = self.get_snapshot(snapshot_id), self.get_snapshot(other_id)
+            return {"statistics": _statistics(other.snapshot.compare_to(snapshot.snapshot, group_by), limit)}
+
+        @get("/routes", sync_to_thread=False, include_in_schema=False)
+        def routes_handler() -> list[dict[str, Any]]:
+            routes = sorted(self._state.routes.items(), key=lambda item: item[1].peak, reverse=True)
+            return [{"route": route, **peak._asdict()} for route, peak in routes]
+
+        route_handlers = [
+            status_handler,
+            start_handler,
+            stop_handler,
+            take_snapshot_handler,
+            snapshot_handler,
+            diff_handler,
+            routes_handler,
+        ]
+        return Router(self.path, route_handlers=route_handlers, guards=self.guards)
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Registers the diagnostics routes and wraps the application, outside all other middlewares."""
+        app_config.route_handlers.append(self.router)
+        app_config.middleware.insert(0, DefineMiddleware(self.middleware))
+        return app_config
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Literal, NamedTuple, Sequence
+
+from litestar import MediaType, get
+from litestar.config.app import AppConfig
+from litestar.enums import ScopeType
+from litestar.handlers import HTTPRouteHandler
+from litestar.middleware.base import DefineMiddleware
+from litestar.types import ASGIApp, Guard, Message, Receive, Scope, Send
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .orm import _engine
+from .utils import get_route_name
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """Counts observations in fixed buckets, rendered cumulatively like Prometheus histograms."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+MetricFamily = NamedTuple(
+    "MetricFamily",
+    [
+        ("name", str),
+        ("type", Literal["counter", "gauge", "histogram"]),
+        ("help", str),
+        ("samples", Sequence[tuple[dict[str, str], "float | Histogram"]]),
+    ],
+)
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render(families: Iterable[MetricFamily]) -> str:
+    """Renders metric families in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for labels, value in family.samples:
+            if not isinstance(value, Histogram):
+                lines.append(f"{family.name}{_labels(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip([*map(str, value.buckets), "+Inf"], value.counts):
+                cumulative += count
+                lines.append(f"{family.name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+            lines.append(f"{family.name}_sum{_labels(labels)} {value.sum}")
+            lines.append(f"{family.name}_count{_labels(labels)} {value.count}")
+    return "\n".join(lines) + "\n"
+
+
+@dataclass(frozen=True)
+class Metrics:
+    """Collects per route request counts, status codes and latencies and serves them at `path`.
+
+    Further metrics are gathered from `collectors` when scraped, only the request accounting runs per request.
+    The route is authenticated like any other, `guards` restrict it further.
+
+    Notes:
+        * the database pool's checkout wait is timed by wrapping the pool's `_do_get`,
+          `sqlalchemy` emits no event before a checkout blocks
+    """
+
+    collectors: list[Collector] = field(default_factory=list)
+    guards: list[Guard] = field(default_factory=list)
+    path: str = "/metrics"
+    engine: AsyncEngine = _engine
+    _requests: dict[tuple[str, str, int], int] = field(default_factory=dict, init=False)
+    _latencies: dict[tuple[str, str], Histogram] = field(default_factory=dict, init=False)
+    _pool_wait: Histogram = field(default_factory=Histogram, init=False)
+
+    def middleware(self, app: ASGIApp) -> ASGIApp:
+        requests, latencies = self._requests, self._latencies
+
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                return await app(scope, receive, send)
+
+            status = 500
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                await send(message)
+
+            start = time.perf_counter()
+            try:
+                await app(scope, receive, send_wrapper)
+            finally:
+                elapsed = time.perf_counter() - start
+                method, _, route = get_route_name(scope).partition(" ")
+                key = (method, route, status)
+                requests[key] = requests.get(key, 0) + 1
+                if not (histogram := latencies.get((method, route))):
+                    histogram = latencies[(method, route)] = Histogram()
+                histogram.observe(elapsed)
+
+        return middleware
+
+    def collect(self) -> Iterable[MetricFamily]:
+        requests = [
+            ({"method": method, "route": route, "status": str(status)}, count)
+            for (method, route, status), count in self._requests.items()
+        ]
+        latencies = [
+            ({"method": method, "route": route}, histogram) for (method, route), histogram in self._latencies.items()
+        ]
+        pool: Any = self.engine.sync_engine.pool
+        yield MetricFamily("http_requests_total", "counter", "Requests handled per route and status.", requests)
+        yield MetricFamily("http_request_duration_seconds", "histogram", "Request latency per route.", latencies)
+        yield MetricFamily("db_pool_wait_seconds", "histogram", "Pool checkout waits.", [({}, self._pool_wait)])
+        if hasattr(pool, "checkedout"):
+            yield MetricFamily("db_pool_checked_out", "gauge", "Connections checked out.", [({}, pool.checkedout())])
+
+    def scrape(self) -> str:
+        """Renders all metrics."""
+        return render([family for collector in [self.collect, *self.collectors] for family in collector()])
+
+    @property
+    def route_handler(self) -> HTTPRouteHandler:
+        """Gets the route handler serving the metrics."""
+
+        @get(self.path, guards=self.guards, media_type=MediaType.TEXT, include_in_schema=False, sync_to_thread=False)
+        def metrics_handler() -> str:
+            return self.scrape()
+
+        return metrics_handler
+
+    def _time_pool(self) -> None:
+        pool: Any = self.engine.sync_engine.pool
+        if getattr(pool, "_timed", False):
+            return
+        do_get, histogram = pool._do_get, self._pool_wait
+
+        def timed_do_get() -> Any:
+            start = time.perf_counter()
+            try:
+                return do_get()
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        pool._do_get, pool._timed = timed_do_get, True
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Registers the metrics route and wraps the application, outside all other middlewares."""
+        self._time_pool()
+        app_config.route_handlers.append(self.route_handler)
+        app_config.middleware.insert(0, DefineMiddleware(self.middleware))
+        return app_config
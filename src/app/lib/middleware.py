@@ -3,14 +3,12 @@ from typing import Any
 from uuid import UUID
 
 from domain.accounts.models import User
-from lib.orm import session
 from lib.utils import get_path_param
 from litestar.connection.base import ASGIConnection
 from litestar.datastructures import MutableScopeHeaders
 from litestar.enums import ScopeType
 from litestar.middleware.base import AbstractMiddleware
 from litestar.types import Message, Receive, Scope, Send
-from sqlalchemy.ext.asyncio import AsyncSession
 from litestar import Request
 from litestar import HttpMethod
 
@@ -38,8 +36,11 @@ class AbstractUserPermissionsMiddleware(AbstractMiddleware):
         ...
 
     @abstractmethod
-    async def set_headers(self, headers: MutableScopeHeaders, session: AsyncSession, id: UUID, user_id: UUID) -> None:
-        """Used to modify the responses headers based of the current `User` and the found parameter."""
+    async def set_headers(self, headers: MutableScopeHeaders, id: UUID, user_id: UUID) -> None:
+        """Used to modify the responses headers based of the current `User` and the found parameter.
+
+        Permissions should be looked up using `lib.batch.lookup`, so batched requests share them.
+        """
         ...
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
@@ -54,9 +55,7 @@ class AbstractUserPermissionsMiddleware(AbstractMiddleware):
 
             connection: ASGIConnection[Any, User, Any, Any] = ASGIConnection(scope)
             if parameter := get_path_param(UUID, self.param_name, connection):
-                headers = MutableScopeHeaders.from_message(message)
-                async with session() as session_:
-                    await self.set_headers(headers, session_, parameter, connection.user.id)
+                await self.set_headers(MutableScopeHeaders.from_message(message), parameter, connection.user.id)
 
             return await send(message)
 
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+from litestar import MediaType, Request, Response
+from litestar.connection.base import ASGIConnection
+from litestar.datastructures import Accept
+from litestar.serialization import default_serializer
+from litestar.types import Serializer
+
+T = TypeVar("T")
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+"""Media types clients use for MessagePack, `litestar` only knows `application/x-msgpack`."""
+
+
+def negotiate(connection: ASGIConnection[Any, Any, Any, Any]) -> str:
+    """Selects the media type of JSON responses by the `Accept` header, either JSON or one of `MSGPACK_MEDIA_TYPES`.
+
+    JSON is preferred if both are accepted equally, e.g. for `*/*` or a missing header.
+    """
+    if not (accept := connection.headers.get("Accept")):
+        return MediaType.JSON
+    return Accept(accept).best_match([MediaType.JSON, *MSGPACK_MEDIA_TYPES], MediaType.JSON) or MediaType.JSON
+
+
+class NegotiatedRequest(Request[Any, Any, Any]):
+    """Request accepting MessagePack bodies in place of JSON.
+
+    `litestar` selects the decoder of bodies from the route handler's signature, which always declares JSON.
+    MessagePack bodies are decoded by `litestar's` MessagePack decoder instead, DTOs choose their decoder by
+    `content_type` which is normalized to `application/x-msgpack`, other bodies are read through `json()`.
+    """
+
+    @property
+    def content_type(self) -> tuple[str, dict[str, str]]:
+        media_type, options = super().content_type
+        return (MediaType.MESSAGEPACK if media_type in MSGPACK_MEDIA_TYPES else media_type), options
+
+    async def json(self) -> Any:
+        if self.content_type[0] == MediaType.MESSAGEPACK:
+            return await self.msgpack()
+        return await super().json()
+
+
+class NegotiatedResponse(Response[T]):
+    """Response encoding JSON content as MessagePack if the client prefers it, see `negotiate`.
+
+    The content is rendered from the same encodable types as JSON, DTOs and `ResponseModel`s apply to both.
+
+    Notes:
+        * `Vary: Accept` is sent on all negotiated responses for shared caches
+        * `datetime`s are encoded using the MessagePack timestamp extension, `UUID`s as strings
+        * responses created by handlers or exception handlers directly are not negotiated
+    """
+
+    def to_asgi_response(self, app: Any, request: Request[Any, Any, Any], **kwargs: Any) -> Any:
+        media_type = self.media_type or kwargs.get("media_type") or MediaType.JSON
+        if media_type == MediaType.JSON:
+            self.media_type = negotiate(request)
+            self.headers["Vary"] = ", ".join(filter(None, [self.headers.get("Vary"), "Accept"]))
+        return super().to_asgi_response(app, request, **kwargs)
+
+    def render(self, content: Any, media_type: str, enc_hook: Serializer = default_serializer) -> bytes:
+        if media_type in MSGPACK_MEDIA_TYPES:
+            media_type = MediaType.MESSAGEPACK
+        return super().render(content, media_type, enc_hook)
@@ -17,7 +17,9 @@ from advanced_alchemy.extensions.litestar.plugins.init.plugin import (
 )
 from litestar.config.app import AppConfig
 from litestar.contrib.sqlalchemy.base import UUIDBase
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, lazyload, raiseload
 
 _engine = create_async_engine(
     environ.get("CONNECTION_STRING", ""),
@@ -92,3 +94,48 @@ async def session() -> AsyncIterator[AsyncSession]:
     """
     async with _async_session_factory() as session:
         yield session
+
+
+@dataclass(frozen=True)
+class StrictLoading:
+    """Makes relationships raise instead of lazy loading unless loaded explicitly, e.g. using `selectinload`.
+
+    Applies `raiseload("*")` to every `ORM` select including those loading relationships, so relationships
+    missing from a statement's options raise an `InvalidRequestError` on access instead of issuing
+    hidden queries or failing with `MissingGreenlet` during serialization.
+    Relationships in `allow` (e.g. `"Project.managers"`) may still be loaded lazily.
+
+    Notes:
+        * relationships available from the identity map are not affected, as no query is needed
+        * meant for development and tests, where missing eager loads surface as errors
+    """
+
+    enabled: bool = False
+    allow: list[str] = field(default_factory=list)
+
+    def _do_orm_execute(self, state: ORMExecuteState) -> None:
+        if not state.is_select or state.is_column_load or not state.all_mappers:
+            return
+        allowed = [
+            lazyload(relationship)
+            for mapper in set(state.all_mappers)
+            for relationship in mapper.relationships
+            if f"{mapper.class_.__name__}.{relationship.key}" in self.allow
+        ]
+        state.statement = state.statement.options(raiseload("*", sql_only=True), *allowed)
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Applies strict loading to all sessions if enabled."""
+        if self.enabled and not event.contains(Session, "do_orm_execute", self._do_orm_execute):
+            event.listen(Session, "do_orm_execute", self._do_orm_execute)
+        return app_config
+
+    @classmethod
+    def from_env(cls) -> "StrictLoading":
+        """Creates a `StrictLoading` from the environment.
+
+        `STRICT_LOADING` enables it, `STRICT_LOADING_ALLOW` lists the relationships allowed to load lazily
+        separated by commas.
+        """
+        allow = environ.get("STRICT_LOADING_ALLOW", "")
+        return cls(bool(environ.get("STRICT_LOADING")), [entry.strip() for entry in allow.split(",") if entry.strip()])
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from itertools import groupby
+from os import environ
+from typing import Iterable, NamedTuple, Sequence
+
+from advanced_alchemy.types import DateTimeUTC
+from litestar.contrib.sqlalchemy.base import UUIDBase
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Index,
+    Integer,
+    Row,
+    String,
+    Table,
+    Text,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .mails import MailParameters, MailService
+from .metrics import MetricFamily
+from .orm import session
+from .tracing import span
+
+# pending mails, rows are deleted once sent and flagged as `dead` once they ran out of attempts
+MailOutbox = Table(
+    "mail_outbox",
+    UUIDBase.metadata,
+    Column[int]("id", Integer, primary_key=True, autoincrement=True),
+    Column[str]("receiver", String(length=320), nullable=False),
+    Column[str]("subject", String(length=998), nullable=False),
+    Column[str]("body", Text, nullable=False),
+    Column[bool]("html", Boolean, nullable=False, default=False),
+    Column[bool]("digest", Boolean, nullable=False, default=False),
+    Column[datetime]("created_at", DateTimeUTC(timezone=True), nullable=False),
+    Column[datetime]("next_attempt_at", DateTimeUTC(timezone=True), nullable=False),
+    Column[int]("attempts", Integer, nullable=False, default=0),
+    Column[str | None]("last_error", Text, nullable=True),
+    Column[bool]("dead", Boolean, nullable=False, default=False),
+    Index("ix_mail_outbox_dead_next_attempt_at", "dead", "next_attempt_at"),
+)
+
+OutboxMetrics = NamedTuple(
+    "OutboxMetrics",
+    [
+        ("depth", int),
+        ("dead", int),
+        ("sent", int),
+        ("messages", int),
+        ("failed", int),
+        ("latency_p50", float | None),
+        ("latency_p95", float | None),
+    ],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def combine(mails: Sequence[Row]) -> MailParameters:
+    """Renders the mails queued for a single receiver as one mail, identical mails are only included once."""
+    unique = list({(mail.subject, mail.body): mail for mail in mails}.values())
+    if len(unique) == 1:
+        return MailParameters(unique[0].receiver, unique[0].subject, unique[0].body, unique[0].html)
+
+    subject = f"{len(unique)} updates from CQ-Manager"
+    separator = "<hr>" if unique[0].html else "\n\n---\n\n"
+    heading = "<h3>{}</h3>{}" if unique[0].html else "{}\n\n{}"
+    body = separator.join(heading.format(mail.subject, mail.body) for mail in unique)
+    return MailParameters(unique[0].receiver, subject, body, unique[0].html)
+
+
+@dataclass
+class _State:
+    task: asyncio.Task[None] | None = None
+    stop: asyncio.Event | None = None
+    depth: int = 0
+    dead: int = 0
+    sent: int = 0
+    messages: int = 0
+    failed: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+
+@dataclass(frozen=True)
+class Outbox:
+    """Durable mail queue drained by a background sender.
+
+    Mails are written using `Outbox.add` within the transaction of the change that caused them,
+    so they are neither lost on restarts nor sent for rolled back changes. The sender claims due mails
+    in batches, retries failures with exponential backoff and dead-letters mails after `max_attempts`.
+
+    Mails are held back for `window` seconds, all mails due for a receiver are then sent as one combined mail.
+    Digest mails are held back until the next `digest_at` (UTC) and are combined the same way.
+
+    Notes:
+        * claimed mails are leased for `lease` seconds, a crashed sender's mails are retried afterwards
+        * concurrent senders skip each others claims on databases supporting `SKIP LOCKED`
+    """
+
+    mail_service: MailService
+    batch_size: int = 50
+    poll_interval: float = 1
+    max_attempts: int = 5
+    backoff: float = 30
+    lease: float = 300
+    window: float = 10
+    digest_at: time = time(6)
+    _state: _State = field(default_factory=_State, init=False, compare=False)
+
+    @staticmethod
+    async def add(session: AsyncSession, mails: Iterable[MailParameters], digest: bool = False) -> None:
+        """Queues `mails` within the current transaction of `session`.
+
+        :param digest: Whether `mails` are of low priority and should be sent with the next daily digest.
+        """
+        now = _now()
+        values = [{**mail._asdict(), "digest": digest, "created_at": now, "next_attempt_at": now} for mail in mails]
+        if values:
+            with span("mail.queue", mails=len(values), digest=digest):
+                await session.execute(insert(MailOutbox), values)
+
+    def _last_digest(self, now: datetime) -> datetime:
+        digest = datetime.combine(now.date(), self.digest_at, timezone.utc)
+        return digest if digest <= now else digest - timedelta(days=1)
+
+    async def drain(self) -> int:
+        """Sends a single batch of due mails, combined per receiver.
+
+        :return: The number of combined mails attempted, at most `batch_size`.
+        """
+        now = _now()
+        due = and_(
+            MailOutbox.c.dead.is_(False),
+            or_(
+                and_(
+                    MailOutbox.c.digest.is_(False),
+                    MailOutbox.c.next_attempt_at <= now - timedelta(seconds=self.window),
+                ),
+                and_(MailOutbox.c.digest.is_(True), MailOutbox.c.next_attempt_at <= self._last_digest(now)),
+            ),
+        )
+        async with session() as session_:
+            receivers = select(MailOutbox.c.receiver).where(due).group_by(MailOutbox.c.receiver)
+            receivers = receivers.order_by(func.min(MailOutbox.c.id)).limit(self.batch_size)
+            statement = select(MailOutbox).where(due, MailOutbox.c.receiver.in_(receivers.scalar_subquery()))
+            statement = statement.order_by(MailOutbox.c.receiver, MailOutbox.c.html, MailOutbox.c.id)
+            mails = (await session_.execute(statement.with_for_update(skip_locked=True))).all()
+            if mails:
+                statement = update(MailOutbox).where(MailOutbox.c.id.in_([mail.id for mail in mails]))
+                await session_.execute(statement.values(next_attempt_at=now + timedelta(seconds=self.lease)))
+                await session_.commit()
+
+        groups = [[*group] for _, group in groupby(mails, key=lambda mail: (mail.receiver, mail.html))]
+        sends = []
+        for group in groups:
+            mail = combine(group)
+            sends.append(self.mail_service.send_email([mail.receiver], mail.subject, mail.body, mail.html))
+        results = await asyncio.gather(*sends, return_exceptions=True)
+
+        async with session() as session_:
+            now = _now()
+            delivered = [group for group, result in zip(groups, results) if not isinstance(result, BaseException)]
+            sent = [mail for group in delivered for mail in group]
+            if sent:
+                await session_.execute(delete(MailOutbox).where(MailOutbox.c.id.in_([mail.id for mail in sent])))
+
+            for group, result in zip(groups, results):
+                if not isinstance(result, BaseException):
+                    continue
+                for mail in group:
+                    attempts = mail.attempts + 1
+                    retry_at = now + timedelta(seconds=self.backoff * 2 ** (attempts - 1))
+                    statement = update(MailOutbox).where(MailOutbox.c.id == mail.id)
+                    statement = statement.values(
+                        attempts=attempts,
+                        next_attempt_at=retry_at,
+                        last_error=repr(result),
+                        dead=attempts >= self.max_attempts,
+                        digest=False,  # retries must not wait for the next digest
+                    )
+                    await session_.execute(statement)
+
+            statement = select(MailOutbox.c.dead, func.count()).group_by(MailOutbox.c.dead)
+            counts: dict[bool, int] = dict((await session_.execute(statement)).tuples().all())
+            await session_.commit()
+
+        self._state.depth, self._state.dead = counts.get(False, 0), counts.get(True, 0)
+        self._state.sent += len(sent)
+        self._state.messages += len(delivered)
+        self._state.failed += len(mails) - len(sent)
+        self._state.latencies.extend((now - mail.created_at).total_seconds() for mail in sent)
+        if mails:
+            logger.info("mail outbox batch sent", extra={"outbox": self.metrics._asdict(), "batch": len(mails)})
+        return len(groups)
+
+    async def _run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                if await self.drain() == self.batch_size:
+                    continue
+            except Exception:  # keep the sender alive, failed batches are retried once their lease expires
+                logger.exception("mail outbox batch failed")
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    @property
+    def metrics(self) -> OutboxMetrics:
+        """Gets the queue depth as of the last batch and send latencies of recently sent mails in seconds.
+
+        `sent` counts queued mails, `messages` the combined mails actually sent.
+        """
+        latencies = self._state.latencies
+        quantiles = statistics.quantiles(latencies, n=20) if len(latencies) > 1 else [*latencies] * 19 or None
+        return OutboxMetrics(
+            self._state.depth,
+            self._state.dead,
+            self._state.sent,
+            self._state.messages,
+            self._state.failed,
+            quantiles[9] if quantiles else None,
+            quantiles[18] if quantiles else None,
+        )
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Gets the metrics of this outbox, see `metrics`."""
+        metrics = self.metrics
+        yield MetricFamily("mail_outbox_depth", "gauge", "Mails queued as of the last batch.", [({}, metrics.depth)])
+        yield MetricFamily("mail_outbox_dead", "gauge", "Mails out of attempts.", [({}, metrics.dead)])
+        yield MetricFamily("mail_outbox_sent_total", "counter", "Queued mails sent.", [({}, metrics.sent)])
+        yield MetricFamily("mail_outbox_failed_total", "counter", "Failed mail attempts.", [({}, metrics.failed)])
+
+    async def on_startup(self) -> None:
+        """Starts the sender."""
+        self._state.stop = asyncio.Event()
+        self._state.task = asyncio.create_task(self._run(self._state.stop))
+
+    async def on_shutdown(self) -> None:
+        """Stops the sender once its current batch is done, unsent mails remain queued."""
+        if self._state.task and self._state.stop:
+            self._state.stop.set()
+            await self._state.task
+            self._state.task, self._state.stop = None, None
+
+    @classmethod
+    def from_env(cls, mail_service: MailService) -> Outbox:
+        """Creates an `Outbox` sending using `mail_service`.
+
+        `OUTBOX_BATCH_SIZE`, `OUTBOX_MAX_ATTEMPTS` and `OUTBOX_BACKOFF` (seconds) tune the sender,
+        `OUTBOX_WINDOW` (seconds) and `OUTBOX_DIGEST_AT` (`HH:MM` in UTC) the coalescing of mails.
+        """
+        batch_size = environ.get("OUTBOX_BATCH_SIZE")
+        max_attempts = environ.get("OUTBOX_MAX_ATTEMPTS")
+        backoff = environ.get("OUTBOX_BACKOFF")
+        window = environ.get("OUTBOX_WINDOW")
+        digest_at = environ.get("OUTBOX_DIGEST_AT")
+        return cls(
+            mail_service,
+            int(batch_size) if batch_size else 50,
+            max_attempts=int(max_attempts) if max_attempts else 5,
+            backoff=float(backoff) if backoff else 30,
+            window=float(window) if window else 10,
+            digest_at=time.fromisoformat(digest_at) if digest_at else time(6),
+        )
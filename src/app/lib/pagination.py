@@ -0,0 +1,131 @@
+import base64
+from collections import defaultdict
+from datetime import datetime
+from typing import Annotated, Any, Iterable, Sequence, TypeVar
+from uuid import UUID
+
+from litestar.exceptions import HTTPException
+from litestar.pagination import CursorPagination
+from litestar.params import Parameter
+from litestar.status_codes import HTTP_400_BAD_REQUEST
+from sqlalchemy import Select, and_, func, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar("T")
+
+WINDOW_SIZE = 25
+MAX_WINDOW_SIZE = 100
+
+WindowSize = Annotated[int, Parameter(ge=1, le=MAX_WINDOW_SIZE, description="Maximum number of items per page.")]
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Encodes the position of an item within a `(created_at, id)` ordered collection."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id.hex}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decodes a cursor created by `encode_cursor`.
+
+    :param cursor: An opaque cursor.
+    :raises HTTPException: If the cursor is malformed.
+    :return: The `created_at` timestamp and `id` of the last seen item.
+    """
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError as error:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor.") from error
+
+
+def after(model: Any, cursor: str | None) -> ColumnElement[bool]:
+    """Keyset condition selecting all items of `model` following the given `cursor`."""
+    if not cursor:
+        return true()
+    created_at, id = decode_cursor(cursor)
+    return or_(model.created_at > created_at, and_(model.created_at == created_at, model.id > id))
+
+
+async def paginate(
+    session: AsyncSession,
+    statement: Select[tuple[T]],
+    model: Any,
+    cursor: str | None = None,
+    size: int = WINDOW_SIZE,
+) -> CursorPagination[str | None, T]:
+    """Fetches a single page of `statement` ordered by `(created_at, id)`.
+
+    :param session: An active database session.
+    :param statement: A select statement for `model`.
+    :param model: The model to paginate, must provide `created_at` and `id` columns.
+    :param cursor: The cursor returned by the previous page, defaults to the first page.
+    :param size: The maximum number of items on this page.
+    :return: The page and a cursor to the next one, `None` if this is the last page.
+    """
+    statement = statement.where(after(model, cursor)).order_by(model.created_at, model.id).limit(size + 1)
+    items = (await session.scalars(statement)).all()
+    next_cursor = encode_cursor(items[size - 1].created_at, items[size - 1].id) if len(items) > size else None
+    return CursorPagination(items=list(items[:size]), results_per_page=size, cursor=next_cursor)
+
+
+async def load_windows(
+    session: AsyncSession,
+    parents: Sequence[Any],
+    relationship: InstrumentedAttribute[Any],
+    size: int = WINDOW_SIZE,
+    options: Iterable[ExecutableOption] | None = None,
+) -> None:
+    """Loads the first `size` items of a to-many `relationship` for all `parents` at once.
+
+    Instead of loading whole collections the relationship is populated with a window ordered by
+    `(created_at, id)`, the total size of each collection is stored in `<relationship>_total`
+    (see `sqlalchemy.orm.query_expression`). Costs two queries regardless of the number of parents.
+
+    Notes:
+        * with a `size` of zero only the totals are loaded, the relationship is left untouched
+
+    :param session: An active database session.
+    :param parents: Instances owning the `relationship`.
+    :param relationship: A one-to-many or many-to-many relationship.
+    :param size: The number of items to load per parent.
+    :param options: Loading options applied to the windowed items.
+    """
+    if not parents:
+        return
+
+    options = [] if not options else options
+    prop = relationship.property
+    model = prop.mapper.class_
+    ((_, partition),) = prop.synchronize_pairs
+    ids = [parent.id for parent in parents]
+
+    statement = select(partition, func.count()).where(partition.in_(ids)).group_by(partition)
+    totals: dict[UUID, int] = dict((await session.execute(statement)).tuples().all())
+
+    if size > 0:
+        rank = func.row_number().over(partition_by=partition, order_by=(model.created_at, model.id))
+        ranked = select(partition.label("parent_id"), model.id.label("child_id"), rank.label("rank"))
+        if prop.secondary is not None:
+            ranked = ranked.select_from(prop.secondary).join(model, prop.secondaryjoin)  # pyright: ignore
+        ranked = ranked.where(partition.in_(ids)).subquery()
+
+        statement = (
+            select(ranked.c.parent_id, model)
+            .join(ranked, ranked.c.child_id == model.id)
+            .where(ranked.c.rank <= size)
+            .order_by(ranked.c.parent_id, ranked.c.rank)
+            .options(*options)
+        )
+        windows: defaultdict[UUID, list[Any]] = defaultdict(list)
+        for parent_id, item in (await session.execute(statement)).tuples():
+            windows[parent_id].append(item)
+
+        for parent in parents:
+            set_committed_value(parent, prop.key, windows[parent.id])
+
+    for parent in parents:
+        set_committed_value(parent, f"{prop.key}_total", totals.get(parent.id, 0))
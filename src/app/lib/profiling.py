@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import cProfile
+import marshal
+import secrets
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, NamedTuple
+
+from litestar import Response, get
+from litestar.config.app import AppConfig
+from litestar.connection import ASGIConnection
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.exceptions import HTTPException, NotFoundException
+from litestar.middleware.base import DefineMiddleware
+from litestar.router import Router
+from litestar.types import ASGIApp, Guard, Message, Receive, Scope, Send
+
+from .utils import get_route_name
+
+Profile = NamedTuple("Profile", [("id", str), ("route", str), ("created_at", datetime), ("stats", bytes)])
+
+
+@dataclass
+class _State:
+    active: bool = False
+    profiles: OrderedDict[str, Profile] = field(default_factory=OrderedDict)
+
+
+@dataclass(frozen=True)
+class Profiler:
+    """Profiles single requests on demand using `cProfile`.
+
+    Requests sending `header` and passing all `guards` are profiled, their response carries an `X-Profile-Id` header.
+    The latest `keep` profiles are served in `pstats` format at `path`, e.g. for `snakeviz` or `python -m pstats`.
+    All other requests pass through after a single scan of their headers.
+
+    Notes:
+        * `cProfile` profiles the whole thread, concurrent requests show up in the profile as well
+        * only one request is profiled at a time, further requests pass through unprofiled
+        * must be placed after the authentication middleware, guards require the `User`
+    """
+
+    guards: list[Guard] = field(default_factory=list)
+    header: str = "X-Profile"
+    keep: int = 20
+    path: str = "/profiles"
+    _state: _State = field(default_factory=_State, init=False, compare=False)
+
+    async def _allowed(self, scope: Scope) -> bool:
+        connection: ASGIConnection[Any, Any, Any, Any] = ASGIConnection(scope)
+        try:
+            for guard in self.guards:
+                await guard(connection, scope["route_handler"])  # type: ignore
+        except HTTPException:
+            return False
+        return True
+
+    def middleware(self, app: ASGIApp) -> ASGIApp:
+        header = self.header.lower().encode()
+
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP or all(name != header for name, _ in scope["headers"]):
+                return await app(scope, receive, send)
+            if self._state.active or not await self._allowed(scope):
+                return await app(scope, receive, send)
+
+            profile_id = secrets.token_hex(8)
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableScopeHeaders.from_message(message)["X-Profile-Id"] = profile_id
+                await send(message)
+
+            profiler = cProfile.Profile()
+            self._state.active = True
+            profiler.enable()
+            try:
+                await app(scope, receive, send_wrapper)
+            finally:
+                profiler.disable()
+                self._state.active = False
+                profiler.create_stats()
+                stats = marshal.dumps(profiler.stats)  # type: ignore
+                self.store(Profile(profile_id, get_route_name(scope), datetime.now(timezone.utc), stats))
+
+        return middleware
+
+    def store(self, profile: Profile) -> None:
+        """Keeps a `profile`, dropping the oldest profile once `keep` profiles are stored."""
+        self._state.profiles[profile.id] = profile
+        while len(self._state.profiles) > self.keep:
+            self._state.profiles.popitem(last=False)
+
+    @property
+    def router(self) -> Router:
+        """Gets a router listing the stored profiles and serving them as `pstats` files."""
+
+        @get("/", sync_to_thread=False, include_in_schema=False)
+        def profiles_handler() -> list[dict[str, Any]]:
+            return [
+                {"id": profile.id, "route": profile.route, "createdAt": profile.created_at}
+                for profile in reversed(self._state.profiles.values())
+            ]
+
+        @get("/{profile_id:str}", sync_to_thread=False, include_in_schema=False)
+        def profile_handler(profile_id: str) -> Response[bytes]:
+            if not (profile := self._state.profiles.get(profile_id)):
+                raise NotFoundException(f"Profile {profile_id} not found.")
+            headers = {"Content-Disposition": f'attachment; filename="{profile.id}.prof"'}
+            return Response(profile.stats, media_type="application/octet-stream", headers=headers)
+
+        return Router(self.path, route_handlers=[profiles_handler, profile_handler], guards=self.guards)
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Registers the profile routes and wraps route handlers, inside all previously registered middlewares."""
+        app_config.route_handlers.append(self.router)
+        app_config.middleware.append(DefineMiddleware(self.middleware))
+        return app_config
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from os import environ
+from typing import Any
+
+from litestar.config.app import AppConfig
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware.base import DefineMiddleware
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .orm import _engine
+from .utils import get_route_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Statements issued while handling a single request."""
+
+    count: int = 0
+    seconds: float = 0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def repeated(self) -> list[tuple[str, int]]:
+        """Gets statements issued more than once, the most frequent first."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count > 1]
+
+
+_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> QueryStats | None:
+    """Gets the statistics of the request currently handled, if it is being counted."""
+    return _stats.get()
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    if _stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    if (stats := _stats.get()) is not None:
+        stats.seconds += time.perf_counter() - conn.info["query_start"].pop()
+        stats.count += 1
+        stats.statements[statement] += 1
+
+
+def _handle_error(context: Any) -> None:
+    if _stats.get() is not None and context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+@dataclass(frozen=True)
+class QueryCounter:
+    """Counts SQL statements, their total time and repetitions per request.
+
+    Every request is logged with its query statistics at debug level. Requests exceeding their route's budget
+    or repeating a single statement at least `repeat_threshold` times, the usual sign of lazy loads
+    in a loop (N+1), are logged as warnings. Routes declare their budget using `opt={"query_budget": n}`.
+    In `debug` mode the statistics are sent as `X-Query-*` response headers as well.
+    """
+
+    engine: AsyncEngine = _engine
+    budget: int = 25
+    repeat_threshold: int = 5
+    debug: bool = False
+
+    def middleware(self, app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP:
+                return await app(scope, receive, send)
+
+            stats = QueryStats()
+            token = _stats.set(stats)
+
+            async def send_wrapper(message: Message) -> None:
+                if self.debug and message["type"] == "http.response.start":
+                    headers = MutableScopeHeaders.from_message(message)
+                    headers["X-Query-Count"] = str(stats.count)
+                    headers["X-Query-Time"] = f"{stats.seconds * 1000:.3f}"
+                    headers["X-Query-Repeated"] = str(sum(count - 1 for _, count in stats.repeated))
+                await send(message)
+
+            try:
+                await app(scope, receive, send_wrapper)
+            finally:
+                _stats.reset(token)
+                self.report(scope, stats)
+
+        return middleware
+
+    def report(self, scope: Scope, stats: QueryStats) -> None:
+        """Logs the statistics of a finished request."""
+        route = get_route_name(scope)
+        handler = scope.get("route_handler")
+        budget = handler.opt.get("query_budget", self.budget) if handler else self.budget
+        extra = {"route": route, "queries": stats.count, "query_ms": round(stats.seconds * 1000, 3)}
+        logger.debug("request queries", extra=extra)
+
+        if stats.count > budget:
+            logger.warning("query budget exceeded", extra={**extra, "budget": budget})
+        if stats.repeated and (repeated := stats.repeated[0])[1] >= self.repeat_threshold:
+            extra = {**extra, "statement": repeated[0], "times": repeated[1]}
+            logger.warning("repeated statement (N+1)", extra=extra)
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Hooks counting into the engine and wraps the application, outside all other middlewares."""
+        engine: Engine = self.engine.sync_engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+        app_config.middleware.insert(0, DefineMiddleware(self.middleware))
+        return app_config
+
+    @classmethod
+    def from_env(cls) -> QueryCounter:
+        """Creates a `QueryCounter` from the environment.
+
+        `QUERY_BUDGET` sets the default budget per request, `QUERY_REPEAT_THRESHOLD` the number of repetitions
+        of a statement reported as N+1 and `QUERY_DEBUG` enables response headers.
+        """
+        budget = environ.get("QUERY_BUDGET")
+        repeat_threshold = environ.get("QUERY_REPEAT_THRESHOLD")
+        return cls(
+            budget=int(budget) if budget else 25,
+            repeat_threshold=int(repeat_threshold) if repeat_threshold else 5,
+            debug=bool(environ.get("QUERY_DEBUG")),
+        )
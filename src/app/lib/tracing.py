@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import random
+import secrets
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from os import environ
+from typing import Any, Callable, Iterator
+
+from litestar import Litestar, get
+from litestar.config.app import AppConfig
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.exceptions import NotFoundException
+from litestar.handlers import HTTPRouteHandler
+from litestar.middleware.base import DefineMiddleware
+from litestar.router import Router
+from litestar.types import ASGIApp, Guard, Message, Receive, Scope, Send
+from litestar.utils import is_async_callable
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .orm import _engine
+from .utils import get_route_name
+
+@dataclass
+class Span:
+    """A timed stage of a request, `start` is a unix timestamp and `duration` given in seconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    duration: float = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+_span: ContextVar[Span | None] = ContextVar("span", default=None)
+_spans: ContextVar[list[Span]] = ContextVar("spans")
+
+
+def current_trace_id() -> str | None:
+    """Gets the id of the trace currently recorded, if the request is sampled."""
+    return span_.trace_id if (span_ := _span.get()) else None
+
+
+def _start(name: str, parent: Span, attributes: dict[str, Any]) -> Span:
+    child = Span(name, parent.trace_id, secrets.token_hex(8), parent.span_id, time.time(), attributes=attributes)
+    _spans.get().append(child)
+    return child
+
+
+def _finish(span_: Span) -> None:
+    span_.duration = time.time() - span_.start
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Records the enclosed block as child of the current span, does nothing if the request is not sampled."""
+    if (parent := _span.get()) is None:
+        yield None
+        return
+
+    child = _start(name, parent, attributes)
+    token = _span.set(child)
+    try:
+        yield child
+    finally:
+        _span.reset(token)
+        _finish(child)
+
+
+def traced(name: str, fn: Callable[..., Any], **attributes: Any) -> Callable[..., Any]:
+    """Wraps `fn` recording its calls as spans, see `span`."""
+    if is_async_callable(fn):
+
+        @wraps(fn)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name, **attributes):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(name, **attributes):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+    if (parent := _span.get()) is not None:
+        conn.info.setdefault("trace_spans", []).append(_start("db", parent, {"statement": statement}))
+
+
+def _after_cursor_execute(conn: Any, *_: Any) -> None:
+    if _span.get() is not None and (spans := conn.info.get("trace_spans")):
+        _finish(spans.pop())
+
+
+def _handle_error(context: Any) -> None:
+    if _span.get() is not None and context.connection is not None and context.connection.info.get("trace_spans"):
+        _finish(context.connection.info["trace_spans"].pop())
+
+
+@dataclass(frozen=True)
+class Tracer:
+    """Records spans of sampled requests and keeps the latest `buffer_size` traces in memory.
+
+    Each sampled request gets a root span and child spans for authentication, guards, the handler,
+    serialization and every SQL statement. Code can add spans using `span`. The trace id is stored
+    in the connection's state as `trace_id` and returned in the `X-Trace-Id` header.
+    Traces are served at `path` and appended to `file` as json lines if given.
+
+    Notes:
+        * mails are sent by the outbox after the request, traces only cover queueing them
+    """
+
+    sample_rate: float = 0
+    buffer_size: int = 100
+    file: str | None = None
+    guards: list[Guard] = field(default_factory=list)
+    path: str = "/traces"
+    engine: AsyncEngine = _engine
+    _traces: deque[list[Span]] = field(init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_traces", deque(maxlen=self.buffer_size))
+
+    def middleware(self, app: ASGIApp) -> ASGIApp:
+        async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+            if scope["type"] != ScopeType.HTTP or random.random() >= self.sample_rate:
+                return await app(scope, receive, send)
+
+            root = Span(scope["path"], secrets.token_hex(16), secrets.token_hex(8), None, time.time())
+            spans = [root]
+            span_token, spans_token = _span.set(root), _spans.set(spans)
+            scope.setdefault("state", {})["trace_id"] = root.trace_id
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableScopeHeaders.from_message(message)["X-Trace-Id"] = root.trace_id
+                    root.attributes["status"] = message["status"]
+                await send(message)
+
+            try:
+                await app(scope, receive, send_wrapper)
+            finally:
+                _span.reset(span_token)
+                _spans.reset(spans_token)
+                _finish(root)
+                root.name = get_route_name(scope)
+                self.export(spans)
+
+        return middleware
+
+    def export(self, spans: list[Span]) -> None:
+        """Stores a finished trace."""
+        self._traces.append(spans)
+        if self.file:
+            with open(self.file, "a") as file:
+                file.write(json.dumps([asdict(span_) for span_ in spans]) + "\n")
+
+    def get_trace(self, trace_id: str) -> list[Span] | None:
+        """Gets a trace kept in memory by its id."""
+        return next((spans for spans in self._traces if spans[0].trace_id == trace_id), None)
+
+    @property
+    def router(self) -> Router:
+        """Gets a router serving the traces kept in memory, the latest first."""
+
+        @get("/", sync_to_thread=False, include_in_schema=False)
+        def traces_handler(limit: int = 20) -> list[list[Span]]:
+            return [*reversed(self._traces)][:limit]
+
+        @get("/{trace_id:str}", sync_to_thread=False, include_in_schema=False)
+        def trace_handler(trace_id: str) -> list[Span]:
+            if not (spans := self.get_trace(trace_id)):
+                raise NotFoundException(f"Trace {trace_id} not found.")
+            return spans
+
+        return Router(self.path, route_handlers=[traces_handler, trace_handler], guards=self.guards)
+
+    def instrument(self, app: Litestar) -> None:
+        """Wraps the guards, functions and response conversion of all http route handlers in spans."""
+        for route in app.routes:
+            for handler in getattr(route, "route_handlers", []):
+                # automatic `OPTIONS` handlers are plain `HTTPRouteHandler`s without `__dict__`, they are not traced
+                if not isinstance(handler, HTTPRouteHandler) or not hasattr(handler, "__dict__"):
+                    continue
+                if getattr(handler, "_traced", False):
+                    continue
+                guards = [getattr(guard, "__name__", repr(guard)) for guard in handler.resolve_guards()]
+                handler.authorize_connection = traced("guards", handler.authorize_connection, guards=guards)
+                handler._fn = traced("handler", handler._fn, handler=handler.handler_name)
+                handler.to_response = traced("serialize", handler.to_response)
+                handler._traced = True  # type: ignore
+
+    def on_app_init(self, app_config: AppConfig) -> AppConfig:
+        """Registers the trace routes, hooks into the engine and wraps the application outside all middlewares."""
+        engine: Engine = self.engine.sync_engine
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+        app_config.route_handlers.append(self.router)
+        app_config.middleware.insert(0, DefineMiddleware(self.middleware))
+        app_config.on_startup.append(self.instrument)
+        return app_config
+
+    @classmethod
+    def from_env(cls, guards: list[Guard] | None = None) -> Tracer:
+        """Creates a `Tracer` from the environment.
+
+        `TRACE_SAMPLE_RATE` sets the share of requests traced (0 to 1, defaults to none),
+        `TRACE_BUFFER_SIZE` the number of traces kept in memory and `TRACE_FILE` a file traces are appended to.
+        """
+        sample_rate = environ.get("TRACE_SAMPLE_RATE")
+        buffer_size = environ.get("TRACE_BUFFER_SIZE")
+        return cls(
+            float(sample_rate) if sample_rate else 0,
+            int(buffer_size) if buffer_size else 100,
+            environ.get("TRACE_FILE") or None,
+            guards or [],
+        )
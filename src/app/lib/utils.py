@@ -1,6 +1,7 @@
 from typing import Any, Type, TypeVar
 
 from litestar.connection.base import ASGIConnection
+from litestar.types import Scope
 
 T = TypeVar("T")
 
@@ -8,3 +9,20 @@ T = TypeVar("T")
 def get_path_param(_: Type[T], param: str, connection: ASGIConnection[Any, Any, Any, Any]) -> T | None:
     """Walruses can't write type hints and functions lack support for generics (just pre 3.12 things)."""
     return connection.path_params.get(param, None)
+
+
+_route_paths: dict[int, str] = {}
+
+
+def get_route_name(scope: Scope) -> str:
+    """Gets a stable name for the route of a request, its method and path template e.g. `GET /projects/{id:uuid}`.
+
+    Falls back to the raw path for requests that did not match any route.
+    """
+    if not (handler := scope.get("route_handler")):
+        return scope["path"]
+    if id(handler) not in _route_paths:
+        for route in scope["app"].routes:
+            for route_handler in getattr(route, "route_handlers", []):
+                _route_paths[id(route_handler)] = route.path
+    return f"{scope.get('method', 'WS')} {_route_paths.get(id(handler), scope['path'])}"
@@ -0,0 +1,4 @@
+import os
+
+# implicit lazy loads raise during tests, see `lib.orm.StrictLoading`
+os.environ.setdefault("STRICT_LOADING", "1")
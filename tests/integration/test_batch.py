@@ -0,0 +1,39 @@
+from httpx import Headers
+from litestar import Litestar
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from litestar.testing import TestClient
+
+from ._fixtures import admin_header, test_client  # pyright: ignore
+
+project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+
+
+def test_batch(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    headers = {"Authorization": admin_header["Authorization"]}
+    paths = [f"/projects/{project_id}", f"/groups/{project_id}", f"/consolidations/{project_id}", "/not/found"]
+    with test_client as client:
+        response = client.post("/batch", json=[{"path": path} for path in paths], headers=headers)
+        assert response.status_code == HTTP_200_OK
+        responses = response.json()
+        assert [response["status"] for response in responses] == [HTTP_200_OK] * 3 + [HTTP_404_NOT_FOUND]
+        assert responses[0]["headers"]["permissions-project-engineer"] == "True"
+        for path, response in zip(paths[:3], responses):
+            assert client.get(path, headers=headers).json() == response["body"]
+
+        etag = responses[0]["headers"]["etag"]
+        batch = [{"path": paths[0], "headers": {"If-None-Match": etag}}, {"path": paths[1]}]
+        response = client.post("/batch", json=batch, headers=headers)
+        assert [response["status"] for response in response.json()] == [HTTP_304_NOT_MODIFIED, HTTP_200_OK]
+
+
+def test_batch_rejected(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    headers = {"Authorization": admin_header["Authorization"]}
+    with test_client as client:
+        response = client.post("/batch", json=[{"path": f"/projects/{project_id}/events"}], headers=headers)
+        assert response.json()[0]["status"] == HTTP_400_BAD_REQUEST
+
+        response = client.post("/batch", json=[{"path": "/projects"}] * 21, headers=headers)
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+        response = client.post("/batch", json=[{"path": "projects"}], headers=headers)
+        assert response.status_code == HTTP_400_BAD_REQUEST
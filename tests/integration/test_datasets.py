@@ -0,0 +1,28 @@
+import asyncio
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ._fixtures import app  # pyright: ignore  # loads all models
+from lib.datasets import Dataset, load_dataset
+
+dataset = Dataset(users=20, projects=2, groups_per_project=2, members_per_group=5, questions_per_group=3)
+
+
+async def load(path: Path) -> tuple[dict[str, int], list[str]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        counts, _ = await load_dataset(dataset, engine)
+        async with engine.connect() as connection:
+            ids = (await connection.execute(text("SELECT id FROM question ORDER BY created_at"))).scalars().all()
+        return counts, [*ids]
+    finally:
+        await engine.dispose()
+
+
+def test_dataset_deterministic(tmp_path: Path) -> None:
+    counts, ids = asyncio.run(load(tmp_path / "first.sqlite"))
+    assert counts["question"] == len(ids) == 2 * 2 * 3
+    assert counts["rating"] == len(ids) * dataset.ratings_per_question
+    assert asyncio.run(load(tmp_path / "second.sqlite")) == (counts, ids)
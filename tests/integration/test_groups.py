@@ -0,0 +1,142 @@
+import logging
+import marshal
+
+import pytest
+from httpx import Headers
+from litestar import Litestar
+from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED
+from litestar.testing import TestClient
+
+from ._fixtures import admin_header, test_client  # pyright: ignore
+from app import tracer
+from lib.metrics import MetricFamily, render
+
+project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+group_id = "a825cd37-f637-4853-bc73-97a2b01f18e7"
+
+
+def test_detail_windowed(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/groups/{project_id}/{group_id}", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        assert response.json()["noQuestions"] == len(response.json()["questions"])
+        assert response.json()["questionsCursor"] is None
+
+
+def test_questions_pages(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        ids: list[str] = []
+        params: dict[str, str | int] = {"size": 1}
+        while True:
+            response = client.get(f"/groups/{project_id}/{group_id}/questions", params=params, headers=admin_header)
+            assert response.status_code == HTTP_200_OK
+            assert len(response.json()["items"]) == 1
+            ids.extend(item["id"] for item in response.json()["items"])
+            if not (cursor := response.json()["cursor"]):
+                break
+            params["cursor"] = cursor
+        assert len(ids) == len(set(ids))
+        assert len(ids) == client.get(f"/groups/{project_id}/{group_id}", headers=admin_header).json()["noQuestions"]
+
+
+def test_questions_invalid_cursor(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/groups/{project_id}/{group_id}/questions?cursor=invalid", headers=admin_header)
+        assert response.status_code == HTTP_400_BAD_REQUEST
+
+
+def test_detail_cached_until_write(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/groups/{project_id}/{group_id}", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        no_questions = response.json()["noQuestions"]
+
+        response = client.post(f"/questions/{group_id}", json={"question": "Cached?"}, headers=admin_header)
+        assert response.status_code == HTTP_201_CREATED
+        question_id = response.json()["id"]
+
+        response = client.get(f"/groups/{project_id}/{group_id}", headers=admin_header)
+        assert response.json()["noQuestions"] == no_questions + 1
+
+        client.delete(f"/questions/{group_id}/{question_id}", headers=admin_header)
+        response = client.get(f"/groups/{project_id}/{group_id}", headers=admin_header)
+        assert response.json()["noQuestions"] == no_questions
+
+
+def test_queries_logged(test_client: TestClient[Litestar], admin_header: Headers, caplog: pytest.LogCaptureFixture) -> None:
+    with test_client as client, caplog.at_level(logging.DEBUG, logger="lib.queries"):
+        response = client.get(f"/groups/{project_id}/{group_id}/questions", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+
+    records = [record for record in caplog.records if record.name == "lib.queries"]
+    assert [record.msg for record in records] == ["request queries"]
+    assert records[0].route == "GET /groups/{project_id:uuid}/{group_id:uuid}/questions"  # type: ignore
+    assert records[0].queries > 0  # type: ignore
+
+
+def test_metrics(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        client.get(f"/groups/{project_id}/{group_id}/questions", headers=admin_header)
+        assert client.get("/metrics").status_code == HTTP_401_UNAUTHORIZED
+
+        response = client.get("/metrics", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        route = 'method="GET",route="/groups/{project_id:uuid}/{group_id:uuid}/questions"'
+        assert f'http_requests_total{{{route},status="200"}}' in response.text
+        assert f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}' in response.text
+        assert "mail_outbox_depth" in response.text
+
+
+def test_metrics_escaped() -> None:
+    family = MetricFamily("errors_total", "counter", "Errors.", [({"message": 'a "quoted"\\path\nline'}, 1)])
+    assert 'errors_total{message="a \\"quoted\\"\\\\path\\nline"} 1' in render([family])
+
+
+def test_request_traced(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    object.__setattr__(tracer, "sample_rate", 1)
+    try:
+        with test_client as client:
+            params = {"size": 3}  # not cached by earlier tests
+            response = client.get(f"/groups/{project_id}/{group_id}/questions", params=params, headers=admin_header)
+            assert response.status_code == HTTP_200_OK
+            response = client.get(f"/traces/{response.headers['X-Trace-Id']}", headers=admin_header)
+            assert response.status_code == HTTP_200_OK
+    finally:
+        object.__setattr__(tracer, "sample_rate", 0)
+
+    spans = {span["span_id"]: span for span in response.json()}
+    names = {span["name"] for span in spans.values()}
+    assert {"authentication", "handler", "serialize", "db"} <= names
+    parents = [spans[span["parent_id"]]["name"] for span in spans.values() if span["name"] == "db"]
+    assert "handler" in parents and "authentication" in parents
+
+
+def test_request_profiled(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/groups/direct/{group_id}", headers=admin_header)
+        assert "X-Profile-Id" not in response.headers
+
+        response = client.get(f"/groups/direct/{group_id}", headers={**admin_header, "X-Profile": "1"})
+        assert response.status_code == HTTP_200_OK
+        response = client.get(f"/profiles/{response.headers['X-Profile-Id']}", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+
+    assert any(function == "get_direct_handler" for _, _, function in marshal.loads(response.content))
+
+
+def test_memory_diagnostics(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        try:
+            assert client.post("/memory/start", headers=admin_header).json()["tracing"]
+            first = client.post("/memory/snapshots", headers=admin_header).json()["id"]
+            client.get(f"/groups/direct/{group_id}", headers=admin_header)
+            second = client.post("/memory/snapshots", headers=admin_header).json()["id"]
+
+            response = client.get(f"/memory/snapshots/{first}/diff/{second}", headers=admin_header)
+            assert response.status_code == HTTP_200_OK
+            assert response.json()["statistics"]
+            routes = [peak["route"] for peak in client.get("/memory/routes", headers=admin_header).json()]
+            assert "GET /groups/direct/{group_id:uuid}" in routes
+        finally:
+            client.post("/memory/stop", headers=admin_header)
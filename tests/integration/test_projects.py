@@ -1,9 +1,18 @@
+from dataclasses import replace
+
+import pytest
 from httpx import Headers
 from litestar import Litestar
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
+from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_304_NOT_MODIFIED, HTTP_404_NOT_FOUND
 from litestar.testing import TestClient
 
 from ._fixtures import admin_header, test_client  # pyright: ignore
+from app import outbox
+from domain.projects.models import Project
+from lib.orm import session
+from litestar.serialization import decode_msgpack, encode_msgpack
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
 
 
 def test_get_all(test_client: TestClient[Litestar], admin_header: Headers) -> None:
@@ -35,3 +44,183 @@ def test_remove(test_client: TestClient[Litestar], admin_header: Headers) -> Non
         for project in filter(lambda p: p["name"] == "Mein Projekt", [project for project in response.json()]): # pyright: ignore
             response = client.delete(f"/projects/{project['id']}", headers=admin_header)
             assert response.status_code == HTTP_204_NO_CONTENT
+
+
+def test_remove_cached(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    async def create_project() -> str:
+        async with session() as session_:  # written without a revision, like the mock data
+            project = Project(name="Ungeschriebenes Projekt", description="Gecacht und gelöscht")
+            session_.add(project)
+            await session_.flush()
+            project_id = str(project.id)
+            await session_.commit()
+            return project_id
+
+    headers = {"Authorization": admin_header["Authorization"]}
+    with test_client as client:
+        project_id = client.blocking_portal.call(create_project)
+        response = client.get(f"/projects/{project_id}", headers=headers)
+        assert response.status_code == HTTP_200_OK
+        etag = response.headers["ETag"]
+
+        response = client.delete(f"/projects/{project_id}", headers=headers)
+        assert response.status_code == HTTP_204_NO_CONTENT
+
+        assert client.get(f"/projects/{project_id}", headers=headers).status_code == HTTP_404_NOT_FOUND
+        response = client.get(f"/projects/{project_id}", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == HTTP_404_NOT_FOUND
+
+
+def test_conditional_get(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    with test_client as client:
+        response = client.get(f"/projects/{project_id}", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        etag, name = response.headers["ETag"], response.json()["name"]
+
+        response = client.get(f"/projects/{project_id}", headers={**admin_header, "If-None-Match": etag})
+        assert response.status_code == HTTP_304_NOT_MODIFIED
+
+        response = client.put(f"/projects/{project_id}", json={"name": name, "description": "Geändert"}, headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+
+        response = client.get(f"/projects/{project_id}", headers={**admin_header, "If-None-Match": etag})
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+
+def test_msgpack(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    msgpack = {"Authorization": admin_header["Authorization"], "Accept": "application/msgpack"}
+    with test_client as client:
+        json_response = client.get(f"/projects/{project_id}", headers=admin_header)
+        response = client.get(f"/projects/{project_id}", headers=msgpack)
+        assert response.status_code == HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/msgpack"
+        assert "Accept" in response.headers["Vary"]
+        assert response.headers["ETag"] != json_response.headers["ETag"]
+        assert decode_msgpack(response.content)["name"] == json_response.json()["name"]
+
+        data = {"name": "Binär", "description": "MessagePack", "engineers": []}
+        response = client.post(f"/projects", content=encode_msgpack(data), headers={**msgpack, "Content-Type": "application/msgpack"})
+        assert response.status_code == HTTP_201_CREATED
+        response = client.delete(f"/projects/{decode_msgpack(response.content)['id']}", headers=admin_header)
+        assert response.status_code == HTTP_204_NO_CONTENT
+
+
+def test_compression(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    headers = {"Authorization": admin_header["Authorization"]}
+    with test_client as client:
+        for _ in range(2):  # the second response is cached
+            response = client.get(f"/projects/{project_id}", headers={**headers, "Accept-Encoding": "gzip"})
+            assert response.headers["Content-Encoding"] == "gzip"
+            name = response.json()["name"]
+
+        response = client.get(f"/projects/{project_id}", headers={**headers, "Accept-Encoding": "identity"})
+        assert "Content-Encoding" not in response.headers
+        assert response.json()["name"] == name
+
+
+def test_dashboard(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    headers = {"Authorization": admin_header["Authorization"]}
+    with test_client as client:
+        response = client.get("/users/me/dashboard", headers=headers)
+        assert response.status_code == HTTP_200_OK
+        [project] = [project for project in response.json() if project["id"] == project_id]
+        assert project["roles"] == ["engineer", "member"]
+        assert project["noQuestions"] == sum(group["noQuestions"] for group in project["groups"])
+        assert [group["name"] for group in project["groups"] if group["isMember"]] == ["No it's round!"]
+        assert project["noUnreadComments"] > 0
+
+        assert client.put(f"/comments/read/{project_id}", headers=headers).status_code == HTTP_204_NO_CONTENT
+        dashboard = client.get("/users/me/dashboard", headers=headers).json()
+        assert [project["noUnreadComments"] for project in dashboard if project["id"] == project_id] == [0]
+
+        ids = [project["id"] for project in client.get("/projects/my_projects", headers=headers).json()]
+        assert sorted(ids) == sorted(project["id"] for project in response.json())
+
+
+def test_user_rename_changes_etag(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    with test_client as client:
+        etag = client.get(f"/projects/{project_id}", headers=admin_header).headers["ETag"]
+
+        response = client.put(f"/users/daniel@uni-jena.de", json={"name": "Dani"}, headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        response = client.get(f"/projects/{project_id}", headers={**admin_header, "If-None-Match": etag})
+        assert response.status_code == HTTP_200_OK
+        assert "Dani" in [manager["name"] for manager in response.json()["managers"]]
+
+        response = client.put(f"/users/daniel@uni-jena.de", json={"name": "Daniel"}, headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+
+
+def test_changes(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    group_id = "a825cd37-f637-4853-bc73-97a2b01f18e7"
+    with test_client as client:
+        response = client.get(f"/projects/{project_id}/changes", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        revision = response.json()["revision"]
+
+        response = client.post(f"/questions/{group_id}", json={"question": "Changed?"}, headers=admin_header)
+        question_id = response.json()["id"]
+        client.delete(f"/questions/{group_id}/{question_id}", headers=admin_header)
+
+        response = client.get(f"/projects/{project_id}/changes?since={revision}&size=1", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        assert [(c["entity_id"], c["action"]) for c in response.json()["changes"]] == [(question_id, "created")]
+        assert response.json()["more"]
+
+        response = client.get(
+            f"/projects/{project_id}/changes?since={response.json()['revision']}", headers=admin_header
+        )
+        assert [(c["entity_id"], c["action"]) for c in response.json()["changes"]] == [(question_id, "deleted")]
+        assert not response.json()["more"]
+
+
+def test_events_socket(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    project_id = "7efa96ba-c7a9-4069-9728-dc7fa2c105fd"
+    group_id = "a825cd37-f637-4853-bc73-97a2b01f18e7"
+    with test_client as client:
+        with client.websocket_connect(f"/projects/{project_id}/events/ws", headers=admin_header) as socket:
+            response = client.post(f"/questions/{group_id}", json={"question": "Pushed?"}, headers=admin_header)
+            question_id = response.json()["id"]
+            event = socket.receive_json(timeout=5)
+            assert event["changes"] == [{"entity": "question", "entity_id": question_id, "action": "created"}]
+        client.delete(f"/questions/{group_id}/{question_id}", headers=admin_header)
+
+
+def test_invitation_mails_sent(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        client.blocking_portal.call(outbox.on_shutdown)  # drain deterministically without the background sender
+        sender = replace(outbox, window=0)
+        while client.blocking_portal.call(sender.drain):
+            pass
+        sent, messages = sender.metrics.sent, sender.metrics.messages
+
+        data = {"name": "Outbox Projekt", "description": "Einladungen", "engineers": ["outbox@uni-jena.de"]}
+        response = client.post(f"/projects", json=data, headers=admin_header)
+        assert response.status_code == HTTP_201_CREATED
+
+        assert client.blocking_portal.call(sender.drain) == 1  # invitation and role mail are combined
+        assert sender.metrics.sent == sent + 2
+        assert sender.metrics.messages == messages + 1
+        assert sender.metrics.depth == 0
+        client.blocking_portal.call(outbox.on_startup)
+
+        response = client.delete(f"/projects/{response.json()['id']}", headers=admin_header)
+        assert response.status_code == HTTP_204_NO_CONTENT
+
+
+def test_strict_loading(test_client: TestClient[Litestar]) -> None:
+    async def load_groups() -> None:
+        async with session() as session_:
+            project = await session_.scalar(select(Project).limit(1))
+            assert project
+            project.groups
+
+    with test_client as client, pytest.raises(InvalidRequestError, match="lazy='raise_on_sql'"):
+        client.blocking_portal.call(load_groups)
@@ -0,0 +1,129 @@
+import logging
+import re
+from typing import Any
+
+import pytest
+from httpx import Headers
+from litestar import Controller, Litestar
+from litestar.handlers import HTTPRouteHandler
+from litestar.openapi import OpenAPIController
+from litestar.routes import HTTPRoute
+from litestar.status_codes import HTTP_200_OK
+from litestar.testing import TestClient
+from sqlalchemy import select
+
+from ._fixtures import admin_header, app, test_client  # pyright: ignore
+from app import query_counter
+from domain.accounts.models import User
+from domain.consolidations.models import Consolidation
+from domain.groups.models import Group
+from domain.projects.models import Project
+from domain.questions.models import Question
+from domain.ratings.models import Rating
+from domain.terms.models import Term
+from lib.datasets import Dataset
+from lib.orm import _engine, session
+
+# the same shape at different sizes, query counts must not depend on the size
+small = Dataset(
+    users=10,
+    projects=2,
+    groups_per_project=2,
+    members_per_group=3,
+    questions_per_group=2,
+    versions_per_question=1,
+    ratings_per_question=1,
+    comments_per_question=1,
+    terms_per_project=3,
+    passages_per_question=1,
+    consolidations_per_project=1,
+    questions_per_consolidation=2,
+    seed=1,
+    prefix="small",
+)
+large = Dataset(
+    users=40,
+    projects=4,
+    groups_per_project=6,
+    members_per_group=8,
+    questions_per_group=12,
+    versions_per_question=3,
+    ratings_per_question=4,
+    comments_per_question=3,
+    terms_per_project=10,
+    passages_per_question=2,
+    consolidations_per_project=3,
+    questions_per_consolidation=8,
+    seed=2,
+    prefix="large",
+)
+
+# streams never finish
+excluded = {"/projects/{project_id:uuid}/events"}
+
+
+def routes() -> list[tuple[str, HTTPRouteHandler]]:
+    """Gets the paths and handlers of all `GET` routes of all controllers."""
+    return [
+        (route.path, handler)
+        for route in app.routes
+        if isinstance(route, HTTPRoute) and route.path not in excluded
+        for handler in route.route_handlers
+        if "GET" in handler.http_methods
+        and isinstance(handler.owner, Controller)
+        and not isinstance(handler.owner, OpenAPIController)
+    ]
+
+
+async def path_params(dataset: Dataset) -> dict[str, Any]:
+    """Gets related ids of the first project of a loaded `dataset`."""
+    async with session() as session_:
+        project_id = await session_.scalar(select(Project.id).where(Project.name == f"Project 0 of {dataset.prefix}"))
+        group_id = await session_.scalar(select(Group.id).where(Group.project_id == project_id).limit(1))
+        question_id = await session_.scalar(select(Question.id).where(Question.group_id == group_id).limit(1))
+        author_id = await session_.scalar(select(Rating.author_id).where(Rating.question_id == question_id).limit(1))
+        consolidation_id = await session_.scalar(select(Consolidation.id).filter_by(project_id=project_id))
+        return {
+            "project_id": project_id,
+            "group_id": group_id,
+            "question_id": question_id,
+            "consolidation_id": consolidation_id,
+            "term_id": await session_.scalar(select(Term.id).where(Term.project_id == project_id)),
+            "user_id": author_id,
+            "user_email": await session_.scalar(select(User.email).where(User.id == author_id)),
+        }
+
+
+def count_queries(
+    client: TestClient[Litestar], headers: Headers, caplog: pytest.LogCaptureFixture, params: dict[str, Any]
+) -> dict[str, int]:
+    """Requests every route once and gets the statements issued per route."""
+    counts: dict[str, int] = {}
+    for path, _ in routes():
+        url = re.sub(r"{(\w+):\w+}", lambda match: str(params[match[1]]), path)
+        caplog.clear()
+        response = client.get(url, headers=headers)
+        assert response.status_code == HTTP_200_OK, f"GET {path}: {response.status_code}"
+        [record] = [record for record in caplog.records if record.msg == "request queries"]
+        counts[path] = record.queries  # type: ignore
+    return counts
+
+
+def test_query_budgets(
+    test_client: TestClient[Litestar], admin_header: Headers, caplog: pytest.LogCaptureFixture
+) -> None:
+    with test_client as client, caplog.at_level(logging.DEBUG, logger="lib.queries"):
+        counts = []
+        for dataset in [small, large]:
+            client.blocking_portal.call(dataset.load, _engine)
+            params = client.blocking_portal.call(path_params, dataset)
+            counts.append(count_queries(client, admin_header, caplog, params))
+
+    over_budget = {
+        path: (counts[1][path], budget)
+        for path, handler in routes()
+        if counts[1][path] > (budget := handler.opt.get("query_budget", query_counter.budget))
+    }
+    growing = {path: (counts[0][path], counts[1][path]) for path, _ in routes() if counts[1][path] > counts[0][path]}
+    assert not over_budget, f"routes exceeding their query budget (queries, budget): {over_budget}"
+    assert not growing, f"routes issuing more queries on larger collections (small, large): {growing}"
@@ -0,0 +1,34 @@
+from httpx import Headers
+from litestar import Litestar
+from litestar.status_codes import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from litestar.testing import TestClient
+
+from ._fixtures import admin_header, test_client  # pyright: ignore
+
+group_id = "b0488a1e-3768-4d34-8c90-f24f1f9036a3"
+question_id = "2de6c0c8-3565-4c5a-bc85-3b5971e0e452"
+
+
+def test_detail_slim(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/questions/{group_id}/{question_id}", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        assert response.json()["id"] == question_id
+        assert "ratings" not in response.json()
+        assert "comments" not in response.json()
+
+
+def test_detail_expanded(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/questions/{group_id}/{question_id}?expand=ratings,versions", headers=admin_header)
+        assert response.status_code == HTTP_200_OK
+        assert len(response.json()["ratings"]) == 2
+        assert response.json()["aggregatedRating"] == 3
+        assert len(response.json()["versions"]) == 1
+        assert "comments" not in response.json()
+
+
+def test_detail_unknown_expansion(test_client: TestClient[Litestar], admin_header: Headers) -> None:
+    with test_client as client:
+        response = client.get(f"/questions/{group_id}/{question_id}?expand=password_hash", headers=admin_header)
+        assert response.status_code == HTTP_400_BAD_REQUEST